@@ -0,0 +1,33 @@
+"""Add comments.urn for comment deduplication
+
+Revision ID: 0001_comment_urn
+Revises: 
+Create Date: 2026-10-19 12:00:00
+
+Tables are created by Base.metadata.create_all on startup, which does not add
+columns to existing tables; this brings databases created before comments.urn
+existed up to date.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_comment_urn'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("comments")}
+    if "urn" not in columns:
+        op.add_column("comments", sa.Column("urn", sa.String(), nullable=True))
+        op.create_index("ix_comments_urn", "comments", ["urn"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_comments_urn", table_name="comments")
+    op.drop_column("comments", "urn")
@@ -0,0 +1,42 @@
+"""Add scrape_failures, the negative cache of unscrapable company ids
+
+Revision ID: 0002_scrape_failures
+Revises: 0001_comment_urn
+Create Date: 2026-10-19 14:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_scrape_failures'
+down_revision: Union[str, None] = '0001_comment_urn'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # create_all on startup may already have created it
+    if sa.inspect(op.get_bind()).has_table("scrape_failures"):
+        return
+    op.create_table(
+        "scrape_failures",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("linkedin_id", sa.String()),
+        sa.Column("reason", sa.String()),
+        sa.Column("failure_count", sa.Integer()),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("first_failed_at", sa.DateTime(timezone=True)),
+        sa.Column("last_failed_at", sa.DateTime(timezone=True)),
+        sa.Column("retry_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_scrape_failures_id", "scrape_failures", ["id"])
+    op.create_index("ix_scrape_failures_linkedin_id", "scrape_failures", ["linkedin_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scrape_failures_linkedin_id", table_name="scrape_failures")
+    op.drop_index("ix_scrape_failures_id", table_name="scrape_failures")
+    op.drop_table("scrape_failures")
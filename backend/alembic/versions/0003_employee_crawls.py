@@ -0,0 +1,44 @@
+"""Add employee_crawls, the resume position of each page's People crawl, and index employees.profile_url
+
+Revision ID: 0003_employee_crawls
+Revises: 0002_scrape_failures
+Create Date: 2026-10-19 18:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_employee_crawls'
+down_revision: Union[str, None] = '0002_scrape_failures'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # Employees are now matched by profile URL
+    if "ix_employees_profile_url" not in {i["name"] for i in inspector.get_indexes("employees")}:
+        op.create_index("ix_employees_profile_url", "employees", ["profile_url"])
+    # create_all on startup may already have created it
+    if inspector.has_table("employee_crawls"):
+        return
+    op.create_table(
+        "employee_crawls",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("page_id", sa.Integer(), sa.ForeignKey("company_pages.id")),
+        sa.Column("position", sa.Integer()),
+        sa.Column("exhausted", sa.Boolean()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_employee_crawls_id", "employee_crawls", ["id"])
+    op.create_index("ix_employee_crawls_page_id", "employee_crawls", ["page_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_employee_crawls_page_id", table_name="employee_crawls")
+    op.drop_index("ix_employee_crawls_id", table_name="employee_crawls")
+    op.drop_table("employee_crawls")
+    op.drop_index("ix_employees_profile_url", table_name="employees")
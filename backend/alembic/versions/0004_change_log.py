@@ -0,0 +1,41 @@
+"""Add change_log, the append-only record behind the /changes feed
+
+Revision ID: 0004_change_log
+Revises: 0003_employee_crawls
+Create Date: 2026-10-19 20:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_change_log'
+down_revision: Union[str, None] = '0003_employee_crawls'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # create_all on startup may already have created it
+    if sa.inspect(op.get_bind()).has_table("change_log"):
+        return
+    op.create_table(
+        "change_log",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("page_id", sa.Integer(), sa.ForeignKey("company_pages.id")),
+        sa.Column("entity", sa.String()),
+        sa.Column("entity_id", sa.Integer()),
+        sa.Column("change", sa.String()),
+        sa.Column("fields", sa.Text(), nullable=True),
+        sa.Column("changed_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_change_log_id", "change_log", ["id"])
+    op.create_index("ix_change_log_page_id_id", "change_log", ["page_id", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_change_log_page_id_id", table_name="change_log")
+    op.drop_index("ix_change_log_id", table_name="change_log")
+    op.drop_table("change_log")
@@ -0,0 +1,37 @@
+"""Add post_vectors, the hashed term counts behind local post retrieval
+
+Revision ID: 0005_post_vectors
+Revises: 0004_change_log
+Create Date: 2026-10-19 22:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_post_vectors'
+down_revision: Union[str, None] = '0004_change_log'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # create_all on startup may already have created it
+    if sa.inspect(op.get_bind()).has_table("post_vectors"):
+        return
+    op.create_table(
+        "post_vectors",
+        sa.Column("post_id", sa.Integer(), sa.ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("page_id", sa.Integer(), sa.ForeignKey("company_pages.id")),
+        sa.Column("dim", sa.Integer()),
+        sa.Column("terms", sa.LargeBinary()),
+        sa.Column("weights", sa.LargeBinary()),
+    )
+    op.create_index("ix_post_vectors_page_id", "post_vectors", ["page_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_post_vectors_page_id", table_name="post_vectors")
+    op.drop_table("post_vectors")
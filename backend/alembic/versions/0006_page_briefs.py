@@ -0,0 +1,42 @@
+"""Add page_briefs, the stored AI brief of each page
+
+Revision ID: 0006_page_briefs
+Revises: 0005_post_vectors
+Create Date: 2026-10-19 23:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_page_briefs'
+down_revision: Union[str, None] = '0005_post_vectors'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # create_all on startup may already have created it
+    if sa.inspect(op.get_bind()).has_table("page_briefs"):
+        return
+    op.create_table(
+        "page_briefs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("page_id", sa.Integer(), sa.ForeignKey("company_pages.id")),
+        sa.Column("source_version", sa.String(64)),
+        sa.Column("model", sa.String(), nullable=True),
+        sa.Column("summary", sa.Text()),
+        sa.Column("themes", sa.Text()),
+        sa.Column("engagement_notes", sa.Text(), nullable=True),
+        sa.Column("generated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_page_briefs_id", "page_briefs", ["id"])
+    op.create_index("ix_page_briefs_page_id", "page_briefs", ["page_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_page_briefs_page_id", table_name="page_briefs")
+    op.drop_index("ix_page_briefs_id", table_name="page_briefs")
+    op.drop_table("page_briefs")
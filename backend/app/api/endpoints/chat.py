@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.services import crud
-from app.services.ai_analyst import AiAnalyst
+from app.core.config import settings
+from app.services import context_builder, retrieval, briefs
+from app.services.ai_analyst import analyst, chunk_text
+from app.services.events import format_sse
+from app.services.llm_executor import llm_executor, LLMOverloaded
 
 router = APIRouter()
-analyst = AiAnalyst()
 
 class ChatRequest(BaseModel):
     page_id: str
@@ -15,28 +18,96 @@ class ChatRequest(BaseModel):
 class ChatResponse(BaseModel):
     response: str
 
+
+async def _get_base_context(db: AsyncSession, page_id: str) -> dict:
+    context = await context_builder.get_chat_context(db, page_id)
+    if context is None:
+        raise HTTPException(status_code=404, detail="Page context not found")
+    return context
+
+
+async def _brief_answer(db: AsyncSession, page_id: str, context: dict, message: str):
+    """Answer overview-style questions from the stored brief while it matches the page data."""
+    if not briefs.is_brief_query(message, context.get("name")):
+        return None
+    brief = await briefs.get_fresh_brief(db, page_id, context)
+    return briefs.format_brief(brief) if brief else None
+
+
+async def _with_relevant_posts(db: AsyncSession, page_id: str, message: str, context: dict) -> dict:
+    # Prefer the posts most relevant to the question; keep the most recent ones otherwise
+    relevant = await retrieval.relevant_posts(db, page_id, message, k=settings.RETRIEVAL_TOP_K)
+    if relevant:
+        context = {**context, "posts": relevant}
+    return context
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat_with_analyst(
     request: ChatRequest,
     db: AsyncSession = Depends(get_db)
 ):
     # 1. Get Page Context
-    page = await crud.get_page_by_linkedin_id(db, request.page_id)
-    if not page:
-        raise HTTPException(status_code=404, detail="Page context not found")
-    
-    # Simple context dict
-    context = {
-        "name": page.name,
-        "description": page.description,
-        "industry": page.industry,
-        "follower_count": page.follower_count,
-        "head_count": page.head_count,
-        "website": page.website,
-        "posts": [p.content for p in page.posts[:5]] if page.posts else []
-    }
-    
+    context = await _get_base_context(db, request.page_id)
+
+    # Overview questions are answered by the precomputed brief when it's current
+    brief_text = await _brief_answer(db, request.page_id, context, request.message)
+    if brief_text:
+        return ChatResponse(response=brief_text)
+
+    context = await _with_relevant_posts(db, request.page_id, request.message, context)
+
     # 2. Generate Response
-    response_text = await analyst.generate_response(context, request.message)
-    
+    try:
+        response_text = await analyst.generate_response(context, request.message)
+    except LLMOverloaded as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
     return ChatResponse(response=response_text)
+
+
+@router.post("/chat/stream")
+async def chat_with_analyst_stream(
+    request: ChatRequest,
+    http_request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Streaming variant of /chat as server-sent events.
+
+    Emits one `chunk` event (`{"text": ...}`) per piece of model output and a final
+    `done` event, or `error` if no LLM slot frees up in time. Generation stops if
+    the client disconnects.
+    """
+    context = await _get_base_context(db, request.page_id)
+    brief_text = await _brief_answer(db, request.page_id, context, request.message)
+    if brief_text is None:
+        context = await _with_relevant_posts(db, request.page_id, request.message, context)
+
+        # Reject before the 200 is sent if the LLM queue is already full
+        try:
+            llm_executor.check_capacity()
+        except LLMOverloaded as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+    async def event_source():
+        if brief_text is not None:
+            chunks = chunk_text(brief_text)
+        else:
+            chunks = analyst.stream_response(context, request.message)
+        try:
+            async for text in chunks:
+                if await http_request.is_disconnected():
+                    return
+                yield format_sse("chunk", {"text": text})
+            yield format_sse("done", {})
+        except LLMOverloaded as e:
+            yield format_sse("error", {"status": e.status_code, "detail": str(e), "retry_after": e.retry_after})
+        finally:
+            await chunks.aclose()
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,33 @@
+import hmac
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from app.core.config import settings
+from app.services import profiling
+
+router = APIRouter()
+
+
+def _authorize(token: Optional[str]):
+    # Hidden entirely unless profiling is configured
+    if not settings.PROFILING_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token or not hmac.compare_digest(token.encode(), settings.PROFILING_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+
+@router.get("/debug/profiles")
+async def list_profiles(x_profile_token: Optional[str] = Header(None)):
+    """Tags (route, status, duration, samples) of the most recent stored profiles."""
+    _authorize(x_profile_token)
+    return profiling.list_profiles()
+
+
+@router.get("/debug/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str, x_profile_token: Optional[str] = Header(None)):
+    """Folded stacks for one profile, e.g. for `flamegraph.pl` or speedscope."""
+    _authorize(x_profile_token)
+    folded = profiling.load_profile(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(folded)
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.api.endpoints.pages import scraper
+from app.api.endpoints.chat import analyst
+
+router = APIRouter()
+
+
+@router.get("/health/ready")
+async def readiness(db: AsyncSession = Depends(get_db)):
+    """
+    Readiness probe reporting the state of each component.
+    
+    Returns 200 once the database is reachable, since list/search/posts only need the DB.
+    The scraper may still be `starting`; live scrapes wait for it to become `ready`.
+    """
+    components = {}
+
+    try:
+        await db.execute(text("SELECT 1"))
+        components["database"] = {"state": "ready"}
+    except Exception as e:
+        components["database"] = {"state": "failed", "last_error": str(e)}
+
+    components["scraper"] = scraper.status()
+    components["ai_analyst"] = analyst.status()
+
+    ready = components["database"]["state"] == "ready"
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", "components": components}
+    )
@@ -0,0 +1,87 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.database import engine
+from app.services import metrics
+from app.services.ai_analyst import response_cache
+from app.services.context_builder import context_cache
+from app.services.llm_executor import llm_executor
+from app.api.endpoints.pages import scraper
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Stage timings are only available in-process; a remote scraper service records its own
+if hasattr(scraper, "stage_observers"):
+    scraper.stage_observers.append(metrics.observe_scrape_stage)
+
+
+def _open_tabs():
+    return scraper.open_tabs() if hasattr(scraper, "open_tabs") else None
+
+
+def _session_stat(field: str):
+    def collect():
+        if not hasattr(scraper, "pool"):
+            return None
+        return {(s["name"],): s[field] for s in scraper.pool.stats()}
+    return collect
+
+
+def _session_states():
+    if not hasattr(scraper, "pool"):
+        return None
+    return {(s["name"], s["state"]): 1 for s in scraper.pool.stats()}
+
+
+def _breaker_state():
+    state = scraper.status().get("breaker", {}).get("state")
+    return {(state,): 1} if state else None
+
+
+def _browser_recycles():
+    if not hasattr(scraper, "recycles"):
+        return None
+    return dict(scraper.recycles)
+
+
+def _db_pool():
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return None
+    return {
+        ("checked_out",): pool.checkedout(),
+        ("idle",): pool.checkedin(),
+        ("overflow",): max(pool.overflow(), 0),
+    }
+
+
+metrics.CallbackMetric("browser_open_tabs", "Pages open across the scraper's browser sessions", _open_tabs)
+metrics.CallbackMetric("scraper_session_in_flight", "Pages in progress per LinkedIn session", _session_stat("in_flight"), ("session",))
+metrics.CallbackMetric("scraper_session_requests_total", "Scrapes started per LinkedIn session", _session_stat("requests"), ("session",), type="counter")
+metrics.CallbackMetric("scraper_session_failures_total", "Failed scrapes per LinkedIn session", _session_stat("failures"), ("session",), type="counter")
+metrics.CallbackMetric("scraper_session_rate_limited_total", "Rate-limit responses per LinkedIn session", _session_stat("rate_limited"), ("session",), type="counter")
+metrics.CallbackMetric("scraper_session_state", "Current state of each LinkedIn session", _session_states, ("session", "state"))
+metrics.CallbackMetric("scraper_session_authwalls_total", "Authwall/checkpoint responses per LinkedIn session", _session_stat("authwalls"), ("session",), type="counter")
+metrics.CallbackMetric("scraper_breaker_state", "Scraper circuit breaker state (closed, open, half_open)", _breaker_state, ("state",))
+metrics.CallbackMetric("scraper_breaker_opens_total", "Times the scraper circuit breaker opened", lambda: scraper.status().get("breaker", {}).get("opens"), type="counter")
+metrics.CallbackMetric("browser_rss_bytes", "Chromium resident memory at the last check", lambda: scraper.rss_mb * 1024 * 1024 if hasattr(scraper, "rss_mb") else None)
+metrics.CallbackMetric("browser_pages_served", "Pages served since the browser contexts were last recycled", lambda: getattr(scraper, "pages_served", None))
+metrics.CallbackMetric("browser_recycles_total", "Browser recycles by kind (contexts, browser) and reason", _browser_recycles, ("kind", "reason"), type="counter")
+metrics.CallbackMetric("db_pool_connections", "Database pool connections by state", _db_pool, ("state",))
+metrics.CallbackMetric("db_pool_size", "Configured database pool size", lambda: engine.pool.size() if hasattr(engine.pool, "size") else None)
+metrics.CallbackMetric("llm_queue_depth", "Gemini calls waiting for a slot", lambda: llm_executor.waiting)
+metrics.CallbackMetric("llm_in_flight", "Gemini calls in progress", lambda: llm_executor.in_flight)
+metrics.CallbackMetric(
+    "ai_response_cache_lookups_total", "Analyst response cache lookups by result",
+    lambda: {("hit",): response_cache.hits, ("miss",): response_cache.misses}, ("result",), type="counter"
+)
+metrics.CallbackMetric("ai_response_cache_evictions_total", "Analyst answers evicted from the cache", lambda: response_cache.evictions, type="counter")
+metrics.CallbackMetric("ai_response_cache_entries", "Analyst answers currently cached", lambda: response_cache.stats()["size"])
+metrics.CallbackMetric("chat_context_cache_entries", "Chat contexts currently cached", lambda: len(context_cache))
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint (text exposition format)."""
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,21 +1,114 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import database
+from app.core.config import settings
 from app.core.database import get_db
-from app.services import crud
+from app.services import crud, page_pipeline, briefs, deadline, negative_cache
+from app.services.circuit_breaker import ScraperUnavailable
+from app.services.events import scrape_events, format_sse
 from app.schemas import schemas
-from app.services.scraper import LinkedInScraper
+from app.services.scraper_service import create_scraper
 from typing import Optional, List
 
 router = APIRouter()
 
-# Instantiate scraper (Singleton pattern ideally, or per request)
-scraper = LinkedInScraper()
+# One scraper per process: in-process Chromium, or a client for the shared
+# scraper service when SCRAPER_SERVICE_URL is set
+scraper = create_scraper()
+
+
+def _parse_csv_param(value: Optional[str], allowed: tuple, param: str) -> Optional[set]:
+    """Parse a comma-separated query parameter, rejecting names outside `allowed`."""
+    if value is None:
+        return None
+    names = {v.strip() for v in value.split(",") if v.strip()}
+    unknown = names - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown {param}: {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed)}"
+        )
+    return names
+
+
+def _scraper_unavailable(e: ScraperUnavailable) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
+def _require_scraper():
+    """Fail fast while the scraper's circuit breaker is open instead of queueing doomed scrapes."""
+    retry_after = scraper.retry_after()
+    if retry_after:
+        raise _scraper_unavailable(ScraperUnavailable("Scraping is temporarily paused", retry_after))
+
+
+def request_deadline(setting: str):
+    """Dependency running the endpoint under the deadline budget named by `setting`."""
+    async def dependency():
+        # A budget of 0 in the settings means none
+        with deadline.budget(getattr(settings, setting) or None):
+            yield
+    return dependency
+
+
+async def _check_negative_cache(db: AsyncSession, page_id: str):
+    """Answer ids that recently failed to scrape without touching the scraper."""
+    entry = await deadline.bounded(negative_cache.lookup(db, page_id))
+    if entry is None:
+        return
+    headers = {"Retry-After": str(negative_cache.retry_after(entry))}
+    if entry.reason == "not_found":
+        raise HTTPException(status_code=404, detail="Page not found or could not be scraped", headers=headers)
+    raise HTTPException(status_code=503, detail=f"Scraping '{page_id}' failed recently; try again later", headers=headers)
+
+
+def page_view(
+    fields: Optional[str] = Query(None, description="Comma-separated page fields to return (default: all)"),
+    include: Optional[str] = Query(None, description="Comma-separated relationships to embed: posts,employees (default: all)")
+):
+    """Sparse fieldset dependency: returns (fields, include), each None when not restricted."""
+    return (
+        _parse_csv_param(fields, crud.PAGE_FIELDS, "fields"),
+        _parse_csv_param(include, crud.PAGE_RELATIONSHIPS, "include"),
+    )
+
+
+def _serialize_page(page, view: tuple):
+    """Serialize a page, touching only the columns and relationships that were loaded."""
+    fields, include = view
+    if fields is None and include is None:
+        return schemas.PageDetail.model_validate(page)
+
+    data = {
+        f: getattr(page, f)
+        for f in crud.PAGE_FIELDS
+        if fields is None or f in fields or f in crud.PAGE_KEY_FIELDS
+    }
+    if include is None or "posts" in include:
+        data["posts"] = [schemas.Post.model_validate(p) for p in page.posts]
+    if include is None or "employees" in include:
+        data["employees"] = [schemas.Employee.model_validate(e) for e in page.employees]
+    if getattr(page, "partial", False):
+        data["partial"] = True
+    return data
+
+
+def _page_response(page, view: tuple):
+    """Return the page as-is for full views, or a sparse JSON body bypassing PageDetail validation."""
+    fields, include = view
+    if fields is None and include is None:
+        return page
+    return JSONResponse(content=jsonable_encoder(_serialize_page(page, view)))
 
 
 @router.get("/pages", response_model=dict)
 async def list_pages(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(10, ge=1, le=100, description="Maximum number of records to return"),
+    view: tuple = Depends(page_view),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -23,12 +116,14 @@ async def list_pages(
     
     - **skip**: Number of records to skip (for pagination)
     - **limit**: Maximum number of records to return (1-100)
+    - **fields/include**: Sparse fieldset, e.g. `fields=name,follower_count&include=`
     """
-    pages = await crud.get_all_pages(db, skip=skip, limit=limit)
+    fields, include = view
+    pages = await crud.get_all_pages(db, skip=skip, limit=limit, fields=fields, include=include)
     total = await crud.count_pages(db)
     
     return {
-        "items": [schemas.PageDetail.model_validate(p) for p in pages],
+        "items": [_serialize_page(p, view) for p in pages],
         "total": total,
         "skip": skip,
         "limit": limit,
@@ -44,6 +139,7 @@ async def search_pages(
     max_followers: Optional[int] = Query(None, ge=0, description="Maximum follower count"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(10, ge=1, le=100, description="Maximum number of records to return"),
+    view: tuple = Depends(page_view),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -54,7 +150,9 @@ async def search_pages(
     - **min_followers**: Minimum follower count
     - **max_followers**: Maximum follower count
     - **skip/limit**: Pagination
+    - **fields/include**: Sparse fieldset, e.g. `fields=name,follower_count&include=`
     """
+    fields, include = view
     pages = await crud.search_pages(
         db,
         name=name,
@@ -62,7 +160,9 @@ async def search_pages(
         min_followers=min_followers,
         max_followers=max_followers,
         skip=skip,
-        limit=limit
+        limit=limit,
+        fields=fields,
+        include=include
     )
     total = await crud.count_search_results(
         db,
@@ -73,7 +173,7 @@ async def search_pages(
     )
     
     return {
-        "items": [schemas.PageDetail.model_validate(p) for p in pages],
+        "items": [_serialize_page(p, view) for p in pages],
         "total": total,
         "skip": skip,
         "limit": limit,
@@ -91,87 +191,171 @@ async def search_pages(
 async def get_page_details(
     page_id: str, 
     background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(get_db)
+    view: tuple = Depends(page_view),
+    db: AsyncSession = Depends(get_db),
+    _deadline: None = Depends(request_deadline("PAGE_LOOKUP_DEADLINE"))
 ):
     """
     Get details of a specific company page by LinkedIn ID.
     
     If the page is not in the database, it will be scraped in real-time.
+    Use **fields** and **include** to limit the columns and relationships returned.
+    Scraping stops at PAGE_LOOKUP_DEADLINE; whatever was stored by then is returned
+    with `partial: true` (or 504 if the page itself couldn't be scraped in time).
     """
+    fields, include = view
+
     # 1. Check DB
-    db_page = await crud.get_page_by_linkedin_id(db, page_id)
+    db_page = await deadline.bounded(crud.get_page_by_linkedin_id(db, page_id, fields=fields, include=include))
     
     # 2. If exists, return (maybe trigger update in background if old?)
     if db_page:
-        # Check if we have posts/employees. If not, this might be a "broken" cached page.
-        should_refetch = False
-        
-        if not db_page.posts:
-             scraped_posts = await scraper.scrape_posts(page_id)
-             if scraped_posts:
-                post_schemas = [schemas.PostCreate(**p) for p in scraped_posts]
-                await crud.create_posts(db, db_page.id, post_schemas)
-                should_refetch = True
-
-        if not db_page.employees:
-             scraped_employees = await scraper.scrape_employees(page_id)
-             if scraped_employees:
-                emp_schemas = [schemas.EmployeeCreate(**e) for e in scraped_employees]
-                await crud.create_employees(db, db_page.id, emp_schemas)
-                should_refetch = True
-        
-        if should_refetch:
-             # Reload completely
-             return await crud.get_page_by_linkedin_id(db, page_id)
+        try:
+            # Check if we have posts/employees. If not, this might be a "broken" cached page.
+            should_refetch, partial = await page_pipeline.scrape_page_relations(
+                db, scraper, page_id, db_page.id,
+                posts=not await deadline.bounded(crud.count_posts_by_page(db, db_page.id)),
+                employees=not await deadline.bounded(crud.count_employees_by_page(db, db_page.id)),
+            )
+
+            if should_refetch:
+                # Chat context, cached answers and the AI brief were built from the old data
+                page_pipeline.on_page_data_changed(page_id)
+                # Reload completely
+                db_page = await deadline.bounded(crud.get_page_by_linkedin_id(db, page_id, fields=fields, include=include))
+        except (ScraperUnavailable, deadline.DeadlineExceeded):
+            # Out of time (e.g. mid employee batch) or scraping paused: serve what is stored
+            return await _stored_as_partial(db, page_id, view)
 
-        return db_page
+        db_page.partial = partial
+        return _page_response(db_page, view)
 
-    # 3. If missing, Scrape
+    # 3. If missing, Scrape - unless it recently turned out not to exist or failed
+    await _check_negative_cache(db, page_id)
     try:
-        scraped_data = await scraper.scrape_page_details(page_id)
-        if not scraped_data:
+        new_page = await page_pipeline.scrape_and_store_page(db, scraper, page_id)
+        if not new_page:
              raise HTTPException(status_code=404, detail="Page not found or could not be scraped")
-             
-        # Create page with duplicate key handling
-        page_create = schemas.PageCreate(**scraped_data)
-        try:
-            new_page = await crud.create_page(db, page_create)
-        except Exception as db_error:
-            # Handle duplicate key error - page was inserted by another request
-            if "already exists" in str(db_error) or "duplicate key" in str(db_error).lower():
-                # Rollback and fetch existing
-                await db.rollback()
-                existing_page = await crud.get_page_by_linkedin_id(db, page_id)
-                if existing_page:
-                    return existing_page
-            raise
-        
-        # Trigger scraping for posts and employees
-        scraped_posts = await scraper.scrape_posts(page_id)
-        if scraped_posts:
-            post_schemas = [schemas.PostCreate(**p) for p in scraped_posts]
-            await crud.create_posts(db, new_page.id, post_schemas)
-
-    
-        # Scrape and save employees
-        scraped_employees = await scraper.scrape_employees(page_id)
-        if scraped_employees:
-            emp_schemas = [schemas.EmployeeCreate(**e) for e in scraped_employees]
-            await crud.create_employees(db, new_page.id, emp_schemas)
         
         # Re-fetch the page to ensure relationships are eagerly loaded
-        return await crud.get_page_by_linkedin_id(db, page_id)
+        page = await deadline.bounded(crud.get_page_by_linkedin_id(db, page_id, fields=fields, include=include))
+        page.partial = getattr(new_page, "partial", False)
+        return _page_response(page, view)
         
     except HTTPException:
         raise
+    except ScraperUnavailable as e:
+        raise _scraper_unavailable(e)
+    except deadline.DeadlineExceeded as e:
+        # Return what was stored before the budget ran out
+        stored = await _stored_as_partial(db, page_id, view)
+        if stored is not None:
+            return stored
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         # Try to return existing page if insert failed due to race condition
-        existing = await crud.get_page_by_linkedin_id(db, page_id)
+        existing = await crud.get_page_by_linkedin_id(db, page_id, fields=fields, include=include)
         if existing:
-            return existing
+            return _page_response(existing, view)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _stored_as_partial(db: AsyncSession, page_id: str, view):
+    """The page as stored so far, marked partial, or None if it isn't stored."""
+    fields, include = view
+    # The interrupted DB call may have left the transaction unusable
+    await db.rollback()
+    existing = await crud.get_page_by_linkedin_id(db, page_id, fields=fields, include=include)
+    if existing is None:
+        return None
+    existing.partial = True
+    return _page_response(existing, view)
+
+
+# Background scrapes started by stream subscribers, one per page id
+_stream_scrapes: dict = {}
+
+
+async def _run_stream_scrape(page_id: str):
+    # The request session is closed before the stream starts, so use a dedicated one
+    async with database.SessionLocal() as session:
+        try:
+            with deadline.budget(settings.PAGE_STREAM_DEADLINE or None):
+                await page_pipeline.scrape_and_store_page(session, scraper, page_id)
+        except Exception:
+            pass  # Already logged and published as an 'error' event
+
+
+@router.get("/pages/{page_id}/stream")
+async def stream_page_details(
+    page_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream scrape progress for a company page as server-sent events.
+    
+    Emits `about`, `posts` and `employees` (once per batch of people) as the scraper
+    finds them, then `persisted` with the stored PageDetail (or `error`). Pages
+    already in the database are sent as a single `persisted` event.
+    """
+    db_page = await crud.get_page_by_linkedin_id(db, page_id)
+    cached = schemas.PageDetail.model_validate(db_page) if db_page else None
+    if cached is None:
+        await _check_negative_cache(db, page_id)
+
+    # Subscribe before starting the scrape so no stage event is missed
+    queue = scrape_events.subscribe(page_id)
+    if cached is None and page_id not in _stream_scrapes:
+        task = asyncio.create_task(_run_stream_scrape(page_id))
+        _stream_scrapes[page_id] = task
+        task.add_done_callback(lambda t: _stream_scrapes.pop(page_id, None))
+
+    async def event_source():
+        try:
+            if cached is not None:
+                yield format_sse("persisted", cached)
+                return
+            while True:
+                if await request.is_disconnected():
+                    break
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event, data)
+                if event in ("persisted", "error"):
+                    break
+        finally:
+            scrape_events.unsubscribe(page_id, queue)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/pages/{page_id}/brief", response_model=schemas.PageBrief)
+async def get_page_brief(
+    page_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the AI brief (summary, themes, engagement notes) for a stored company page.
+    
+    Briefs are generated in the background after each scrape and served without a
+    model call; one is generated on demand only if the page data changed since.
+    """
+    brief = await briefs.refresh_brief(db, page_id)
+    if brief is None:
+        if not await crud.get_page_by_linkedin_id(db, page_id, fields=set(), include=set()):
+            raise HTTPException(status_code=404, detail=f"Page '{page_id}' not found. Fetch it first via GET /pages/{page_id}")
+        raise HTTPException(status_code=503, detail="Brief generation is temporarily unavailable", headers={"Retry-After": "30"})
+    return brief
+
+
 @router.get("/pages/{page_id}/posts", response_model=dict)
 async def get_page_posts(
     page_id: str,
@@ -185,8 +369,8 @@ async def get_page_posts(
     - Returns the most recent posts first
     - **limit**: Max 50 posts per request, default 15
     """
-    # First ensure the page exists
-    db_page = await crud.get_page_by_linkedin_id(db, page_id)
+    # First ensure the page exists (only its key columns are needed)
+    db_page = await crud.get_page_by_linkedin_id(db, page_id, fields=set(), include=set())
     if not db_page:
         raise HTTPException(status_code=404, detail=f"Page '{page_id}' not found. Fetch it first via GET /pages/{page_id}")
     
@@ -203,6 +387,126 @@ async def get_page_posts(
     }
 
 
+@router.post("/pages/{page_id}/posts/refresh", response_model=dict)
+async def refresh_page_posts(
+    page_id: str,
+    db: AsyncSession = Depends(get_db),
+    _deadline: None = Depends(request_deadline("POSTS_REFRESH_DEADLINE"))
+):
+    """
+    Crawl the page's feed for posts published since the last scrape.
+
+    The crawl stops at the newest post already stored, so refreshing an active
+    page costs a few scrolls rather than a full feed load. It also stops at
+    POSTS_REFRESH_DEADLINE, returning the posts found so far with `partial: true`.
+    """
+    db_page = await crud.get_page_by_linkedin_id(db, page_id, fields=set(), include=set())
+    if not db_page:
+        raise HTTPException(status_code=404, detail=f"Page '{page_id}' not found. Fetch it first via GET /pages/{page_id}")
+    _require_scraper()
+
+    new_posts = await page_pipeline.crawl_new_posts(db, scraper, page_id, db_page.id)
+    if new_posts:
+        page_pipeline.on_page_data_changed(page_id)
+    return {
+        "page_id": page_id,
+        "new_posts": len(new_posts),
+        "post_urls": [p.post_url for p in new_posts],
+        "partial": deadline.expired()
+    }
+
+
+@router.post("/pages/{page_id}/details/refresh", response_model=dict)
+async def refresh_page_details(
+    page_id: str,
+    db: AsyncSession = Depends(get_db),
+    _deadline: None = Depends(request_deadline("PAGE_LOOKUP_DEADLINE"))
+):
+    """
+    Re-scrape the page's About data and store what changed.
+
+    Only changed columns are written (and recorded in the change feed); an
+    unchanged page just gets `last_scraped_at` bumped.
+    """
+    db_page = await crud.get_page_by_linkedin_id(db, page_id, fields=set(), include=set())
+    if not db_page:
+        raise HTTPException(status_code=404, detail=f"Page '{page_id}' not found. Fetch it first via GET /pages/{page_id}")
+    _require_scraper()
+
+    try:
+        changed = await page_pipeline.refresh_page_details(db, scraper, page_id, db_page.id)
+    except ScraperUnavailable as e:
+        raise _scraper_unavailable(e)
+    except deadline.DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    if changed is None:
+        raise HTTPException(status_code=404, detail="Page not found or could not be scraped")
+    return {
+        "page_id": page_id,
+        "changed": {column: {"old": old, "new": new} for column, (old, new) in changed.items()}
+    }
+
+
+@router.post("/pages/{page_id}/employees/refresh", response_model=dict)
+async def refresh_page_employees(
+    page_id: str,
+    db: AsyncSession = Depends(get_db),
+    _deadline: None = Depends(request_deadline("EMPLOYEES_REFRESH_DEADLINE"))
+):
+    """
+    Crawl the next part of the page's People directory.
+
+    Each run stores up to EMPLOYEES_CRAWL_MAX_PEOPLE people as they are found and
+    resumes where the previous run stopped; after the end of the directory the
+    next run starts over from the top. Stops at EMPLOYEES_REFRESH_DEADLINE with
+    `partial: true`.
+    """
+    db_page = await crud.get_page_by_linkedin_id(db, page_id, fields=set(), include=set())
+    if not db_page:
+        raise HTTPException(status_code=404, detail=f"Page '{page_id}' not found. Fetch it first via GET /pages/{page_id}")
+    _require_scraper()
+
+    new_employees = await page_pipeline.crawl_employees(db, scraper, page_id, db_page.id)
+    if new_employees:
+        page_pipeline.on_page_data_changed(page_id)
+    crawl = await crud.get_employee_crawl(db, db_page.id)
+    return {
+        "page_id": page_id,
+        "new_employees": new_employees,
+        "position": crawl.position if crawl else 0,
+        "exhausted": bool(crawl and crawl.exhausted),
+        "partial": deadline.expired()
+    }
+
+
+@router.get("/changes", response_model=dict)
+async def list_changes(
+    since: int = Query(0, ge=0, description="Return changes after this cursor: 0, or the next_since of the previous response"),
+    limit: int = Query(100, ge=1, le=500),
+    page_id: Optional[str] = Query(None, description="Only changes to this page"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Feed of scraped data that was added or changed, oldest first.
+
+    Each entry names the page, the entity (`page`, `post` or `employee`) and its id,
+    whether it was `created` or `updated`, and for updates the changed columns as
+    `{"column": [old, new]}`. Consumers sync incrementally by passing the previous
+    response's `next_since` back as `since`. Data stored before the change log
+    existed isn't in the feed.
+    """
+    rows = await crud.get_changes(db, since=since, limit=limit + 1, linkedin_id=page_id)
+    items = []
+    for entry, linkedin_id in rows[:limit]:
+        entry.linkedin_id = linkedin_id
+        items.append(schemas.Change.model_validate(entry))
+    return {
+        "items": items,
+        "next_since": items[-1].id if items else since,
+        "has_more": len(rows) > limit
+    }
+
+
 @router.get("/posts/{post_id}", response_model=schemas.PostWithComments)
 async def get_post_with_comments(
     post_id: int,
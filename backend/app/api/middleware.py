@@ -0,0 +1,116 @@
+import asyncio
+import hmac
+import logging
+import secrets
+import time
+from datetime import datetime, timezone
+from urllib.parse import parse_qs
+from app.core.config import settings
+from app.services import metrics, profiling
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request latency per route template.
+
+    Labels use the matched route's path (`/api/v1/pages/{page_id}`) rather than the
+    raw URL, so cardinality stays bounded. Streaming responses are timed until the
+    body is fully sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            metrics.http_request_duration.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status)
+            )
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a single request when it carries PROFILING_TOKEN, either as an
+    `X-Profile-Token` header or a `?profile=<token>` query parameter.
+
+    The profile is stored in PROFILES_DIR as folded stacks tagged with the route,
+    status and duration; its id is returned in the `X-Profile-Id` response header
+    and it can be fetched from /debug/profiles/{profile_id}. The sampler sees
+    every thread, so concurrent requests show up in the profile too.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def _requested_token(scope) -> str:
+        for name, value in scope["headers"]:
+            if name == b"x-profile-token":
+                return value.decode("latin-1")
+        query = scope.get("query_string", b"")
+        if b"profile=" in query:
+            return parse_qs(query.decode("latin-1")).get("profile", [""])[0]
+        return ""
+
+    async def __call__(self, scope, receive, send):
+        token = settings.PROFILING_TOKEN
+        if scope["type"] != "http" or not token:
+            await self.app(scope, receive, send)
+            return
+        requested = self._requested_token(scope)
+        if not requested or not hmac.compare_digest(requested.encode(), token.encode()):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{secrets.token_hex(4)}"
+        status = 500
+
+        async def send_with_profile_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        profiler = profiling.SamplingProfiler(interval=settings.PROFILING_INTERVAL)
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop()
+            duration = time.perf_counter() - started
+            route = scope.get("route")
+            meta = {
+                "id": profile_id,
+                "method": scope["method"],
+                "route": getattr(route, "path", "unmatched"),
+                "path": scope["path"],
+                "status": status,
+                "duration_ms": round(duration * 1000, 3),
+                "samples": profiler.sample_count,
+                "interval_ms": settings.PROFILING_INTERVAL * 1000,
+            }
+            await asyncio.to_thread(profiling.save_profile, profile_id, profiler.folded(), meta)
+            logger.info(f"Stored profile {profile_id} for {meta['method']} {meta['route']} ({meta['duration_ms']}ms)")
@@ -7,7 +7,92 @@ class Settings(BaseSettings):
     LINKEDIN_USERNAME: str = ""
     LINKEDIN_PASSWORD: str = ""
     MANUAL_LOGIN: bool = False
+    # Origin the scraper navigates to; point at a local fixture server for offline benchmarks
+    LINKEDIN_BASE_URL: str = "https://www.linkedin.com"
+    # "auto" extracts from the API JSON pages fetch and falls back to the DOM; "dom" skips JSON capture
+    SCRAPER_EXTRACTION_MODE: str = "auto"
     GEMINI_API_KEY: str = ""
+    # Discovered Gemini models are cached on disk to skip list_models() on boot
+    GEMINI_MODELS_CACHE_FILE: str = ".gemini_models.json"
+    GEMINI_MODELS_CACHE_TTL: int = 86400
+    # Cached analyst answers, keyed by page context + normalized question
+    AI_RESPONSE_CACHE_SIZE: int = 512
+    AI_RESPONSE_CACHE_TTL: int = 3600
+    # Gemini call concurrency cap, wait queue (size, seconds) and rate-limit retries
+    LLM_MAX_CONCURRENCY: int = 4
+    LLM_MAX_QUEUE: int = 32
+    LLM_QUEUE_TIMEOUT: float = 10
+    LLM_MAX_RETRIES: int = 2
+    LLM_RETRY_BACKOFF: float = 1.0
+    # Chat context: number of recent posts included and how long assembled contexts are reused
+    CHAT_CONTEXT_POSTS: int = 5
+    CHAT_CONTEXT_CACHE_TTL: int = 300
+    # Local post retrieval: hash space, posts returned per query and prompt token budget for posts
+    RETRIEVAL_DIM: int = 4096
+    RETRIEVAL_TOP_K: int = 5
+    # Page indexes each worker keeps in memory (least recently used are dropped)
+    RETRIEVAL_INDEX_CACHE_SIZE: int = 128
+    ANALYST_POST_TOKEN_BUDGET: int = 600
+    # e.g. unix:///tmp/linkedin_scraper.sock - when set, workers share one scraper service
+    SCRAPER_SERVICE_URL: str = ""
+    SCRAPER_MAX_CONCURRENCY: int = 2
+    # Authenticated browser sessions: comma-separated cookie files and/or globs written by
+    # manual_login.py (e.g. "sessions/*.json"); empty uses the single LINKEDIN_COOKIES_BASE64/cookie file/login flow
+    LINKEDIN_SESSION_FILES: str = ""
+    # "least_loaded" or "round_robin"; pages each session runs at once; base cooldown after a rate limit (seconds)
+    SESSION_POOL_STRATEGY: str = "least_loaded"
+    SESSION_MAX_PAGES: int = 2
+    SESSION_RATE_LIMIT_COOLDOWN: float = 300
+    # Scraping pauses after this many consecutive authwall/checkpoint/throttled navigations,
+    # for a backoff (seconds) that doubles on each failed probe up to the max
+    SCRAPER_BREAKER_THRESHOLD: int = 3
+    SCRAPER_BREAKER_BACKOFF: float = 60
+    SCRAPER_BREAKER_MAX_BACKOFF: float = 1800
+    # Browser recycling: fresh contexts after this many pages, a fresh Chromium once its RSS
+    # (checked at most every BROWSER_MEMORY_CHECK_INTERVAL seconds) passes the limit; 0 disables
+    BROWSER_RECYCLE_PAGES: int = 500
+    BROWSER_RECYCLE_RSS_MB: float = 1500
+    BROWSER_MEMORY_CHECK_INTERVAL: float = 30
+    BROWSER_DRAIN_TIMEOUT: float = 120
+    # End-to-end budgets (seconds) for requests that may scrape, 0 for none; scraper stages are
+    # skipped with less than DEADLINE_MIN_STAGE left, DB calls always get DEADLINE_DB_GRACE
+    PAGE_LOOKUP_DEADLINE: float = 45
+    PAGE_STREAM_DEADLINE: float = 120
+    POSTS_REFRESH_DEADLINE: float = 60
+    EMPLOYEES_REFRESH_DEADLINE: float = 60
+    DEADLINE_MIN_STAGE: float = 5
+    DEADLINE_DB_GRACE: float = 2
+    # Negative cache: seconds a not-found / failed company id is skipped after its first
+    # failure, doubling with each further failure up to the max
+    NEGATIVE_CACHE_NOT_FOUND_TTL: float = 3600
+    NEGATIVE_CACHE_FAILED_TTL: float = 300
+    NEGATIVE_CACHE_MAX_TTL: float = 604800
+    # /changes only serves change log entries older than this (seconds), so writes that
+    # commit out of id order aren't skipped by consumers that already moved past them
+    CHANGES_FEED_SETTLE: float = 5
+    # Posts crawl stops at the first already-stored post, or at these limits
+    POSTS_CRAWL_MAX_POSTS: int = 100
+    POSTS_CRAWL_MAX_SCROLLS: int = 15
+    POSTS_CRAWL_MAX_AGE_DAYS: int = 365
+    POSTS_CRAWL_SCROLL_PAUSE: float = 1.5
+    # People crawl: new people stored per run and scroll steps (including those needed to get back
+    # to where the previous run stopped); the next run resumes there until the directory ends
+    EMPLOYEES_CRAWL_MAX_PEOPLE: int = 50
+    EMPLOYEES_CRAWL_MAX_SCROLLS: int = 30
+    EMPLOYEES_CRAWL_SCROLL_PAUSE: float = 1.5
+    # Comments fetched in the background for newly stored posts that have any
+    COMMENTS_CRAWL_CONCURRENCY: int = 2
+    COMMENTS_CRAWL_MAX_POSTS: int = 20
+    COMMENTS_MAX_PER_POST: int = 50
+    COMMENTS_MAX_LOAD_MORE: int = 3
+    COMMENTS_LOAD_MORE_PAUSE: float = 1.5
+    # On-demand request profiling: requests carrying this token (X-Profile-Token header or
+    # ?profile=<token>) are sampled into PROFILES_DIR; empty disables profiling
+    PROFILING_TOKEN: str = ""
+    PROFILING_INTERVAL: float = 0.005
+    PROFILES_DIR: str = "profiles"
+    # Log the loop thread's stack when the event loop is blocked longer than this (seconds, 0 disables)
+    LOOP_LAG_THRESHOLD: float = 0.25
 
     class Config:
         env_file = ".env"
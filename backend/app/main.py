@@ -1,5 +1,6 @@
 import sys
 import asyncio
+import logging
 
 # CRITICAL: Must be set BEFORE any other async code runs on Windows
 if sys.platform == 'win32':
@@ -7,10 +8,14 @@ if sys.platform == 'win32':
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import pages, chat
+from app.api.endpoints import pages, chat, health, metrics, debug
+from app.api.middleware import MetricsMiddleware, ProfilingMiddleware
+from app.services.profiling import loop_monitor
 from app.core.database import engine, Base
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="LinkedIn Insights API",
     description="API for fetching and analyzing LinkedIn Company Page data",
@@ -33,6 +38,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ProfilingMiddleware)
 
 @app.on_event("startup")
 async def startup():
@@ -40,22 +47,31 @@ async def startup():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     
-    # Initialize scraper on startup (works on Linux/Mac, where Render runs)
-    print("=" * 50)
-    print("ATTEMPTING TO START SCRAPER...")
-    print("=" * 50)
+    # Launch Chromium, load cookies and warm up in the background so DB-backed
+    # endpoints serve immediately. Progress is reported by /health/ready.
+    from app.api.endpoints.pages import scraper
+    scraper.start_in_background()
+    logger.info("Scraper warmup started in background")
+
+    # Log a stack trace whenever something blocks the event loop
+    if settings.LOOP_LAG_THRESHOLD > 0:
+        loop_monitor.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await loop_monitor.stop()
+    # Closes Chromium and Playwright, cancelling the warmup if it is still running
+    from app.api.endpoints.pages import scraper
     try:
-        from app.api.endpoints.pages import scraper
-        print("Scraper imported successfully")
-        await scraper.start()
-        print("Scraper.start() completed")
+        await scraper.stop()
     except Exception as e:
-        print(f"ERROR starting scraper: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.warning(f"Failed to stop the scraper: {e}")
 
 app.include_router(pages.router, prefix="/api/v1", tags=["pages"])
 app.include_router(chat.router, prefix="/api/v1", tags=["chat"])
+app.include_router(health.router, tags=["health"])
+app.include_router(metrics.router, tags=["metrics"])
+app.include_router(debug.router, tags=["debug"])
 
 @app.get("/")
 async def root():
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, LargeBinary, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -48,6 +48,7 @@ class Comment(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     post_id = Column(Integer, ForeignKey("posts.id"))
+    urn = Column(String, unique=True, index=True, nullable=True)  # LinkedIn comment URN, for dedup
     
     author_name = Column(String, nullable=True)
     content = Column(Text)
@@ -65,6 +66,77 @@ class Employee(Base):
     name = Column(String, index=True)
     role = Column(String, nullable=True)
     location = Column(String, nullable=True)
-    profile_url = Column(String, nullable=True)
+    profile_url = Column(String, nullable=True, index=True)
     
     page = relationship("CompanyPage", back_populates="employees")
+
+
+class EmployeeCrawl(Base):
+    """Where a page's People directory crawl stopped, so the next run resumes there."""
+    __tablename__ = "employee_crawls"
+
+    id = Column(Integer, primary_key=True, index=True)
+    page_id = Column(Integer, ForeignKey("company_pages.id"), unique=True, index=True)
+
+    position = Column(Integer, default=0)  # Directory entries already crawled
+    exhausted = Column(Boolean, default=False)  # Reached the end; the next run starts from the top
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class PostVector(Base):
+    """Hashed term counts of a post's content for the local retrieval index."""
+    __tablename__ = "post_vectors"
+
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    page_id = Column(Integer, ForeignKey("company_pages.id"), index=True)
+
+    dim = Column(Integer)  # Hash space size the terms were bucketed into
+    terms = Column(LargeBinary)  # uint32 bucket indices
+    weights = Column(LargeBinary)  # float32 term counts, aligned with terms
+
+
+class PageBrief(Base):
+    """AI-generated brief for a page, tied to the version of the data it was built from."""
+    __tablename__ = "page_briefs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    page_id = Column(Integer, ForeignKey("company_pages.id"), unique=True, index=True)
+
+    source_version = Column(String(64))  # context_builder.context_version of the source data
+    model = Column(String, nullable=True)  # Model that wrote it, or 'fallback'
+    summary = Column(Text)
+    themes = Column(Text)  # JSON list of strings
+    engagement_notes = Column(Text, nullable=True)
+    generated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class ScrapeFailure(Base):
+    """Negative cache entry: a company id that recently couldn't be scraped, and when to try again."""
+    __tablename__ = "scrape_failures"
+
+    id = Column(Integer, primary_key=True, index=True)
+    linkedin_id = Column(String, unique=True, index=True)
+
+    reason = Column(String)  # 'not_found' or 'failed'
+    failure_count = Column(Integer, default=1)  # Consecutive failures; each doubles the retry window
+    last_error = Column(Text, nullable=True)
+    first_failed_at = Column(DateTime(timezone=True))
+    last_failed_at = Column(DateTime(timezone=True))
+    retry_at = Column(DateTime(timezone=True))  # Scrapes are skipped until then
+
+
+class ChangeLog(Base):
+    """Append-only record of scraped data that was added or changed; read by the /changes feed."""
+    __tablename__ = "change_log"
+
+    id = Column(Integer, primary_key=True, index=True)  # Monotonic feed cursor
+    page_id = Column(Integer, ForeignKey("company_pages.id"))
+
+    entity = Column(String)  # 'page', 'post' or 'employee'
+    entity_id = Column(Integer)
+    change = Column(String)  # 'created' or 'updated'
+    fields = Column(Text, nullable=True)  # JSON {"column": [old, new]} of an update
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Per-page feeds: WHERE page_id = ? AND id > ? ORDER BY id
+    __table_args__ = (Index("ix_change_log_page_id_id", "page_id", "id"),)
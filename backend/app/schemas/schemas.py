@@ -1,5 +1,6 @@
-from pydantic import BaseModel, ConfigDict
-from typing import List, Optional
+import json
+from pydantic import BaseModel, ConfigDict, field_validator
+from typing import List, Optional, Any
 from datetime import datetime
 
 class PageBase(BaseModel):
@@ -59,10 +60,13 @@ class Employee(EmployeeBase):
 class PageDetail(Page):
     posts: List[Post] = []
     employees: List[Employee] = []
+    # True when the request deadline cut the scrape short; missing data is fetched on a later request
+    partial: bool = False
 
 
 # Comment Schemas
 class CommentBase(BaseModel):
+    urn: Optional[str] = None
     author_name: Optional[str] = None
     content: str
 
@@ -88,3 +92,46 @@ class PaginatedResponse(BaseModel):
     skip: int
     limit: int
     has_more: bool
+
+
+# Change feed
+class Change(BaseModel):
+    id: int
+    page_id: int
+    linkedin_id: str
+    entity: str
+    entity_id: int
+    change: str
+    # Updated columns as {"column": [old, new]}; empty for created rows
+    fields: dict[str, List[Any]] = {}
+    changed_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("fields", mode="before")
+    @classmethod
+    def parse_fields(cls, value):
+        # Stored as a JSON-encoded object
+        if isinstance(value, str) or value is None:
+            return json.loads(value) if value else {}
+        return value
+
+
+# AI Brief Schema
+class PageBrief(BaseModel):
+    summary: str
+    themes: List[str] = []
+    engagement_notes: Optional[str] = None
+    source_version: str
+    model: Optional[str] = None
+    generated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("themes", mode="before")
+    @classmethod
+    def parse_themes(cls, value):
+        # Stored as a JSON-encoded list
+        if isinstance(value, str):
+            return json.loads(value) if value else []
+        return value
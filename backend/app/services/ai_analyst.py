@@ -1,26 +1,139 @@
-import google.generativeai as genai
 import os
+import json
+import time
+import hashlib
 import logging
 import asyncio
+import re
+import threading
+from collections import OrderedDict
+from app.core.config import settings
+from app.services import metrics
+from app.services.llm_executor import llm_executor, LLMOverloaded, is_rate_limit_error
 
 logger = logging.getLogger(__name__)
 
+
+def normalize_query(query: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation so trivial variants share a cache entry."""
+    return re.sub(r"\s+", " ", query.lower()).strip().rstrip("?!. ")
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache of analyst answers.
+
+    Keys hash the full prompt context (page fields and posts) together with the
+    normalized query, so any change in the scraped data produces a new key. Entries
+    are also tagged with their page so a re-scrape can drop them eagerly.
+    """
+
+    def __init__(self, max_size: int = 512, ttl: float = 3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires_at, page_key, response)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(context_data: dict, user_query: str) -> str:
+        context = json.dumps(context_data, sort_keys=True, default=str)
+        return hashlib.sha256(f"{context}\x00{normalize_query(user_query)}".encode()).hexdigest()
+
+    @staticmethod
+    def page_key(context_data: dict) -> str:
+        return str(context_data.get("linkedin_id") or context_data.get("name"))
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def set(self, key: str, page_key: str, response: str):
+        self._entries[key] = (time.monotonic() + self.ttl, page_key, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, page_key: str) -> int:
+        """Drop every cached answer for a page, e.g. after it was re-scraped."""
+        stale = [k for k, entry in self._entries.items() if entry[1] == page_key]
+        for k in stale:
+            del self._entries[k]
+        return len(stale)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Shared by every AiAnalyst in the process so scrape paths can invalidate it
+response_cache = ResponseCache(
+    max_size=settings.AI_RESPONSE_CACHE_SIZE,
+    ttl=settings.AI_RESPONSE_CACHE_TTL
+)
+
+
 class AiAnalyst:
     def __init__(self):
+        # Cheap: google.generativeai is imported and models are discovered on first use
         self.api_key = os.getenv("GEMINI_API_KEY")
         self.model = None
+        self.model_name = None
         self.fallback_mode = False
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
         
         if not self.api_key:
             logger.warning("GEMINI_API_KEY not found. AI Analyst will use fallback mode.")
             self.fallback_mode = True
+            self._initialized = True
+
+    def status(self) -> dict:
+        if self.fallback_mode:
+            state = "fallback"
+        elif not self._initialized:
+            state = "uninitialized"
+        else:
+            state = "ready"
+        return {
+            "state": state,
+            "model": self.model_name,
+            "response_cache": response_cache.stats(),
+            "executor": llm_executor.stats(),
+        }
+
+    async def _ensure_model(self):
+        """Import the Gemini SDK and pick a model on first use, once per process."""
+        if self._initialized:
             return
-            
+        async with self._init_lock:
+            if self._initialized:
+                return
+            # SDK import and model listing are blocking, keep them off the event loop
+            await asyncio.to_thread(self._init_model)
+            self._initialized = True
+
+    def _init_model(self):
         try:
+            import google.generativeai as genai
             genai.configure(api_key=self.api_key)
             
-            # List available models
-            available_models = [m.name for m in genai.list_models() if 'generateContent' in m.supported_generation_methods]
+            available_models = self._discover_models(genai)
             logger.info(f"Available Gemini Models: {available_models}")
             
             if not available_models:
@@ -37,30 +150,74 @@ class AiAnalyst:
             logger.error(f"Failed to initialize Gemini: {e}. Using fallback mode.", exc_info=True)
             self.fallback_mode = True
 
-    async def generate_response(self, context_data: dict, user_query: str) -> str:
-        # Fallback mode - provide helpful canned responses
-        if self.fallback_mode or not self.model:
-            company_name = context_data.get('name', 'this company')
-            query_lower = user_query.lower()
-            
-            # Intelligent fallback based on query keywords
-            if any(word in query_lower for word in ['what', 'who', 'describe']):
-                return f"Based on the available data, {company_name} operates in the {context_data.get('industry', 'technology')} sector with {context_data.get('follower_count', 0):,} followers on LinkedIn. {context_data.get('description', 'This company is actively building its presence on LinkedIn.')} For deeper AI-powered analysis, please configure a valid Gemini API key."
-            
-            elif any(word in query_lower for word in ['growth', 'strategy', 'future']):
-                return f"{company_name}'s LinkedIn presence shows {context_data.get('follower_count', 0):,} followers, suggesting {'strong' if context_data.get('follower_count', 0) > 10000 else 'growing'} brand awareness. To unlock AI-powered growth predictions and strategic insights, please configure a valid Gemini API key."
-            
-            elif any(word in query_lower for word in ['post', 'content', 'engage']):
-                post_count = len(context_data.get('posts', []))
-                return f"I can see {post_count} recent posts from {company_name}. For AI-powered content analysis and engagement insights, please configure a valid Gemini API key. In the meantime, you can review the posts manually in the dashboard above."
-            
-            else:
-                return f"I'd love to provide deeper insights about {company_name}, but I'm currently running in fallback mode. The data shows: {context_data.get('follower_count', 0):,} followers, {context_data.get('industry', 'N/A')} industry. For AI-powered analysis, please configure a valid Gemini API key in your backend .env file."
+    def _discover_models(self, genai) -> list:
+        """List generateContent-capable models, cached on disk per API key for GEMINI_MODELS_CACHE_TTL seconds."""
+        cache_file = settings.GEMINI_MODELS_CACHE_FILE
+        key_hash = hashlib.sha256(self.api_key.encode()).hexdigest()
 
-        # Original Gemini API logic
+        try:
+            with open(cache_file, 'r') as f:
+                cached = json.load(f)
+            if cached.get("key_hash") == key_hash and time.time() - cached.get("fetched_at", 0) < settings.GEMINI_MODELS_CACHE_TTL:
+                logger.info(f"Using cached Gemini model list from {cache_file}")
+                return cached.get("models", [])
+        except (OSError, ValueError):
+            pass
+
+        models = [m.name for m in genai.list_models() if 'generateContent' in m.supported_generation_methods]
+        try:
+            with open(cache_file, 'w') as f:
+                json.dump({"key_hash": key_hash, "fetched_at": time.time(), "models": models}, f)
+        except OSError as e:
+            logger.warning(f"Could not write Gemini model cache {cache_file}: {e}")
+        return models
+
+    def _fallback_response(self, context_data: dict, user_query: str) -> str:
+        """Canned keyword-based answer used when no Gemini model is available."""
         company_name = context_data.get('name', 'this company')
+        query_lower = user_query.lower()
         
-        prompt = f"""
+        # Intelligent fallback based on query keywords
+        if any(word in query_lower for word in ['what', 'who', 'describe']):
+            return f"Based on the available data, {company_name} operates in the {context_data.get('industry', 'technology')} sector with {context_data.get('follower_count', 0):,} followers on LinkedIn. {context_data.get('description', 'This company is actively building its presence on LinkedIn.')} For deeper AI-powered analysis, please configure a valid Gemini API key."
+        
+        elif any(word in query_lower for word in ['growth', 'strategy', 'future']):
+            return f"{company_name}'s LinkedIn presence shows {context_data.get('follower_count', 0):,} followers, suggesting {'strong' if context_data.get('follower_count', 0) > 10000 else 'growing'} brand awareness. To unlock AI-powered growth predictions and strategic insights, please configure a valid Gemini API key."
+        
+        elif any(word in query_lower for word in ['post', 'content', 'engage']):
+            post_count = len(context_data.get('posts', []))
+            return f"I can see {post_count} recent posts from {company_name}. For AI-powered content analysis and engagement insights, please configure a valid Gemini API key. In the meantime, you can review the posts manually in the dashboard above."
+        
+        else:
+            return f"I'd love to provide deeper insights about {company_name}, but I'm currently running in fallback mode. The data shows: {context_data.get('follower_count', 0):,} followers, {context_data.get('industry', 'N/A')} industry. For AI-powered analysis, please configure a valid Gemini API key in your backend .env file."
+
+    def _error_response(self, context_data: dict) -> str:
+        """Data-only answer returned when a Gemini call fails."""
+        company_name = context_data.get('name', 'this company')
+        return f"I encountered a temporary issue accessing my AI processor. However, based on the data: {company_name} has {context_data.get('follower_count', 0):,} followers in the {context_data.get('industry', 'technology')} industry. {context_data.get('description', '')} Please try asking again or check the backend logs for details."
+
+    @staticmethod
+    def _pack_posts(posts: list, token_budget: int = None) -> list:
+        """
+        Take posts in order (most relevant first) until the token budget is spent,
+        estimating ~4 characters per token. The first post is truncated rather than dropped.
+        """
+        budget = settings.ANALYST_POST_TOKEN_BUDGET if token_budget is None else token_budget
+        packed = []
+        for post in posts:
+            tokens = len(post) // 4 + 1
+            if tokens > budget:
+                if not packed and budget > 0:
+                    packed.append(post[:budget * 4])
+                break
+            packed.append(post)
+            budget -= tokens
+        return packed
+
+    def _build_prompt(self, context_data: dict, user_query: str) -> str:
+        company_name = context_data.get('name', 'this company')
+        
+        return f"""
         You are an elite Business Analyst AI for LinkedIn data.
         
         Current Company Context:
@@ -71,7 +228,7 @@ class AiAnalyst:
         Headcount: {context_data.get('head_count')}
         Website: {context_data.get('website')}
         
-        Recent Posts: {str(context_data.get('posts', [])[:3])}
+        Relevant Posts: {str(self._pack_posts(context_data.get('posts', [])))}
         
         User Query: {user_query}
         
@@ -79,14 +236,197 @@ class AiAnalyst:
         Focus on business strategy, brand presence, and growth interpretation.
         Keep the response under 150 words unless asked for a detailed report.
         """
+
+    async def generate_response(self, context_data: dict, user_query: str) -> str:
+        await self._ensure_model()
+
+        # Fallback mode - provide helpful canned responses
+        if self.fallback_mode or not self.model:
+            return self._fallback_response(context_data, user_query)
+
+        # Identical context and question: answer from cache without spending quota
+        cache_key = response_cache.make_key(context_data, user_query)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Original Gemini API logic
+        prompt = self._build_prompt(context_data, user_query)
         
         try:
-            # Run synchronous Gemini call in thread pool to avoid blocking event loop
+            # Run synchronous Gemini call on the bounded LLM executor to avoid blocking event loop
             logger.info(f"Sending query to Gemini: {user_query[:50]}...")
-            response = await asyncio.to_thread(self.model.generate_content, prompt)
+            response = await llm_executor.run(self.model.generate_content, prompt)
             logger.info("Gemini response received successfully")
+            response_cache.set(cache_key, response_cache.page_key(context_data), response.text)
             return response.text
+        except LLMOverloaded:
+            # Surface as 429/503 with Retry-After instead of a canned answer
+            raise
         except Exception as e:
             logger.error(f"Gemini API Error: {e}", exc_info=True)
             # Return fallback response instead of error message
-            return f"I encountered a temporary issue accessing my AI processor. However, based on the data: {company_name} has {context_data.get('follower_count', 0):,} followers in the {context_data.get('industry', 'technology')} industry. {context_data.get('description', '')} Please try asking again or check the backend logs for details."
+            return self._error_response(context_data)
+
+    async def active_model(self) -> str:
+        """Name of the model answers come from, or 'fallback'."""
+        await self._ensure_model()
+        if self.fallback_mode or not self.model:
+            return "fallback"
+        return self.model_name
+
+    def _fallback_brief(self, context_data: dict) -> dict:
+        """Data-only brief: description, most frequent post terms and post counts."""
+        from app.services.retrieval import tokenize
+        company_name = context_data.get('name', 'this company')
+        posts = context_data.get('posts', [])
+        name_terms = set(tokenize(company_name))
+        frequency = {}
+        for post in posts:
+            for term in tokenize(post):
+                if term not in name_terms and len(term) > 3:
+                    frequency[term] = frequency.get(term, 0) + 1
+        themes = sorted(frequency, key=lambda t: (-frequency[t], t))[:5]
+        return {
+            "summary": context_data.get('description') or f"{company_name} operates in the {context_data.get('industry') or 'technology'} sector.",
+            "themes": themes,
+            "engagement_notes": f"{company_name} has {context_data.get('follower_count') or 0:,} followers and {len(posts)} recent posts on record.",
+        }
+
+    async def generate_brief(self, context_data: dict):
+        """
+        Structured brief for a page: {"summary", "themes", "engagement_notes"}.
+        Returns None if the model is temporarily unavailable, so the caller can retry later.
+        """
+        await self._ensure_model()
+        if self.fallback_mode or not self.model:
+            return self._fallback_brief(context_data)
+
+        prompt = f"""
+        You are an elite Business Analyst AI for LinkedIn data.
+        
+        Company: {context_data.get('name')}
+        Description: {context_data.get('description')}
+        Industry: {context_data.get('industry')}
+        Followers: {context_data.get('follower_count')}
+        Headcount: {context_data.get('head_count')}
+        Recent Posts: {str(self._pack_posts(context_data.get('posts', [])))}
+        
+        Write a brief on this company as JSON with exactly these keys:
+        "summary": what the company does and its recent activity, under 80 words;
+        "themes": a list of up to 5 short recurring themes in its posts;
+        "engagement_notes": one or two sentences on audience size and posting activity.
+        Respond with the JSON object only.
+        """
+        try:
+            response = await llm_executor.run(self.model.generate_content, prompt)
+        except Exception as e:
+            logger.warning(f"Brief generation failed for {context_data.get('name')}: {e}")
+            return None
+
+        text = response.text.strip()
+        # Models often wrap JSON in a markdown fence
+        text = re.sub(r"^```(?:json)?\s*|\s*```$", "", text)
+        try:
+            brief = json.loads(text)
+            return {
+                "summary": str(brief.get("summary", "")),
+                "themes": [str(t) for t in brief.get("themes", [])][:5],
+                "engagement_notes": str(brief.get("engagement_notes", "")),
+            }
+        except (ValueError, AttributeError):
+            logger.warning("Brief response was not valid JSON, using its text as the summary")
+            return {**self._fallback_brief(context_data), "summary": text}
+
+    async def stream_response(self, context_data: dict, user_query: str):
+        """
+        Async generator yielding the answer in text chunks as Gemini produces them.
+
+        Fallback, cached and error answers are yielded in word-sized chunks so clients
+        handle every path the same way. Closing the generator (e.g. on client
+        disconnect) stops consuming the Gemini stream.
+        """
+        await self._ensure_model()
+
+        if self.fallback_mode or not self.model:
+            async for chunk in chunk_text(self._fallback_response(context_data, user_query)):
+                yield chunk
+            return
+
+        cache_key = response_cache.make_key(context_data, user_query)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            async for chunk in chunk_text(cached):
+                yield chunk
+            return
+
+        prompt = self._build_prompt(context_data, user_query)
+        parts = []
+        started = None
+        try:
+            logger.info(f"Streaming query to Gemini: {user_query[:50]}...")
+            async with llm_executor.slot():
+                started = time.perf_counter()
+                async for text in self._stream_model(prompt):
+                    parts.append(text)
+                    yield text
+        except LLMOverloaded:
+            raise
+        except Exception as e:
+            logger.error(f"Gemini API Error: {e}", exc_info=True)
+            if started is not None:
+                outcome = "rate_limited" if is_rate_limit_error(e) else "error"
+                metrics.llm_call_duration.observe(time.perf_counter() - started, mode="stream", outcome=outcome)
+                metrics.llm_errors.inc(kind=outcome)
+            if not parts:
+                async for chunk in chunk_text(self._error_response(context_data)):
+                    yield chunk
+            return
+        metrics.llm_call_duration.observe(time.perf_counter() - started, mode="stream", outcome="ok")
+        response_cache.set(cache_key, response_cache.page_key(context_data), "".join(parts))
+
+    async def _stream_model(self, prompt: str):
+        """Relay chunks from the blocking Gemini stream iterator running in a worker thread."""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        cancelled = threading.Event()
+        done = object()
+
+        def produce():
+            try:
+                for chunk in self.model.generate_content(prompt, stream=True):
+                    if cancelled.is_set():
+                        break
+                    if chunk.text:
+                        loop.call_soon_threadsafe(queue.put_nowait, chunk.text)
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+
+        producer = loop.run_in_executor(llm_executor.executor, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Tell the worker to stop pulling from Gemini if the consumer went away
+            cancelled.set()
+            if not producer.done():
+                producer.add_done_callback(lambda f: f.exception())
+
+
+# Shared by chat and background brief generation
+analyst = AiAnalyst()
+
+
+async def chunk_text(text: str, words_per_chunk: int = 4):
+    """Yield canned text in small chunks, matching the shape of a model stream."""
+    words = text.split(" ")
+    for i in range(0, len(words), words_per_chunk):
+        chunk = " ".join(words[i:i + words_per_chunk])
+        yield chunk if i + words_per_chunk >= len(words) else chunk + " "
+        await asyncio.sleep(0)
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import logging
+import re
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import database
+from app.models.models import CompanyPage, PageBrief
+from app.services import context_builder, deadline
+from app.services.ai_analyst import analyst
+
+logger = logging.getLogger(__name__)
+
+# Questions a stored brief can answer without a model call: whole-message requests for an
+# overview of the company itself ("Summarize", "Tell me about Acme", "What do they do?").
+# Anything narrower ("What is their growth strategy?", "Who is the CEO?") goes to the model.
+_POLITE = r"(?:(?:please|can you|could you|would you)\s+)*"
+_SUBJECT = r"(?:this company|the company|this page|the page|this|them|it|they{name})"
+_BRIEF_QUERY_PATTERNS = (
+    _POLITE + r"(?:give me |show me )?(?:a |an |the )?(?:quick |short |brief |high level )?"
+    r"(?:summary|overview|description)(?: of " + _SUBJECT + r")?",
+    _POLITE + r"(?:summari[sz]e|describe|give an overview of|tell me about)(?: " + _SUBJECT + r")?",
+    r"what (?:does|do|is) " + _SUBJECT + r"(?: do)?",
+    r"who (?:is|are) " + _SUBJECT,
+)
+
+
+def is_brief_query(message: str, company_name: Optional[str] = None) -> bool:
+    text = " ".join(re.sub(r"[^\w\s]", " ", message.lower()).split())
+    name = "|" + re.escape(" ".join(re.sub(r"[^\w\s]", " ", company_name.lower()).split())) if company_name else ""
+    subject_patterns = (p.replace("{name}", name) for p in _BRIEF_QUERY_PATTERNS)
+    return any(re.fullmatch(p, text) for p in subject_patterns)
+
+
+def format_brief(brief: PageBrief) -> str:
+    themes = json.loads(brief.themes) if brief.themes else []
+    parts = [brief.summary]
+    if themes:
+        parts.append(f"Recurring themes: {', '.join(themes)}.")
+    if brief.engagement_notes:
+        parts.append(brief.engagement_notes)
+    return " ".join(parts)
+
+
+async def _get_brief_row(db: AsyncSession, linkedin_id: str):
+    result = await db.execute(
+        select(CompanyPage.id, PageBrief)
+        .outerjoin(PageBrief, PageBrief.page_id == CompanyPage.id)
+        .where(CompanyPage.linkedin_id == linkedin_id)
+    )
+    return result.first()
+
+
+async def get_fresh_brief(db: AsyncSession, linkedin_id: str, context: dict) -> Optional[PageBrief]:
+    """The stored brief if it was built from exactly this context by the current model, else None."""
+    row = await _get_brief_row(db, linkedin_id)
+    brief = row.PageBrief if row else None
+    if brief is None:
+        return None
+    if brief.source_version != context_builder.context_version(context):
+        return None
+    if brief.model != await analyst.active_model():
+        return None
+    return brief
+
+
+async def refresh_brief(db: AsyncSession, linkedin_id: str) -> Optional[PageBrief]:
+    """Generate and store a brief for the page unless the stored one is still current."""
+    context = await context_builder.get_chat_context(db, linkedin_id)
+    if context is None:
+        return None
+    fresh = await get_fresh_brief(db, linkedin_id, context)
+    if fresh is not None:
+        return fresh
+
+    generated = await analyst.generate_brief(context)
+    if generated is None:
+        return None
+
+    row = await _get_brief_row(db, linkedin_id)
+    brief = row.PageBrief or PageBrief(page_id=row.id)
+    brief.source_version = context_builder.context_version(context)
+    brief.model = await analyst.active_model()
+    brief.summary = generated["summary"]
+    brief.themes = json.dumps(generated["themes"])
+    brief.engagement_notes = generated["engagement_notes"]
+    db.add(brief)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent refresh stored the first brief for this page
+        await db.rollback()
+        row = await _get_brief_row(db, linkedin_id)
+        return row.PageBrief if row else None
+    await db.refresh(brief)
+    logger.info(f"Stored brief for {linkedin_id} (model={brief.model})")
+    return brief
+
+
+# One background refresh per page at a time, and the pages whose data changed again during it
+_refresh_tasks: dict = {}
+_refresh_dirty: set = set()
+
+
+async def _run_refresh(linkedin_id: str):
+    # Not bound by the deadline of the request that scheduled it
+    deadline.clear()
+    try:
+        while True:
+            async with database.SessionLocal() as session:
+                try:
+                    await refresh_brief(session, linkedin_id)
+                except Exception as e:
+                    logger.error(f"Background brief refresh failed for {linkedin_id}: {e}")
+            # A scrape landed while the brief was generated: build it once more from the new data
+            if linkedin_id not in _refresh_dirty:
+                break
+            _refresh_dirty.discard(linkedin_id)
+    finally:
+        _refresh_tasks.pop(linkedin_id, None)
+        _refresh_dirty.discard(linkedin_id)
+
+
+def schedule_brief_refresh(linkedin_id: str):
+    """Regenerate the page's brief in the background after its data changed."""
+    if linkedin_id in _refresh_tasks:
+        _refresh_dirty.add(linkedin_id)
+        return
+    _refresh_tasks[linkedin_id] = asyncio.create_task(_run_refresh(linkedin_id))
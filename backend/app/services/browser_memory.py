@@ -0,0 +1,43 @@
+"""Resident memory of the Chromium processes Playwright launched, read from /proc."""
+import os
+from pathlib import Path
+
+
+def _children(pid: int) -> list:
+    try:
+        tasks = os.listdir(f"/proc/{pid}/task")
+    except OSError:
+        return []
+    children = []
+    for tid in tasks:
+        try:
+            children.extend(int(c) for c in Path(f"/proc/{pid}/task/{tid}/children").read_text().split())
+        except OSError:
+            continue
+    return children
+
+
+def _rss_kb(pid: int) -> int:
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def chromium_rss_mb(root_pid: int = None) -> float:
+    """Total RSS of Chromium processes descended from this process (0 where /proc isn't available)."""
+    pending = _children(root_pid or os.getpid())
+    total_kb = 0
+    while pending:
+        pid = pending.pop()
+        try:
+            name = Path(f"/proc/{pid}/comm").read_text().strip().lower()
+        except OSError:
+            continue
+        if "chrom" in name or "headless_shell" in name:
+            total_kb += _rss_kb(pid)
+        pending.extend(_children(pid))
+    return round(total_kb / 1024, 1)
@@ -0,0 +1,108 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Navigation outcomes that mean LinkedIn is refusing our sessions, not that one page is bad
+BLOCKED_OUTCOMES = ("authwall", "checkpoint", "throttled")
+
+
+class ScraperUnavailable(Exception):
+    """The scraper is refusing work for now; retry after `retry_after` seconds."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Stops scraping after `failure_threshold` consecutive blocked navigations.
+
+    closed -> open: traffic is refused for the current backoff.
+    open -> half_open: once the backoff has passed, one probe scrape is let through
+    (another one after `probe_timeout` if the first never reports back).
+    half_open -> closed on a successful probe, resetting the backoff; -> open on a
+    blocked probe, doubling the backoff up to `max_backoff`. A Retry-After sent by
+    LinkedIn extends the backoff.
+    """
+
+    def __init__(self, failure_threshold: int = 3, backoff: float = 60, max_backoff: float = 1800, probe_timeout: float = 120):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = backoff
+        self.max_backoff = max_backoff
+        self.probe_timeout = probe_timeout
+        self.backoff = backoff
+        self.consecutive_failures = 0
+        self.opened_until = 0.0
+        self.opens = 0
+        self.last_reason = None
+        self._open = False
+        self._probe_started = 0.0
+
+    @property
+    def state(self) -> str:
+        if not self._open:
+            return "closed"
+        return "open" if time.monotonic() < self.opened_until else "half_open"
+
+    def allow(self) -> bool:
+        """Whether a scrape may start now; in half_open this reserves the probe."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open":
+            return False
+        now = time.monotonic()
+        if now - self._probe_started < self.probe_timeout:
+            return False
+        self._probe_started = now
+        return True
+
+    def retry_after(self) -> int:
+        """Seconds until scrapes are accepted again (0 when they are now)."""
+        if self.state != "open":
+            return 0
+        return max(1, int(self.opened_until - time.monotonic()) + 1)
+
+    def release_probe(self):
+        """Give back a half-open probe reserved by allow() for a scrape that never navigated."""
+        self._probe_started = 0.0
+
+    def record(self, outcome: str, retry_after: float = None):
+        """Feed a navigation outcome: ok/not_found close the breaker, blocked outcomes count
+        towards opening it, anything else (timeouts, extraction errors) just frees the probe."""
+        self.release_probe()
+        if outcome in ("ok", "not_found"):
+            if self._open:
+                logger.info("Scraper circuit breaker closed")
+            self._open = False
+            self.consecutive_failures = 0
+            self.backoff = self.base_backoff
+            return
+        if outcome not in BLOCKED_OUTCOMES:
+            return
+        self.consecutive_failures += 1
+        self.last_reason = outcome
+        if self._open:
+            # A blocked half-open probe (or a late result from before opening)
+            self.backoff = min(self.backoff * 2, self.max_backoff)
+        elif self.consecutive_failures < self.failure_threshold:
+            return
+        self._trip(max(self.backoff, retry_after or 0))
+
+    def _trip(self, seconds: float):
+        self._open = True
+        self.opens += 1
+        self.opened_until = time.monotonic() + seconds
+        logger.warning(f"Scraper circuit breaker open for {seconds:.0f}s after {self.consecutive_failures} x {self.last_reason}")
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "retry_after": self.retry_after(),
+            "consecutive_failures": self.consecutive_failures,
+            "backoff": self.backoff,
+            "opens": self.opens,
+            "last_reason": self.last_reason,
+        }
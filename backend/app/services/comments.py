@@ -0,0 +1,68 @@
+import asyncio
+import logging
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import database
+from app.core.config import settings
+from app.services import crud, deadline
+
+logger = logging.getLogger(__name__)
+
+
+async def ingest_comments(db: AsyncSession, scraper, posts: list) -> int:
+    """
+    Scrape comments for `posts` ((post id, post_url) pairs) with at most
+    COMMENTS_CRAWL_CONCURRENCY tabs at a time and store them in one bulk insert.
+    Returns the number of new comments.
+    """
+    semaphore = asyncio.Semaphore(settings.COMMENTS_CRAWL_CONCURRENCY)
+
+    async def fetch(post_id: int, post_url: str):
+        async with semaphore:
+            return post_id, await scraper.scrape_comments(post_url)
+
+    results = await asyncio.gather(*(fetch(*post) for post in posts), return_exceptions=True)
+    comments_by_post = {}
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.warning(f"Comment scrape failed: {result}")
+            continue
+        post_id, comments = result
+        if comments:
+            comments_by_post[post_id] = comments
+    return await crud.bulk_create_comments(db, comments_by_post)
+
+
+# One background ingestion per page at a time, and the posts stored while it runs
+_ingest_tasks: dict = {}
+_pending_posts: dict = {}
+
+
+async def _run_ingest(scraper, linkedin_id: str, posts: list):
+    # Not bound by the deadline of the request that scheduled it
+    deadline.clear()
+    try:
+        async with database.SessionLocal() as session:
+            while posts:
+                try:
+                    created = await ingest_comments(session, scraper, posts)
+                    logger.info(f"Stored {created} comments for {len(posts)} posts of {linkedin_id}")
+                except Exception as e:
+                    logger.error(f"Background comment ingestion failed for {linkedin_id}: {e}")
+                # Follow-up pass for posts that were stored while this one ran
+                posts = _pending_posts.pop(linkedin_id, [])
+    finally:
+        _ingest_tasks.pop(linkedin_id, None)
+        _pending_posts.pop(linkedin_id, None)
+
+
+def schedule_comment_ingestion(scraper, linkedin_id: str, posts: list):
+    """Fetch comments in the background for newly stored posts that have any."""
+    targets = [(p.id, p.post_url) for p in posts if p.comment_count][:settings.COMMENTS_CRAWL_MAX_POSTS]
+    if not targets:
+        return
+    if linkedin_id in _ingest_tasks:
+        pending = _pending_posts.setdefault(linkedin_id, [])
+        pending.extend(t for t in targets if t not in pending)
+        del pending[settings.COMMENTS_CRAWL_MAX_POSTS:]
+        return
+    _ingest_tasks[linkedin_id] = asyncio.create_task(_run_ingest(scraper, linkedin_id, targets))
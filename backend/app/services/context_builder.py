@@ -0,0 +1,94 @@
+import time
+import json
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+from sqlalchemy import select, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.models import CompanyPage, Post
+
+# Page columns the analyst prompt uses
+CONTEXT_FIELDS = ("linkedin_id", "name", "description", "industry", "follower_count", "head_count", "website")
+
+
+class ContextCache:
+    """Assembled chat contexts per page, kept until the page is re-scraped (or the TTL lapses)."""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()  # linkedin_id -> (expires_at, context)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, linkedin_id: str) -> Optional[dict]:
+        entry = self._entries.get(linkedin_id)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._entries[linkedin_id]
+            return None
+        self._entries.move_to_end(linkedin_id)
+        return entry[1]
+
+    def set(self, linkedin_id: str, context: dict):
+        self._entries[linkedin_id] = (time.monotonic() + self.ttl, context)
+        self._entries.move_to_end(linkedin_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, linkedin_id: str):
+        self._entries.pop(linkedin_id, None)
+
+
+def context_version(context: dict) -> str:
+    """Stable fingerprint of a chat context; changes whenever the page or its recent posts change."""
+    return hashlib.sha256(json.dumps(context, sort_keys=True, default=str).encode()).hexdigest()
+
+
+context_cache = ContextCache(ttl=settings.CHAT_CONTEXT_CACHE_TTL)
+
+
+async def fetch_chat_context(db: AsyncSession, linkedin_id: str, post_limit: int = 5) -> Optional[dict]:
+    """
+    Load the analyst context for a page in one query: the needed page columns joined
+    to its `post_limit` most recent post contents. Returns None if the page is unknown.
+    """
+    ranked_posts = (
+        select(
+            Post.page_id,
+            Post.content,
+            func.row_number().over(
+                partition_by=Post.page_id,
+                order_by=(func.coalesce(Post.posted_at_timestamp, Post.created_at).desc(), Post.id.desc())
+            ).label("rank")
+        )
+        .join(CompanyPage, CompanyPage.id == Post.page_id)
+        .where(CompanyPage.linkedin_id == linkedin_id)
+        .subquery()
+    )
+    stmt = (
+        select(*(getattr(CompanyPage, f) for f in CONTEXT_FIELDS), ranked_posts.c.content)
+        .outerjoin(ranked_posts, and_(ranked_posts.c.page_id == CompanyPage.id, ranked_posts.c.rank <= post_limit))
+        .where(CompanyPage.linkedin_id == linkedin_id)
+        .order_by(ranked_posts.c.rank)
+    )
+    rows = (await db.execute(stmt)).all()
+    if not rows:
+        return None
+
+    context = {f: getattr(rows[0], f) for f in CONTEXT_FIELDS}
+    context["posts"] = [row.content for row in rows if row.content]
+    return context
+
+
+async def get_chat_context(db: AsyncSession, linkedin_id: str) -> Optional[dict]:
+    """Cached wrapper around fetch_chat_context."""
+    context = context_cache.get(linkedin_id)
+    if context is None:
+        context = await fetch_chat_context(db, linkedin_id, post_limit=settings.CHAT_CONTEXT_POSTS)
+        if context is not None:
+            context_cache.set(linkedin_id, context)
+    return context
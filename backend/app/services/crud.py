@@ -1,79 +1,230 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from app.models.models import CompanyPage, Post, Employee
+from sqlalchemy import select, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload, load_only, noload
+from app.models.models import CompanyPage, Post, Employee, EmployeeCrawl, ScrapeFailure, ChangeLog
 from app.schemas import schemas
 from datetime import datetime
+from typing import Optional
 
-async def get_page_by_linkedin_id(db: AsyncSession, linkedin_id: str):
+# Columns and relationships of CompanyPage that callers may select via sparse fieldsets
+PAGE_FIELDS = (
+    "id", "linkedin_id", "name", "description", "website", "industry",
+    "follower_count", "head_count", "founded", "specialties",
+    "profile_image_url", "created_at", "last_scraped_at",
+)
+PAGE_RELATIONSHIPS = ("posts", "employees")
+# Always selected so a sparse page can still be identified
+PAGE_KEY_FIELDS = ("id", "linkedin_id")
+# Scraped columns compared against the stored row on ingest; posted_at_timestamp is left
+# out since it is often derived from a relative age ("3d") and drifts between scrapes
+POST_DIFF_FIELDS = ("content", "like_count", "comment_count")
+EMPLOYEE_DIFF_FIELDS = ("name", "role", "location")
+
+
+def page_load_options(fields: Optional[set] = None, include: Optional[set] = None):
+    """
+    Build loader options for a CompanyPage query.
+
+    `fields=None` loads every column and `include=None` loads every relationship,
+    matching the full PageDetail. Otherwise only the named columns are selected and
+    relationships outside `include` are never queried.
+    """
+    options = []
+    if fields is not None:
+        wanted = set(fields) | set(PAGE_KEY_FIELDS)
+        options.append(load_only(*(getattr(CompanyPage, f) for f in PAGE_FIELDS if f in wanted)))
+    for rel in PAGE_RELATIONSHIPS:
+        if include is None or rel in include:
+            options.append(selectinload(getattr(CompanyPage, rel)))
+        else:
+            options.append(noload(getattr(CompanyPage, rel)))
+    return options
+
+
+async def get_page_by_linkedin_id(
+    db: AsyncSession,
+    linkedin_id: str,
+    fields: Optional[set] = None,
+    include: Optional[set] = None
+):
     result = await db.execute(
         select(CompanyPage)
-        .options(selectinload(CompanyPage.posts), selectinload(CompanyPage.employees))
+        .options(*page_load_options(fields, include))
         .filter(CompanyPage.linkedin_id == linkedin_id)
+        .execution_options(populate_existing=True)
     )
     return result.scalars().first()
 
 async def create_page(db: AsyncSession, page: schemas.PageCreate):
     db_page = CompanyPage(**page.model_dump())
     db.add(db_page)
+    await db.flush()
+    log_change(db, db_page.id, "page", db_page.id, "created")
     await db.commit()
     await db.refresh(db_page)
     return db_page
 
 async def update_page_details(db: AsyncSession, page_id: int, page_data: dict):
-    # Retrieve page to update
-    result = await db.execute(select(CompanyPage).filter(CompanyPage.id == page_id))
-    db_page = result.scalars().first()
-    if db_page:
-        for key, value in page_data.items():
-            setattr(db_page, key, value)
-        db_page.last_scraped_at = datetime.now()
-        await db.commit()
-        await db.refresh(db_page)
-    return db_page
+    """
+    Apply freshly scraped page data, writing only the columns whose value changed and
+    logging them to the change log; an unchanged page only gets last_scraped_at touched.
+    Returns the changed columns as {column: (old, new)}, or None if there is no such page.
+    """
+    from sqlalchemy import update
+    columns = [c for c in page_data if c in PAGE_FIELDS and c not in PAGE_KEY_FIELDS and c not in ("created_at", "last_scraped_at")]
+    result = await db.execute(select(CompanyPage.id, *(getattr(CompanyPage, c) for c in columns)).filter(CompanyPage.id == page_id))
+    stored = result.first()
+    if stored is None:
+        return None
+    changed = diff_fields(stored._mapping, page_data, columns)
+    values = {column: new for column, (_, new) in changed.items()}
+    await db.execute(update(CompanyPage).where(CompanyPage.id == page_id).values(**values, last_scraped_at=datetime.now()))
+    if changed:
+        log_change(db, page_id, "page", page_id, "updated", changed)
+    await db.commit()
+    return changed
 
 async def create_posts(db: AsyncSession, page_id: int, posts: list[schemas.PostCreate]):
-    # This might need basic dedup logic based on post_url
+    """
+    Insert the posts whose post_url isn't stored yet and update the changed columns of
+    those that are (one lookup for the batch), logging both. Returns the new posts.
+    """
+    urls = {post.post_url for post in posts}
+    existing = {}
+    if urls:
+        result = await db.execute(
+            select(Post).options(load_only(Post.id, Post.page_id, Post.post_url, *(getattr(Post, f) for f in POST_DIFF_FIELDS)))
+            .where(Post.post_url.in_(urls))
+        )
+        existing = {post.post_url: post for post in result.scalars()}
     created_posts = []
+    edited_posts = []
+    updated = False
     for post in posts:
-        # Check if exists
-        result = await db.execute(select(Post).filter(Post.post_url == post.post_url))
-        existing = result.scalars().first()
-        if not existing:
-            db_post = Post(page_id=page_id, **post.model_dump())
-            db.add(db_post)
-            created_posts.append(db_post)
+        stored = existing.get(post.post_url)
+        if stored is not None:
+            # A post repeated within the batch has no id yet
+            if stored.id is not None:
+                old_content = stored.content
+                if _apply_changes(db, stored, post.model_dump(), POST_DIFF_FIELDS, "post"):
+                    updated = True
+                    if stored.content != old_content:
+                        edited_posts.append(stored)
+            continue
+        db_post = Post(page_id=page_id, **post.model_dump())
+        db.add(db_post)
+        existing[post.post_url] = db_post
+        created_posts.append(db_post)
     
+    from app.services import retrieval
+    # Edited posts must not keep being retrieved by their old text
+    await retrieval.reindex_posts(db, edited_posts)
     if created_posts:
+        # Flush for ids, then index the new posts for retrieval in the same transaction
+        await db.flush()
+        retrieval.index_new_posts(db, created_posts)
+        for db_post in created_posts:
+            log_change(db, page_id, "post", db_post.id, "created")
+    if created_posts or updated:
         await db.commit()
     return created_posts
 
 
+async def get_recent_post_urls(db: AsyncSession, page_id: int, limit: int = 500) -> list:
+    """post_url of the page's newest stored posts, used as the posts crawler's stop set."""
+    from sqlalchemy import func
+    result = await db.execute(
+        select(Post.post_url)
+        .where(Post.page_id == page_id)
+        .order_by(func.coalesce(Post.posted_at_timestamp, Post.created_at).desc(), Post.id.desc())
+        .limit(limit)
+    )
+    return list(result.scalars())
+
+
 async def create_employees(db: AsyncSession, page_id: int, employees: list[schemas.EmployeeCreate]):
+    """
+    Store a page's new employees and update changed ones, with one lookup query per batch.
+
+    People are matched by profile URL, or by name when they have none. A matched
+    person's changed name, role or location is updated; rows stored before profile
+    URLs were scraped are matched by name and get the URL filled in. New and changed
+    rows are logged. Returns the new rows.
+    """
+    from sqlalchemy import or_
+    if not employees:
+        return []
+    urls = {e.profile_url for e in employees if e.profile_url}
+    result = await db.execute(
+        select(Employee).filter(
+            Employee.page_id == page_id,
+            or_(Employee.profile_url.in_(urls), Employee.name.in_({e.name for e in employees}))
+        )
+    )
+    by_url, unlinked, names = {}, {}, set()
+    for row in result.scalars():
+        names.add(row.name)
+        if row.profile_url:
+            by_url[row.profile_url] = row
+        else:
+            unlinked.setdefault(row.name, row)
+
     created_employees = []
+    updated = False
     for emp in employees:
-        # Basic dedup: check by name and page_id (not perfect but suffices for now)
-        result = await db.execute(select(Employee).filter(Employee.page_id == page_id, Employee.name == emp.name))
-        existing = result.scalars().first()
-        if not existing:
-            db_emp = Employee(page_id=page_id, **emp.model_dump())
-            db.add(db_emp)
-            created_employees.append(db_emp)
-    
+        if emp.profile_url:
+            if emp.profile_url in by_url:
+                row = by_url[emp.profile_url]
+            else:
+                row = unlinked.pop(emp.name, None)
+            if row is not None:
+                by_url[emp.profile_url] = row
+                data = emp.model_dump()
+                # A source without a role or location (profile JSON) doesn't blank the stored one
+                data["role"], data["location"] = emp.role or row.role, emp.location or row.location
+                if row.id is not None:
+                    updated = _apply_changes(db, row, data, EMPLOYEE_DIFF_FIELDS + ("profile_url",), "employee") or updated
+                continue
+        elif emp.name in names:
+            continue
+        db_emp = Employee(page_id=page_id, **emp.model_dump())
+        db.add(db_emp)
+        created_employees.append(db_emp)
+        names.add(emp.name)
+        if emp.profile_url:
+            by_url[emp.profile_url] = db_emp
+
     if created_employees:
+        await db.flush()
+        for db_emp in created_employees:
+            log_change(db, page_id, "employee", db_emp.id, "created")
+    if created_employees or updated:
         await db.commit()
     return created_employees
 
 async def get_posts_by_page(db: AsyncSession, page_id: int, limit: int = 15, offset: int = 0):
-    result = await db.execute(select(Post).filter(Post.page_id == page_id).limit(limit).offset(offset).order_by(Post.created_at.desc()))
+    from sqlalchemy import func
+    # Newest first by publish date; posts without one fall back to when they were stored
+    result = await db.execute(
+        select(Post).filter(Post.page_id == page_id)
+        .order_by(func.coalesce(Post.posted_at_timestamp, Post.created_at).desc(), Post.id.desc())
+        .limit(limit).offset(offset)
+    )
     return result.scalars().all()
 
 
-async def get_all_pages(db: AsyncSession, skip: int = 0, limit: int = 10):
+async def get_all_pages(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    fields: Optional[set] = None,
+    include: Optional[set] = None
+):
     """Get all pages with pagination."""
     result = await db.execute(
         select(CompanyPage)
-        .options(selectinload(CompanyPage.posts), selectinload(CompanyPage.employees))
+        .options(*page_load_options(fields, include))
         .offset(skip)
         .limit(limit)
         .order_by(CompanyPage.created_at.desc())
@@ -95,13 +246,12 @@ async def search_pages(
     min_followers: int = None,
     max_followers: int = None,
     skip: int = 0,
-    limit: int = 10
+    limit: int = 10,
+    fields: Optional[set] = None,
+    include: Optional[set] = None
 ):
     """Search pages with filters."""
-    query = select(CompanyPage).options(
-        selectinload(CompanyPage.posts), 
-        selectinload(CompanyPage.employees)
-    )
+    query = select(CompanyPage).options(*page_load_options(fields, include))
     
     if name:
         query = query.filter(CompanyPage.name.ilike(f"%{name}%"))
@@ -143,15 +293,52 @@ async def count_search_results(
 
 from app.models.models import Comment as CommentModel
 
-async def create_comments(db: AsyncSession, post_id: int, comments: list):
-    """Create comments for a post."""
-    created = []
-    for comment in comments:
-        db_comment = CommentModel(post_id=post_id, **comment)
-        db.add(db_comment)
-        created.append(db_comment)
-    if created:
+async def create_comments(db: AsyncSession, post_id: int, comments: list) -> int:
+    """Create comments for a post, skipping URNs already stored. Returns the number inserted."""
+    return await bulk_create_comments(db, {post_id: comments})
+
+
+async def bulk_create_comments(db: AsyncSession, comments_by_post: dict) -> int:
+    """
+    Insert comments for many posts with one existence check and one executemany
+    INSERT. Comments are deduplicated by URN, within the batch and against the table.
+    """
+    rows = []
+    urns = set()
+    for post_id, comments in comments_by_post.items():
+        for comment in comments:
+            urn = comment.get("urn")
+            if urn:
+                if urn in urns:
+                    continue
+                urns.add(urn)
+            rows.append({
+                "post_id": post_id,
+                "urn": urn,
+                "author_name": comment.get("author_name"),
+                "content": comment["content"],
+            })
+    if urns:
+        existing = set((await db.execute(select(CommentModel.urn).where(CommentModel.urn.in_(urns)))).scalars())
+        rows = [row for row in rows if row["urn"] not in existing]
+    if not rows:
+        return 0
+    try:
+        await db.execute(insert(CommentModel), rows)
         await db.commit()
+        return len(rows)
+    except IntegrityError:
+        # A concurrent ingestion stored some of these URNs after the check; insert the rest one by one
+        await db.rollback()
+    created = 0
+    for row in rows:
+        try:
+            async with db.begin_nested():
+                await db.execute(insert(CommentModel), [row])
+            created += 1
+        except IntegrityError:
+            pass
+    await db.commit()
     return created
 
 
@@ -185,3 +372,117 @@ async def count_posts_by_page(db: AsyncSession, page_id: int):
         select(func.count(Post.id)).filter(Post.page_id == page_id)
     )
     return result.scalar()
+
+
+async def count_employees_by_page(db: AsyncSession, page_id: int):
+    """Count employees for a page."""
+    from sqlalchemy import func
+    result = await db.execute(
+        select(func.count(Employee.id)).filter(Employee.page_id == page_id)
+    )
+    return result.scalar()
+
+
+async def get_employee_crawl(db: AsyncSession, page_id: int):
+    result = await db.execute(select(EmployeeCrawl).filter(EmployeeCrawl.page_id == page_id))
+    return result.scalars().first()
+
+
+async def save_employee_crawl(db: AsyncSession, page_id: int, position: int, exhausted: bool = False):
+    """Record where the page's People directory crawl stopped."""
+    from sqlalchemy.exc import IntegrityError
+    for attempt in range(2):
+        crawl = await get_employee_crawl(db, page_id)
+        if crawl is None:
+            crawl = EmployeeCrawl(page_id=page_id)
+            db.add(crawl)
+        crawl.position, crawl.exhausted = position, exhausted
+        try:
+            await db.commit()
+            return crawl
+        except IntegrityError:
+            # A concurrent crawl of the same page saved first; overwrite its position
+            await db.rollback()
+            if attempt:
+                raise
+
+
+async def get_scrape_failure(db: AsyncSession, linkedin_id: str):
+    result = await db.execute(select(ScrapeFailure).filter(ScrapeFailure.linkedin_id == linkedin_id))
+    return result.scalars().first()
+
+
+async def upsert_scrape_failure(db: AsyncSession, linkedin_id: str, values: dict):
+    """Insert or update the negative cache entry for a company id."""
+    from sqlalchemy.exc import IntegrityError
+    for attempt in range(2):
+        entry = await get_scrape_failure(db, linkedin_id)
+        if entry is None:
+            entry = ScrapeFailure(linkedin_id=linkedin_id)
+            db.add(entry)
+        for key, value in values.items():
+            setattr(entry, key, value)
+        try:
+            await db.commit()
+            return entry
+        except IntegrityError:
+            # Another worker recorded the same id first; update its row instead
+            await db.rollback()
+            if attempt:
+                raise
+
+
+async def delete_scrape_failure(db: AsyncSession, linkedin_id: str):
+    from sqlalchemy import delete
+    result = await db.execute(delete(ScrapeFailure).where(ScrapeFailure.linkedin_id == linkedin_id))
+    if result.rowcount:
+        await db.commit()
+
+
+def diff_fields(stored, data: dict, fields) -> dict:
+    """{field: (old, new)} for the `fields` of `data` that differ from `stored` (a row mapping or dict)."""
+    return {f: (stored[f], data[f]) for f in fields if f in data and stored[f] != data[f]}
+
+
+def log_change(db: AsyncSession, page_id: int, entity: str, entity_id: int, change: str, fields: dict = None):
+    """Append a change log entry to the current transaction."""
+    import json
+    from fastapi.encoders import jsonable_encoder
+    db.add(ChangeLog(
+        page_id=page_id, entity=entity, entity_id=entity_id, change=change, changed_at=datetime.now(),
+        fields=json.dumps(jsonable_encoder({f: list(values) for f, values in fields.items()})) if fields else None,
+    ))
+
+
+def _apply_changes(db: AsyncSession, row, data: dict, fields, entity: str) -> bool:
+    # Set only the columns that changed on a loaded row and log them
+    changed = diff_fields({f: getattr(row, f) for f in fields}, data, fields)
+    if not changed:
+        return False
+    for field, (_, new) in changed.items():
+        setattr(row, field, new)
+    log_change(db, row.page_id, entity, row.id, "updated", changed)
+    return True
+
+
+async def get_changes(db: AsyncSession, since: int = 0, limit: int = 100, linkedin_id: Optional[str] = None):
+    """
+    Change log entries after the `since` cursor, oldest first, as (ChangeLog, linkedin_id) rows.
+
+    Ids are assigned when an entry is inserted but become visible when its transaction
+    commits, so a lower id can appear after a higher one was already served. Entries
+    younger than CHANGES_FEED_SETTLE seconds are held back until every transaction that
+    could still commit a lower id has done so.
+    """
+    from datetime import timedelta
+    from app.core.config import settings
+    settled = datetime.now() - timedelta(seconds=settings.CHANGES_FEED_SETTLE)
+    query = (
+        select(ChangeLog, CompanyPage.linkedin_id)
+        .join(CompanyPage, ChangeLog.page_id == CompanyPage.id)
+        .where(ChangeLog.id > since, ChangeLog.changed_at <= settled)
+    )
+    if linkedin_id is not None:
+        query = query.where(CompanyPage.linkedin_id == linkedin_id)
+    result = await db.execute(query.order_by(ChangeLog.id).limit(limit))
+    return result.all()
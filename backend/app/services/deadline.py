@@ -0,0 +1,97 @@
+"""
+Request-scoped deadlines.
+
+An endpoint opens a budget (`with budget(seconds)`) and everything it awaits, in
+the same task, sees the same absolute deadline through a context variable: the
+scraper caps navigation timeouts and settle waits with `cap()` / `timeout_ms()`
+and skips stages once `expired()`, queues for slots and sessions go through
+`wait()`, and DB calls go through `bounded()`. Tasks
+inherit the caller's context, so background work calls `clear()` first.
+"""
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from app.core.config import settings
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+@contextmanager
+def budget(seconds: Optional[float]):
+    """
+    Run the block under a deadline `seconds` from now, or the enclosing one if that is sooner.
+    None leaves the deadline as it is; 0 means it has already run out.
+    """
+    if seconds is None:
+        yield
+        return
+    expires = time.monotonic() + seconds
+    outer = _deadline.get()
+    token = _deadline.set(expires if outer is None else min(expires, outer))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def clear():
+    """Detach the current task from any deadline it inherited."""
+    _deadline.set(None)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left, or None without a deadline."""
+    expires = _deadline.get()
+    return None if expires is None else max(0.0, expires - time.monotonic())
+
+
+def expired() -> bool:
+    return remaining() == 0.0
+
+
+def enough_for(seconds: float) -> bool:
+    """Whether at least `seconds` are left (always true without a deadline)."""
+    left = remaining()
+    return left is None or left >= seconds
+
+
+def cap(seconds: float) -> float:
+    """`seconds`, shortened to the time left."""
+    left = remaining()
+    return seconds if left is None else min(seconds, left)
+
+
+def timeout_ms(ms: int) -> int:
+    """A Playwright timeout (ms) shortened to the time left; at least 1, since 0 means no timeout."""
+    return max(1, int(cap(ms / 1000) * 1000))
+
+
+async def wait(awaitable, what: str):
+    """Await a wait (for a slot, a session, a browser start) for no longer than the time left."""
+    left = remaining()
+    if left is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, left)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded(f"Request deadline exceeded waiting for {what}")
+
+
+async def bounded(awaitable):
+    """
+    Await a DB call within the deadline. It always gets at least DEADLINE_DB_GRACE
+    seconds, so data already collected can still be stored and returned.
+    """
+    left = remaining()
+    if left is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, max(left, settings.DEADLINE_DB_GRACE))
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded("Request deadline exceeded during a database call")
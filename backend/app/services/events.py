@@ -0,0 +1,52 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from fastapi.encoders import jsonable_encoder
+
+logger = logging.getLogger(__name__)
+
+
+class EventBus:
+    """
+    Minimal in-process async pub/sub keyed by topic (a LinkedIn page id).
+
+    Publishing never blocks: each subscriber gets a bounded queue and events are
+    dropped for subscribers that fall too far behind.
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+
+    def subscribe(self, topic: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._subscribers[topic].add(queue)
+        return queue
+
+    def unsubscribe(self, topic: str, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(topic)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[topic]
+
+    def has_subscribers(self, topic: str) -> bool:
+        return bool(self._subscribers.get(topic))
+
+    def publish(self, topic: str, event: str, data=None):
+        for queue in list(self._subscribers.get(topic, ())):
+            try:
+                queue.put_nowait((event, data))
+            except asyncio.QueueFull:
+                logger.warning(f"Dropping '{event}' event for slow subscriber on {topic}")
+
+
+def format_sse(event: str, data=None) -> str:
+    """Encode one server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+# Scrape progress for each page: about, posts, employees, persisted, error
+scrape_events = EventBus()
@@ -0,0 +1,260 @@
+"""
+Capture and parse the JSON the LinkedIn web app fetches from its own API (`/voyager/api/`).
+
+Responses are "normalized" JSON: entities in `data` / `included`, each tagged with a
+`$type`, referencing one another by URN (keys prefixed with `*`). The parsers below
+are tolerant of both the legacy and the `dash` entity shapes and return the same
+dicts as the DOM extraction in scraper.py, or nothing when the payloads don't
+contain what they need, in which case the scraper falls back to the DOM.
+"""
+import asyncio
+import logging
+import re
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+API_PATH = "/voyager/api/"
+_ACTIVITY_URN_RE = re.compile(r"urn:li:activity:(\d+)")
+
+
+class ResponseCapture:
+    """Collects the JSON bodies of API responses a Playwright page receives."""
+
+    def __init__(self, page, url_filter: str = API_PATH):
+        self.url_filter = url_filter
+        self.payloads = []
+        self._arrived = asyncio.Event()
+        self._pending = set()
+        page.on("response", self._on_response)
+
+    def _on_response(self, response):
+        if self.url_filter not in response.url:
+            return
+        task = asyncio.ensure_future(self._read(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _read(self, response):
+        try:
+            if "json" not in (response.headers.get("content-type") or ""):
+                return
+            self.payloads.append(await response.json())
+            self._arrived.set()
+        except Exception as e:
+            # Body unavailable (redirect, page closed) or not JSON after all
+            logger.debug(f"Could not read API response {response.url}: {e}")
+
+    async def wait_for(self, parse, timeout: float):
+        """
+        Return `parse(payloads)` as soon as it is truthy, re-parsing as responses
+        arrive; after `timeout` seconds return whatever it yields then (maybe empty).
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            result = parse(self.payloads) if self.payloads else None
+            remaining = deadline - loop.time()
+            if result or remaining <= 0:
+                return result
+            self._arrived.clear()
+            try:
+                await asyncio.wait_for(self._arrived.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    def cancel(self):
+        for task in list(self._pending):
+            task.cancel()
+
+
+def iter_entities(payloads: list):
+    """Every dict carrying a `$type` in the payloads, in document order."""
+    stack = list(reversed(payloads))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if "$type" in node:
+                yield node
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+def _index(entities: list) -> dict:
+    return {e["entityUrn"]: e for e in entities if isinstance(e.get("entityUrn"), str)}
+
+
+def _field(entity: dict, name: str, index: dict):
+    """`entity[name]`, following a `*name` URN reference (or list of them) if needed."""
+    if name in entity:
+        return entity[name]
+    ref = entity.get(f"*{name}")
+    if isinstance(ref, list):
+        return [index[r] for r in ref if r in index]
+    return index.get(ref) if isinstance(ref, str) else None
+
+
+def _text(value) -> str:
+    """Plain text of a TextViewModel-like value ({"text": ...}, possibly nested)."""
+    while isinstance(value, dict):
+        value = value.get("text")
+    return value.strip() if isinstance(value, str) else ""
+
+
+def _image_url(node) -> str:
+    """Largest artifact URL of the first VectorImage found under `node`."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            if "rootUrl" in current and current.get("artifacts"):
+                artifact = max(current["artifacts"], key=lambda a: a.get("width") or 0)
+                return current["rootUrl"] + (artifact.get("fileIdentifyingUrlPathSegment") or "")
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+    return ""
+
+
+def activity_timestamp(urn: str):
+    """Publish time encoded in an activity id (its high bits are epoch milliseconds)."""
+    match = _ACTIVITY_URN_RE.search(urn or "")
+    if not match:
+        return None
+    return datetime.fromtimestamp((int(match.group(1)) >> 22) / 1000)
+
+
+def _is_company(entity: dict, page_id: str) -> bool:
+    """Whether a Company entity is `page_id`, by vanity name or, for numeric ids, by URN."""
+    page_id = page_id.lower()
+    return (
+        (entity.get("universalName") or "").lower() == page_id
+        or (entity.get("entityUrn") or "").lower().endswith(f":{page_id}")
+    )
+
+
+def parse_company(payloads: list, page_id: str):
+    """
+    Company details dict for `page_id`, or None if no matching Company entity was captured.
+    Payloads also carry other companies (similar pages, affiliates), which are never used.
+    """
+    entities = list(iter_entities(payloads))
+    index = _index(entities)
+    company = next((
+        e for e in entities
+        if e["$type"].endswith(".Company") and e.get("name") and _is_company(e, page_id)
+    ), None)
+    if company is None:
+        return None
+
+    industry = ""
+    industries = _field(company, "companyIndustries", index) or _field(company, "industry", index) or []
+    for item in industries if isinstance(industries, list) else [industries]:
+        if isinstance(item, dict):
+            industry = item.get("localizedName") or item.get("name") or ""
+        elif isinstance(item, str) and not item.startswith("urn:"):
+            industry = item
+        if industry:
+            break
+
+    following = _field(company, "followingInfo", index) or _field(company, "followingState", index) or {}
+    follower_count = following.get("followerCount") or company.get("followerCount") or 0
+    head_count = company.get("employeeCount") or company.get("staffCount") or 0
+    if not head_count:
+        head_count = (company.get("employeeCountRange") or {}).get("start") or 0
+    founded = (company.get("foundedOn") or {}).get("year")
+
+    return {
+        "name": company["name"].strip(),
+        "description": (company.get("description") or "").strip(),
+        "website": company.get("websiteUrl") or "",
+        "industry": industry or None,
+        "follower_count": int(follower_count),
+        "head_count": int(head_count),
+        "founded": str(founded) if founded else "",
+        "profile_image_url": _image_url(company.get("logoResolutionResult") or company.get("logo")),
+    }
+
+
+def parse_posts(payloads: list) -> list:
+    """
+    Feed updates as crawler items: {urn, text, likes, comments, posted_at, pinned},
+    in feed order, one per activity URN.
+    """
+    entities = list(iter_entities(payloads))
+    counts = {}
+    for e in entities:
+        if e["$type"].endswith("SocialActivityCounts"):
+            match = _ACTIVITY_URN_RE.search(e.get("urn") or e.get("entityUrn") or "")
+            if match:
+                counts[match.group(0)] = e
+
+    items = []
+    seen = set()
+    for e in entities:
+        if "feed" not in e["$type"] or not e["$type"].endswith(("Update", "UpdateV2")):
+            continue
+        metadata = e.get("updateMetadata") or e.get("metadata") or {}
+        match = _ACTIVITY_URN_RE.search(metadata.get("urn") or e.get("entityUrn") or e.get("urn") or "")
+        if not match or match.group(0) in seen:
+            continue
+        urn = match.group(0)
+        seen.add(urn)
+        social = counts.get(urn, {})
+        items.append({
+            "urn": urn,
+            "text": _text(e.get("commentary")),
+            "likes": str(social.get("numLikes") or 0),
+            "comments": str(social.get("numComments") or 0),
+            "posted_at": activity_timestamp(urn),
+            "pinned": "pinned" in _text(e.get("header")).lower(),
+        })
+    return items
+
+
+def parse_people(payloads: list) -> list:
+    """People listed on a company's People tab as employee dicts, deduplicated by profile."""
+    people = []
+    seen = set()
+    for e in iter_entities(payloads):
+        if e["$type"].endswith("EntityResultViewModel"):
+            person = {
+                "name": _text(e.get("title")),
+                "role": _text(e.get("primarySubtitle")),
+                "location": _text(e.get("secondarySubtitle")),
+                "profile_url": (e.get("navigationUrl") or "").split("?")[0],
+            }
+        elif e["$type"].endswith(".Profile") and e.get("firstName"):
+            public_id = e.get("publicIdentifier")
+            person = {
+                "name": f"{e['firstName']} {e.get('lastName') or ''}".strip(),
+                "role": (e.get("headline") or "").strip(),
+                "location": "",
+                "profile_url": f"https://www.linkedin.com/in/{public_id}/" if public_id else "",
+            }
+        else:
+            continue
+        key = person["profile_url"] or person["name"]
+        if not person["name"] or key in seen:
+            continue
+        seen.add(key)
+        people.append(person)
+    return people
+
+
+def parse_comments(payloads: list) -> list:
+    """Comments on a post as {urn, author, text}, one per comment URN."""
+    comments = []
+    seen = set()
+    for e in iter_entities(payloads):
+        if not e["$type"].endswith(".Comment"):
+            continue
+        urn = e.get("urn") or e.get("entityUrn")
+        text = _text(e.get("commentary") or e.get("commentV2") or e.get("comment"))
+        if not urn or not text or urn in seen:
+            continue
+        seen.add(urn)
+        commenter = e.get("commenter") or {}
+        comments.append({"urn": urn, "author": _text(commenter.get("title")) or _text(commenter.get("name")), "text": text})
+    return comments
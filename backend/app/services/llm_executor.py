@@ -0,0 +1,159 @@
+import asyncio
+import functools
+import logging
+import math
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from app.core.config import settings
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LLMOverloaded(Exception):
+    """The LLM backend can't take this call now; clients should retry after `retry_after` seconds."""
+
+    status_code = 503
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMRateLimited(LLMOverloaded):
+    """The provider kept rate-limiting us after all retries."""
+
+    status_code = 429
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    name = type(error).__name__
+    text = str(error).lower()
+    return (
+        name in ("ResourceExhausted", "TooManyRequests")
+        or "429" in text
+        or "rate limit" in text
+        or "quota" in text
+    )
+
+
+class LLMExecutor:
+    """
+    Runs blocking LLM SDK calls on a dedicated thread pool with a concurrency cap.
+
+    Callers beyond the cap wait in a bounded queue for at most `queue_timeout` seconds;
+    when the queue is full they are rejected immediately with LLMOverloaded.
+    Rate-limit errors from the provider are retried with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        max_queue: int = 32,
+        queue_timeout: float = 10,
+        max_retries: int = 2,
+        retry_backoff: float = 1.0
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Metrics
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.queue_timeouts = 0
+        self.retries = 0
+        self.wait_count = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def check_capacity(self):
+        """Reject up front when the wait queue is already full."""
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            metrics.llm_errors.inc(kind="rejected")
+            raise LLMOverloaded("LLM queue is full", retry_after=math.ceil(self.queue_timeout))
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the `max_concurrency` LLM slots for the duration of the block."""
+        self.check_capacity()
+        self.waiting += 1
+        started = time.monotonic()
+        outcome = "timeout"
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+            outcome = "acquired"
+        except asyncio.TimeoutError:
+            self.queue_timeouts += 1
+            metrics.llm_errors.inc(kind="queue_timeout")
+            raise LLMOverloaded("Timed out waiting for an LLM slot", retry_after=math.ceil(self.queue_timeout))
+        finally:
+            self.waiting -= 1
+            waited = time.monotonic() - started
+            metrics.llm_slot_wait.observe(waited, outcome=outcome)
+            self.wait_count += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._semaphore.release()
+
+    async def run(self, fn, *args, **kwargs):
+        """Call a blocking function in a slot, retrying provider rate limits."""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        async with self.slot():
+            for attempt in range(self.max_retries + 1):
+                started = time.perf_counter()
+                try:
+                    result = await loop.run_in_executor(self.executor, call)
+                    metrics.llm_call_duration.observe(time.perf_counter() - started, mode="unary", outcome="ok")
+                    return result
+                except Exception as e:
+                    outcome = "rate_limited" if is_rate_limit_error(e) else "error"
+                    metrics.llm_call_duration.observe(time.perf_counter() - started, mode="unary", outcome=outcome)
+                    metrics.llm_errors.inc(kind=outcome)
+                    if outcome == "error":
+                        raise
+                    delay = self.retry_backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+                    if attempt == self.max_retries:
+                        raise LLMRateLimited(f"LLM provider rate limit: {e}", retry_after=math.ceil(delay)) from e
+                    self.retries += 1
+                    logger.warning(f"LLM rate limited, retrying in {delay:.1f}s (attempt {attempt + 1})")
+                    await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "queue_timeouts": self.queue_timeouts,
+            "retries": self.retries,
+            "wait_seconds_avg": round(self.wait_seconds_total / self.wait_count, 4) if self.wait_count else 0.0,
+            "wait_seconds_max": round(self.wait_seconds_max, 4),
+        }
+
+
+llm_executor = LLMExecutor(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    max_queue=settings.LLM_MAX_QUEUE,
+    queue_timeout=settings.LLM_QUEUE_TIMEOUT,
+    max_retries=settings.LLM_MAX_RETRIES,
+    retry_backoff=settings.LLM_RETRY_BACKOFF
+)
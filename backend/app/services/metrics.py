@@ -0,0 +1,193 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+Counters and histograms are plain dicts keyed by label values. Updates are a dict
+lookup and an integer add, and they happen on the event loop thread, so no locks
+are needed. Values owned by other components (pool usage, open tabs, cache stats)
+are read through callbacks only when /metrics is scraped.
+"""
+from bisect import bisect_left
+
+# Prometheus client defaults, for sub-second request latencies
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Browser navigations and LLM calls take seconds to minutes
+SLOW_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32, 64, 128)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            samples = metric.samples()
+            if not samples:
+                continue
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), registry: Registry = registry):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        if registry is not None:
+            registry.register(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels[n] for n in self.labelnames)
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> list:
+        return [(self.name, _format_labels(self.labelnames, k), v) for k, v in list(self._values.items())]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(name, documentation, labelnames, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [per-bucket counts (+Inf last), sum, count]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def samples(self) -> list:
+        samples = []
+        for key, (counts, total, count) in list(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(float(bound))}"'
+                samples.append((f"{self.name}_bucket", _format_labels(self.labelnames, key, le), cumulative))
+            samples.append((f"{self.name}_sum", _format_labels(self.labelnames, key), total))
+            samples.append((f"{self.name}_count", _format_labels(self.labelnames, key), count))
+        return samples
+
+
+class CallbackMetric(_Metric):
+    """
+    Metric whose values are read from `collect` at render time.
+    `collect` returns {label values tuple: value}, or a single number when there are no labels.
+    """
+
+    def __init__(self, name: str, documentation: str, collect, labelnames: tuple = (), type: str = "gauge", **kwargs):
+        super().__init__(name, documentation, labelnames, **kwargs)
+        self.type = type
+        self.collect = collect
+
+    def samples(self) -> list:
+        try:
+            values = self.collect()
+        except Exception:
+            return []
+        if values is None:
+            return []
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [(self.name, _format_labels(self.labelnames, k), v) for k, v in values.items() if v is not None]
+
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route", "status")
+)
+scrape_stage_duration = Histogram(
+    "scrape_stage_duration_seconds", "Scraper stage duration by page type, stage and outcome",
+    ("page_type", "stage", "outcome"), buckets=SLOW_BUCKETS
+)
+scrape_pages = Counter(
+    "scrape_pages_total", "Cold page scrapes by outcome", ("outcome",)
+)
+llm_call_duration = Histogram(
+    "llm_call_duration_seconds", "Gemini call latency by mode and outcome",
+    ("mode", "outcome"), buckets=SLOW_BUCKETS
+)
+llm_slot_wait = Histogram(
+    "llm_slot_wait_seconds", "Time Gemini calls waited for an executor slot, by outcome (acquired, timeout)",
+    ("outcome",)
+)
+llm_errors = Counter(
+    "llm_errors_total", "Gemini calls that failed or were turned away, by kind", ("kind",)
+)
+
+
+def observe_scrape_stage(page_type: str, stage: str, seconds: float, outcome: str):
+    """Stage observer for LinkedInScraper.stage_observers."""
+    scrape_stage_duration.observe(seconds, page_type=page_type, stage=stage, outcome=outcome)
+
+
+def render() -> str:
+    return registry.render()
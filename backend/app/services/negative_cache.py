@@ -0,0 +1,68 @@
+"""
+Negative cache for company ids that couldn't be scraped.
+
+Entries live in the scrape_failures table, so they survive restarts and are shared
+by every worker. A not-found id is skipped for NEGATIVE_CACHE_NOT_FOUND_TTL seconds,
+a failed scrape for NEGATIVE_CACHE_FAILED_TTL; each further failure doubles the
+window, up to NEGATIVE_CACHE_MAX_TTL. A failure more than NEGATIVE_CACHE_MAX_TTL
+after the previous one starts counting again from one.
+"""
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.services import crud, metrics
+
+logger = logging.getLogger(__name__)
+
+negative_cache_hits = metrics.Counter(
+    "negative_cache_hits_total", "Page lookups answered from the negative cache, by reason", ("reason",)
+)
+
+
+def _local(value: datetime) -> datetime:
+    # SQLite returns naive local datetimes, PostgreSQL aware ones
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+
+def retry_window(reason: str, failure_count: int) -> timedelta:
+    base = settings.NEGATIVE_CACHE_NOT_FOUND_TTL if reason == "not_found" else settings.NEGATIVE_CACHE_FAILED_TTL
+    return timedelta(seconds=min(base * 2 ** (failure_count - 1), settings.NEGATIVE_CACHE_MAX_TTL))
+
+
+def retry_after(entry) -> int:
+    """Seconds until the entry's id may be scraped again."""
+    return max(1, int((_local(entry.retry_at) - datetime.now()).total_seconds()) + 1)
+
+
+async def lookup(db: AsyncSession, page_id: str):
+    """The id's negative cache entry if it is still inside its retry window, else None."""
+    entry = await crud.get_scrape_failure(db, page_id)
+    if entry is None or _local(entry.retry_at) <= datetime.now():
+        return None
+    negative_cache_hits.inc(reason=entry.reason)
+    return entry
+
+
+async def record(db: AsyncSession, page_id: str, reason: str, error: str = None):
+    """Record a not_found or failed scrape and extend the id's retry window."""
+    now = datetime.now()
+    entry = await crud.get_scrape_failure(db, page_id)
+    if entry is None or now - _local(entry.last_failed_at) > timedelta(seconds=settings.NEGATIVE_CACHE_MAX_TTL):
+        count, first_failed_at = 1, now
+    else:
+        count, first_failed_at = entry.failure_count + 1, entry.first_failed_at
+    window = retry_window(reason, count)
+    logger.info(f"Negative-caching {page_id} ({reason}, failure {count}) for {window}")
+    return await crud.upsert_scrape_failure(db, page_id, {
+        "reason": reason,
+        "failure_count": count,
+        "last_error": error,
+        "first_failed_at": first_failed_at,
+        "last_failed_at": now,
+        "retry_at": now + window,
+    })
+
+
+async def clear(db: AsyncSession, page_id: str):
+    await crud.delete_scrape_failure(db, page_id)
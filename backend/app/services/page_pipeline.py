@@ -0,0 +1,174 @@
+import logging
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.schemas import schemas
+from app.services import crud, briefs, comments, deadline, metrics, negative_cache
+from app.services.circuit_breaker import ScraperUnavailable
+from app.services.events import scrape_events
+from app.services.ai_analyst import response_cache
+from app.services.context_builder import context_cache
+
+logger = logging.getLogger(__name__)
+
+
+async def scrape_and_store_page(db: AsyncSession, scraper, page_id: str):
+    """
+    Scrape a page that is not in the database yet and persist it with its posts and employees.
+
+    The scraper publishes 'about', 'posts' and 'employees' events as each stage finishes;
+    this adds 'persisted' once everything is committed, or 'error' on failure.
+    Returns the new CompanyPage row, or None if LinkedIn reports that the company doesn't exist.
+    Raises ScraperUnavailable while LinkedIn is blocking the scraper, and DeadlineExceeded
+    if the request deadline runs out before the page itself is stored. Once it is, stages
+    the deadline cuts short only leave the returned row marked `partial`.
+    Not-found ids and failed scrapes (short retry window) are recorded in the negative
+    cache; callers check it first. Unavailability is transient and never cached.
+    """
+    try:
+        scraped_data = await scraper.scrape_page_details(page_id)
+        if not scraped_data:
+            metrics.scrape_pages.inc(outcome="not_found")
+            await negative_cache.record(db, page_id, "not_found")
+            scrape_events.publish(page_id, "error", {"status": 404, "detail": "Page not found or could not be scraped"})
+            return None
+
+        # Create page with duplicate key handling
+        page_create = schemas.PageCreate(**scraped_data)
+        try:
+            new_page = await deadline.bounded(crud.create_page(db, page_create))
+        except Exception as db_error:
+            # Handle duplicate key error - page was inserted by another request
+            if "already exists" in str(db_error) or "duplicate key" in str(db_error).lower():
+                await db.rollback()
+                existing_page = await crud.get_page_by_linkedin_id(db, page_id, fields=set(), include=set())
+                if existing_page:
+                    metrics.scrape_pages.inc(outcome="duplicate")
+                    await _publish_persisted(db, page_id)
+                    return existing_page
+            raise
+
+        # Trigger scraping for posts and employees
+        _, new_page.partial = await scrape_page_relations(db, scraper, page_id, new_page.id)
+
+        metrics.scrape_pages.inc(outcome="partial" if new_page.partial else "success")
+        await negative_cache.clear(db, page_id)
+        on_page_data_changed(page_id)
+        await _publish_persisted(db, page_id)
+        return new_page
+
+    except ScraperUnavailable as e:
+        metrics.scrape_pages.inc(outcome="unavailable")
+        scrape_events.publish(page_id, "error", {"status": 503, "detail": str(e), "retry_after": e.retry_after})
+        raise
+    except deadline.DeadlineExceeded as e:
+        metrics.scrape_pages.inc(outcome="deadline")
+        scrape_events.publish(page_id, "error", {"status": 504, "detail": str(e)})
+        raise
+    except Exception as e:
+        metrics.scrape_pages.inc(outcome="error")
+        logger.error(f"Scrape pipeline failed for {page_id}: {e}")
+        scrape_events.publish(page_id, "error", {"status": 500, "detail": str(e)})
+        try:
+            await db.rollback()
+            await negative_cache.record(db, page_id, "failed", error=str(e))
+        except Exception as cache_error:
+            logger.warning(f"Could not negative-cache {page_id}: {cache_error}")
+        raise
+
+
+async def refresh_page_details(db: AsyncSession, scraper, page_id: str, db_page_id: int):
+    """
+    Re-scrape a stored page's About data and write only what changed (see
+    crud.update_page_details). Returns the changed columns as {column: (old, new)},
+    or None when the page could not be scraped.
+    """
+    scraped_data = await scraper.scrape_page_details(page_id)
+    if not scraped_data:
+        return None
+    page_data = schemas.PageCreate(**scraped_data).model_dump()
+    changed = await deadline.bounded(crud.update_page_details(db, db_page_id, page_data))
+    if changed:
+        on_page_data_changed(page_id)
+    return changed
+
+
+async def crawl_new_posts(db: AsyncSession, scraper, page_id: str, db_page_id: int) -> list:
+    """
+    Incrementally crawl a page's feed: the scraper stops at the newest post already
+    stored, so only the delta is scraped and inserted. Comments on the new posts are
+    then fetched in the background. Returns the new Post rows.
+    """
+    known_post_urls = await deadline.bounded(crud.get_recent_post_urls(db, db_page_id))
+    scraped_posts = await scraper.scrape_posts(page_id, known_post_urls=known_post_urls)
+    if not scraped_posts:
+        return []
+    created = await deadline.bounded(crud.create_posts(db, db_page_id, [schemas.PostCreate(**p) for p in scraped_posts]))
+    comments.schedule_comment_ingestion(scraper, page_id, created)
+    return created
+
+
+async def crawl_employees(db: AsyncSession, scraper, page_id: str, db_page_id: int) -> int:
+    """
+    Continue the page's People directory crawl from where the last run stopped,
+    storing each batch and the crawl position as the scraper finds them. Once a run
+    reaches the end of the directory, the next one starts over from the top to pick
+    up new people. Returns the number of new Employee rows.
+    """
+    crawl = await deadline.bounded(crud.get_employee_crawl(db, db_page_id))
+    start = 0 if crawl is None or crawl.exhausted else crawl.position
+    created = 0
+
+    async def store(employees, position, exhausted):
+        nonlocal created
+        if employees:
+            rows = await deadline.bounded(crud.create_employees(db, db_page_id, [schemas.EmployeeCreate(**e) for e in employees]))
+            created += len(rows)
+        await deadline.bounded(crud.save_employee_crawl(db, db_page_id, position, exhausted))
+
+    await scraper.scrape_employees(page_id, start=start, on_batch=store)
+    return created
+
+
+async def scrape_page_relations(
+    db: AsyncSession, scraper, page_id: str, db_page_id: int, posts: bool = True, employees: bool = True
+) -> tuple:
+    """
+    Crawl a stored page's posts and/or employees within the request deadline.
+
+    A stage is skipped when less than DEADLINE_MIN_STAGE seconds are left, and ends
+    early when the scraper becomes unavailable. Returns (changed, partial): whether
+    anything new was stored, and whether a stage was skipped or cut short.
+    """
+    changed = partial = False
+    for wanted, crawl in ((posts, crawl_new_posts), (employees, crawl_employees)):
+        if not wanted:
+            continue
+        if not deadline.enough_for(settings.DEADLINE_MIN_STAGE):
+            partial = True
+            continue
+        try:
+            changed = bool(await crawl(db, scraper, page_id, db_page_id)) or changed
+        except ScraperUnavailable as e:
+            logger.info(f"Relations of {page_id} left partial: {e}")
+            partial = True
+            continue
+        partial = partial or deadline.expired()
+    return changed, partial
+
+
+def on_page_data_changed(page_id: str):
+    """
+    Refresh derived data after a page's scraped data changed: drop the cached chat
+    context and analyst answers, and regenerate its AI brief in the background.
+    """
+    context_cache.invalidate(page_id)
+    response_cache.invalidate(page_id)
+    briefs.schedule_brief_refresh(page_id)
+
+
+async def _publish_persisted(db: AsyncSession, page_id: str):
+    # Only hydrate the full page when someone is listening for it
+    if not scrape_events.has_subscribers(page_id):
+        return
+    page = await crud.get_page_by_linkedin_id(db, page_id)
+    scrape_events.publish(page_id, "persisted", schemas.PageDetail.model_validate(page))
@@ -0,0 +1,188 @@
+"""
+On-demand sampling profiler and event-loop lag monitor.
+
+The profiler samples every thread's stack from a background thread and aggregates
+them in the folded format used by flamegraph.pl, speedscope and most flamegraph
+tools (`thread;outer;...;inner <count>`). Each thread name is the root frame, so
+event-loop work, aiosqlite/asyncpg threads and the LLM executor show up separately.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from pathlib import Path
+from app.core.config import settings
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+_PROFILE_ID_RE = re.compile(r"^[0-9A-Za-z_-]+$")
+
+loop_lag = metrics.Histogram(
+    "event_loop_lag_seconds", "Delay between when the lag probe was due and when it ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+loop_blocked = metrics.Counter(
+    "event_loop_blocked_total", "Times the event loop was blocked longer than LOOP_LAG_THRESHOLD"
+)
+
+
+_PROJECT_ROOT = str(Path(__file__).resolve().parents[2]) + os.sep
+_SITE_PACKAGES = "site-packages" + os.sep
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(_PROJECT_ROOT):
+        filename = filename[len(_PROJECT_ROOT):]
+    elif _SITE_PACKAGES in filename:
+        filename = filename.split(_SITE_PACKAGES, 1)[1]
+    else:
+        filename = os.path.basename(filename)
+    # ';' separates frames in the folded format
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class SamplingProfiler:
+    """Samples all thread stacks every `interval` seconds until stopped."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.is_set():
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                self.samples[";".join(reversed(stack))] += 1
+            self.sample_count += 1
+            self._stop.wait(self.interval)
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+def save_profile(profile_id: str, folded: str, meta: dict, directory: str = None) -> Path:
+    """Write `<id>.folded` and its `<id>.json` tags (route, timing, sample count)."""
+    directory = Path(directory or settings.PROFILES_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / f"{profile_id}.folded").write_text(folded)
+    (directory / f"{profile_id}.json").write_text(json.dumps(meta, indent=2))
+    return directory / f"{profile_id}.folded"
+
+
+def load_profile(profile_id: str, directory: str = None):
+    """Folded stacks for a stored profile, or None if it doesn't exist."""
+    if not _PROFILE_ID_RE.match(profile_id):
+        return None
+    path = Path(directory or settings.PROFILES_DIR) / f"{profile_id}.folded"
+    return path.read_text() if path.exists() else None
+
+
+def list_profiles(directory: str = None, limit: int = 50) -> list:
+    """Tags of the most recent stored profiles, newest first."""
+    directory = Path(directory or settings.PROFILES_DIR)
+    if not directory.exists():
+        return []
+    tags = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)[:limit]
+    return [json.loads(p.read_text()) for p in tags]
+
+
+class LoopLagMonitor:
+    """
+    Detects event-loop stalls, e.g. a synchronous call on an async path.
+
+    A probe task records how late each of its sleeps wakes up (event_loop_lag_seconds),
+    and a watchdog thread logs the loop thread's stack once whenever the probe has not
+    run for longer than `threshold` seconds.
+    """
+
+    def __init__(self, threshold: float = 0.25, interval: float = 0.05):
+        self.threshold = threshold
+        self.interval = interval
+        self._last_beat = time.monotonic()
+        self._loop = None
+        self._loop_thread_id = None
+        self._task = None
+        self._watchdog = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start monitoring the running loop; call from a coroutine on that loop."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._probe())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._watchdog = None
+
+    async def _probe(self):
+        while True:
+            due = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_beat = now
+            loop_lag.observe(max(now - due, 0.0))
+
+    def _watch(self):
+        reported = False
+        while not self._stop.wait(self.interval):
+            blocked_for = time.monotonic() - self._last_beat
+            if blocked_for <= self.threshold:
+                reported = False
+                continue
+            if reported:
+                continue
+            reported = True
+            # Metrics are only updated on the loop thread; this lands once the loop unblocks
+            try:
+                self._loop.call_soon_threadsafe(loop_blocked.inc)
+            except RuntimeError:
+                return  # Loop closed while we were watching
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "<unavailable>"
+            logger.warning(f"Event loop blocked for {blocked_for * 1000:.0f}ms; loop thread stack:\n{stack}")
+
+
+loop_monitor = LoopLagMonitor(threshold=settings.LOOP_LAG_THRESHOLD)
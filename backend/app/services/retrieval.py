@@ -0,0 +1,194 @@
+import re
+import zlib
+import logging
+from collections import OrderedDict
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.models import ChangeLog, CompanyPage, Post, PostVector
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the this to was we were will with you your".split()
+)
+
+
+def tokenize(text: str) -> list:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS and len(t) > 1]
+
+
+def hash_terms(text: str, dim: int):
+    """
+    Bucket the text's terms into `dim` slots with a stable hash (crc32, unlike hash()).
+    Returns (bucket indices uint32, counts float32).
+    """
+    import numpy as np
+    buckets = np.fromiter((zlib.crc32(t.encode()) % dim for t in tokenize(text or "")), dtype=np.uint32)
+    terms, counts = np.unique(buckets, return_counts=True)
+    return terms.astype(np.uint32), counts.astype(np.float32)
+
+
+class PageIndex:
+    """
+    TF-IDF index over one page's posts, ranked by cosine similarity. Rows are kept sparse
+    (each post's bucket indices and counts), so memory grows with the posts' terms, not dim.
+    """
+
+    def __init__(self, dim: int):
+        import numpy as np
+        self.dim = dim
+        self.post_ids: list = []
+        self.contents: list = []
+        self.terms = np.zeros(0, dtype=np.uint32)
+        self.counts = np.zeros(0, dtype=np.float32)
+        self.rows = np.zeros(0, dtype=np.int64)  # Post position of each (term, count) pair
+
+    def __len__(self):
+        return len(self.post_ids)
+
+    def add_many(self, entries: list):
+        import numpy as np
+        if not entries:
+            return
+        first = len(self)
+        self.terms = np.concatenate([self.terms, *(terms for _, _, terms, _ in entries)])
+        self.counts = np.concatenate([self.counts, *(weights for _, _, _, weights in entries)])
+        self.rows = np.concatenate([
+            self.rows,
+            np.repeat(np.arange(first, first + len(entries)), [len(terms) for _, _, terms, _ in entries]),
+        ])
+        self.post_ids.extend(e[0] for e in entries)
+        self.contents.extend(e[1] for e in entries)
+
+    def search(self, query: str, k: int = 5) -> list:
+        """Return up to k (post_id, content, score) with a positive score, best first."""
+        import numpy as np
+        if not len(self):
+            return []
+        q_terms, q_weights = hash_terms(query, self.dim)
+        if not len(q_terms):
+            return []
+
+        # Smoothed IDF over this page's posts, sublinear TF, L2-normalized rows
+        df = np.bincount(self.terms, minlength=self.dim)
+        idf = np.log((1 + len(self)) / (1 + df)) + 1
+        docs = np.log1p(self.counts) * idf[self.terms]
+        norms = np.sqrt(np.bincount(self.rows, weights=docs * docs, minlength=len(self)))
+        q = np.zeros(self.dim, dtype=np.float64)
+        q[q_terms] = np.log1p(q_weights) * idf[q_terms]
+        q /= max(np.linalg.norm(q), 1e-12)
+
+        scores = np.bincount(self.rows, weights=docs * q[self.terms], minlength=len(self))
+        scores /= np.maximum(norms, 1e-12)
+        top = np.argsort(-scores)[:k]
+        return [(self.post_ids[i], self.contents[i], float(scores[i])) for i in top if scores[i] > 0]
+
+
+# page_id (db id) -> (version, PageIndex), least recently used first. The version is read from
+# the database on every lookup, so posts written by other workers invalidate a stale index.
+_index_cache: OrderedDict = OrderedDict()
+
+
+def _vector_row(post: Post, dim: int) -> PostVector:
+    terms, weights = hash_terms(post.content, dim)
+    return PostVector(post_id=post.id, page_id=post.page_id, dim=dim, terms=terms.tobytes(), weights=weights.tobytes())
+
+
+def index_new_posts(db: AsyncSession, posts: list):
+    """Add vectors for freshly flushed posts to the session (committed with them)."""
+    dim = settings.RETRIEVAL_DIM
+    for post in posts:
+        _index_cache.pop(post.page_id, None)
+        if post.content is not None:
+            db.add(_vector_row(post, dim))
+
+
+async def reindex_posts(db: AsyncSession, posts: list):
+    """Replace the vectors of posts whose content changed and drop their pages' cached indexes."""
+    if not posts:
+        return
+    await db.execute(delete(PostVector).where(PostVector.post_id.in_([post.id for post in posts])))
+    dim = settings.RETRIEVAL_DIM
+    for post in posts:
+        _index_cache.pop(post.page_id, None)
+        if post.content is not None:
+            db.add(_vector_row(post, dim))
+
+
+async def _page_version(db: AsyncSession, page_id: int) -> tuple:
+    """Changes whenever a post of the page is added, edited or removed, whichever worker wrote it."""
+    posts = select(func.count(Post.id)).where(Post.page_id == page_id, Post.content.isnot(None)).scalar_subquery()
+    last_change = (
+        select(func.max(ChangeLog.id))
+        .where(ChangeLog.page_id == page_id, ChangeLog.entity == "post")
+        .scalar_subquery()
+    )
+    return tuple((await db.execute(select(posts, last_change))).one())
+
+
+async def _store_vectors(db: AsyncSession, rows: list):
+    """Write backfilled vectors in a session of their own; the caller's session is only read here."""
+    async with AsyncSession(db.bind) as session:
+        try:
+            for row in rows:
+                await session.merge(row)
+            await session.commit()
+        except IntegrityError:
+            # A concurrent request backfilled the same posts; our in-memory vectors are identical
+            await session.rollback()
+
+
+async def load_page_index(db: AsyncSession, page_id: int) -> PageIndex:
+    """Load a page's index from post_vectors, backfilling vectors for posts indexed before they existed."""
+    import numpy as np
+    dim = settings.RETRIEVAL_DIM
+    version = await _page_version(db, page_id)
+    cached = _index_cache.get(page_id)
+    if cached is not None and cached[0] == version and cached[1].dim == dim:
+        _index_cache.move_to_end(page_id)
+        return cached[1]
+
+    result = await db.execute(
+        select(Post, PostVector)
+        .outerjoin(PostVector, PostVector.post_id == Post.id)
+        .where(Post.page_id == page_id, Post.content.isnot(None))
+    )
+    index = PageIndex(dim)
+    entries = []
+    backfill = []
+    for post, vector in result.all():
+        terms, weights = (vector.terms, vector.weights) if vector is not None else (None, None)
+        # Missing, or the hash space changed since this post was indexed
+        if vector is None or vector.dim != dim:
+            fresh = _vector_row(post, dim)
+            backfill.append(fresh)
+            terms, weights = fresh.terms, fresh.weights
+        entries.append((
+            post.id,
+            post.content,
+            np.frombuffer(terms, dtype=np.uint32),
+            np.frombuffer(weights, dtype=np.float32),
+        ))
+    if backfill:
+        await _store_vectors(db, backfill)
+
+    index.add_many(entries)
+    _index_cache[page_id] = (version, index)
+    _index_cache.move_to_end(page_id)
+    while len(_index_cache) > settings.RETRIEVAL_INDEX_CACHE_SIZE:
+        _index_cache.popitem(last=False)
+    return index
+
+
+async def relevant_posts(db: AsyncSession, linkedin_id: str, query: str, k: int = 5) -> list:
+    """Contents of the page's posts most similar to the query, best first."""
+    page_id = (await db.execute(
+        select(CompanyPage.id).where(CompanyPage.linkedin_id == linkedin_id)
+    )).scalar()
+    if page_id is None:
+        return []
+    index = await load_page_index(db, page_id)
+    return [content for _, content, _ in index.search(query, k)]
@@ -1,8 +1,17 @@
 import asyncio
 import logging
-from playwright.async_api import async_playwright
-from datetime import datetime
+import re
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from urllib.parse import urlparse
 import sys
+from app.core.config import settings
+from collections import Counter
+from app.services import browser_memory, deadline, linkedin_json, session_pool
+from app.services.circuit_breaker import CircuitBreaker, ScraperUnavailable
+from app.services.session_pool import BrowserSession, SessionPool
+from app.services.events import scrape_events
 
 # Fix for Windows - Playwright requires ProactorEventLoop
 if sys.platform == 'win32':
@@ -10,207 +19,660 @@ if sys.platform == 'win32':
 
 logger = logging.getLogger(__name__)
 
+# Feed updates carry their activity URN, e.g. data-urn="urn:li:activity:7160000000000000000"
+POST_SELECTOR = '[data-urn^="urn:li:activity:"]'
+EXTRACT_POSTS_JS = """
+els => els.map(el => {
+    const text = q => { const node = el.querySelector(q); return node ? node.textContent : ""; };
+    return {
+        urn: el.getAttribute("data-urn"),
+        text: text(".feed-shared-update-v2__description, .update-components-text"),
+        likes: text(".social-details-social-counts__reactions-count"),
+        comments: text(".social-details-social-counts__comments"),
+        age: text(".update-components-actor__sub-description"),
+        pinned: /pinned/i.test(text(".update-components-header")),
+    };
+})
+"""
+
+# Comment threads on a post permalink, keyed by their comment URN
+COMMENT_SELECTOR = "article.comments-comment-entity[data-id], article.comments-comment-item[data-id]"
+LOAD_MORE_COMMENTS_SELECTOR = "button.comments-comments-list__load-more-comments-button"
+EXTRACT_COMMENTS_JS = """
+els => els.map(el => {
+    const text = q => { const node = el.querySelector(q); return node ? node.textContent : ""; };
+    return {
+        urn: el.getAttribute("data-id"),
+        author: text(".comments-comment-meta__description-title, .comments-post-meta__name-text"),
+        text: text(".comments-comment-item__main-content, .update-components-text"),
+    };
+})
+"""
+
+# Cards on a company's People tab; the lockup selector is the fallback for older layouts
+PEOPLE_SELECTORS = (".org-people-profile-card__profile-info", ".artdeco-entity-lockup__content")
+PEOPLE_SHOW_MORE_SELECTOR = "button.scaffold-finite-scroll__load-button"
+EXTRACT_PEOPLE_JS = """
+els => els.map(el => {
+    const text = q => { const node = el.querySelector(q); return node ? node.textContent : ""; };
+    const link = el.querySelector('a[href*="/in/"]') || el.closest('a[href*="/in/"]');
+    return {
+        name: text(".artdeco-entity-lockup__title, .org-people-profile-card__profile-title"),
+        role: text(".artdeco-entity-lockup__subtitle, .org-people-profile-card__profile-headline"),
+        location: text(".artdeco-entity-lockup__caption, .org-people-profile-card__profile-location"),
+        profile_url: link ? link.href : "",
+    };
+})
+"""
+# Shown instead of the name for profiles outside the session's network
+HIDDEN_MEMBER_NAME = "LinkedIn Member"
+
+_COUNT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*([KMB]?)", re.IGNORECASE)
+_AGE_RE = re.compile(r"\b(\d+)\s*(mo|yr|y|w|d|h|m|s)\b", re.IGNORECASE)
+_AGE_UNITS = {
+    "s": timedelta(seconds=1), "m": timedelta(minutes=1), "h": timedelta(hours=1), "d": timedelta(days=1),
+    "w": timedelta(weeks=1), "mo": timedelta(days=30), "y": timedelta(days=365), "yr": timedelta(days=365),
+}
+
+
+# Navigation statuses LinkedIn answers with when it throttles a session (999 is its bot block)
+RATE_LIMIT_STATUSES = (429, 999)
+AUTHWALL_PATHS = ("/authwall", "/login", "/uas/login", "/signup")
+
+
+def classify_navigation(status: int, url: str) -> str:
+    """
+    Outcome of a navigation from its status and final URL (after redirects):
+    ok, authwall, checkpoint, not_found or throttled.
+    """
+    path = urlparse(url or "").path
+    if status in RATE_LIMIT_STATUSES:
+        return "throttled"
+    if path.startswith("/checkpoint"):
+        return "checkpoint"
+    if path.startswith(AUTHWALL_PATHS):
+        return "authwall"
+    if status in (404, 410) or path.startswith("/404") or path.startswith("/company/unavailable"):
+        return "not_found"
+    return "ok"
+
+
+class BlockedNavigation(Exception):
+    """A navigation that didn't land on the requested page (see classify_navigation)."""
+
+    def __init__(self, outcome: str, url: str, retry_after: float = None):
+        super().__init__(f"{outcome} at {url}")
+        self.outcome = outcome
+        self.retry_after = retry_after
+
+
+class ScrapeFailed(Exception):
+    """The page loaded but too little could be extracted from it; worth retrying soon."""
+
+
+def post_permalink(urn: str) -> str:
+    """Canonical, stable URL of a feed update."""
+    return f"https://www.linkedin.com/feed/update/{urn}/"
+
+
+def parse_count(text: str) -> int:
+    """'1,234 reactions' -> 1234, '1.2K' -> 1200; 0 if there is no number."""
+    match = _COUNT_RE.search(text.replace(",", ""))
+    if not match:
+        return 0
+    multiplier = {"K": 1000, "M": 1000000, "B": 1000000000}.get(match.group(2).upper(), 1)
+    return int(float(match.group(1)) * multiplier)
+
+
+def parse_relative_age(text: str):
+    """LinkedIn's relative post age ('3d', '2w', '5mo', '1yr') as a timedelta, or None."""
+    match = _AGE_RE.search(text)
+    if not match:
+        return None
+    return int(match.group(1)) * _AGE_UNITS[match.group(2).lower()]
+
 class LinkedInScraper:
-    def __init__(self):
+    # Fixed waits for client-side rendering after navigation, per page type
+    SETTLE_SECONDS = {"about": 3, "posts": 2, "people": 4, "comments": 2}
+
+    def __init__(self, base_url: str = None):
+        self.base_url = (base_url or settings.LINKEDIN_BASE_URL).rstrip("/")
+        self.settle_seconds = dict(self.SETTLE_SECONDS)
+        # "auto": use the API JSON the page fetches, falling back to the DOM; "dom": DOM only
+        self.extraction_mode = settings.SCRAPER_EXTRACTION_MODE
+        # Called as observer(page_type, stage, seconds, outcome) after each scrape stage
+        self.stage_observers = []
         self.browser = None
+        # First session's context; scrapes take pages from self.pool
         self.context = None
+        self.pool = self._new_pool()
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.SCRAPER_BREAKER_THRESHOLD,
+            backoff=settings.SCRAPER_BREAKER_BACKOFF,
+            max_backoff=settings.SCRAPER_BREAKER_MAX_BACKOFF,
+        )
+        # Lifecycle: stopped -> starting -> ready | failed
+        self.state = "stopped"
+        self.last_error = None
+        self._start_task = None
+        self._playwright = None
+        # Memory watermarks: pages served since the contexts were last recycled, last
+        # measured Chromium RSS, and recycles by (kind, reason)
+        self.pages_served = 0
+        self.rss_mb = 0.0
+        self.recycles = Counter()
+        self._last_memory_check = 0.0
+        self._recycle_task = None
+
+    def start_in_background(self) -> asyncio.Task:
+        """Launch and warm up the browser without blocking the caller; reuses an in-flight start."""
+        if self._start_task is None or self._start_task.done():
+            self._start_task = asyncio.create_task(self.start())
+        return self._start_task
+
+    async def ensure_started(self) -> bool:
+        """
+        Wait for the browser to be available, starting it if needed. Returns False if it failed;
+        raises DeadlineExceeded when the request deadline runs out first.
+        """
+        if self.browser:
+            return True
+        # Shield so a cancelled request doesn't abort a start other requests are waiting on
+        await deadline.wait(asyncio.shield(self.start_in_background()), "the browser to start")
+        return self.browser is not None
+
+    async def wait_if_starting(self):
+        """Wait for an in-flight background start without triggering a new one, within the deadline."""
+        if self._start_task is not None and not self._start_task.done():
+            await deadline.wait(asyncio.shield(self._start_task), "the browser to start")
+
+    async def _browser_ready(self, what: str) -> bool:
+        """Whether a browser is up for `what` once any in-flight start finishes, in time."""
+        try:
+            await self.wait_if_starting()
+        except deadline.DeadlineExceeded:
+            logger.info(f"Skipping {what}: request deadline reached while the browser starts")
+            return False
+        return self.browser is not None
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "last_error": self.last_error,
+            "breaker": self.breaker.status(),
+            "sessions": self.pool.stats(),
+            "memory": {
+                "rss_mb": self.rss_mb,
+                "pages_served": self.pages_served,
+                "recycles": {f"{kind}:{reason}": n for (kind, reason), n in self.recycles.items()},
+            },
+        }
+
+    def retry_after(self) -> int:
+        """Seconds until the circuit breaker accepts scrapes again (0 when it does now)."""
+        return self.breaker.retry_after()
+
+    def open_tabs(self) -> int:
+        return self.pool.open_tabs()
+
+    def _new_pool(self) -> SessionPool:
+        return SessionPool(
+            strategy=settings.SESSION_POOL_STRATEGY,
+            max_pages_per_session=settings.SESSION_MAX_PAGES,
+            cooldown=settings.SESSION_RATE_LIMIT_COOLDOWN,
+        )
+
+    def _check_navigation(self, page_type: str, page, response, started: float):
+        """Record the navigation stage under its classified outcome; raise BlockedNavigation unless ok."""
+        status = response.status if response is not None else 200
+        outcome = classify_navigation(status, page.url)
+        self._record_stage(page_type, "navigation", started, outcome)
+        retry_after = None
+        if outcome == "throttled" and response is not None:
+            header = response.headers.get("retry-after") or ""
+            retry_after = float(header) if header.isdigit() else None
+        self.breaker.record(outcome, retry_after)
+        if outcome != "ok":
+            raise BlockedNavigation(outcome, page.url, retry_after)
+
+    async def _release(self, session: BrowserSession, error: Exception = None):
+        if isinstance(error, BlockedNavigation):
+            outcome = error.outcome
+        else:
+            outcome = "error" if error else "ok"
+            # Frees a half-open probe that never got a navigation verdict
+            if error:
+                self.breaker.record("error")
+        await self.pool.release(session, outcome, error=str(error) if error else None)
+        self.pages_served += 1
+        self._check_watermarks()
+
+    def _check_watermarks(self):
+        """Start a recycle once BROWSER_RECYCLE_PAGES pages were served, or a memory check when one is due."""
+        if self._recycle_task is not None and not self._recycle_task.done():
+            return
+        if settings.BROWSER_RECYCLE_PAGES and self.pages_served >= settings.BROWSER_RECYCLE_PAGES:
+            self._recycle_task = asyncio.create_task(self.recycle("contexts", "pages"))
+            return
+        now = time.monotonic()
+        if settings.BROWSER_RECYCLE_RSS_MB and now - self._last_memory_check >= settings.BROWSER_MEMORY_CHECK_INTERVAL:
+            self._last_memory_check = now
+            self._recycle_task = asyncio.create_task(self._check_memory())
+
+    async def _check_memory(self):
+        self.rss_mb = await asyncio.to_thread(browser_memory.chromium_rss_mb)
+        if self.rss_mb >= settings.BROWSER_RECYCLE_RSS_MB:
+            logger.warning(f"Chromium RSS {self.rss_mb}MB over {settings.BROWSER_RECYCLE_RSS_MB}MB, relaunching the browser")
+            await self.recycle("browser", "memory")
+
+    async def recycle(self, kind: str = "contexts", reason: str = "manual"):
+        """
+        Replace the browser contexts ("contexts") or the whole Chromium process ("browser")
+        without losing the sessions: new scrapes wait, in-flight ones drain (up to
+        BROWSER_DRAIN_TIMEOUT), each session's storage state (cookies, local storage)
+        is carried over to its new context and its cookies are saved to its file.
+        """
+        # Not bound by the deadline of the request that triggered it
+        deadline.clear()
+        if not self.browser:
+            return
+        started = time.perf_counter()
+        try:
+            async with self.pool.paused(settings.BROWSER_DRAIN_TIMEOUT):
+                states = []
+                for session in self.pool.sessions:
+                    state = await session.context.storage_state()
+                    await session.save_cookies(state["cookies"])
+                    states.append(state)
+                    await session.context.close()
+                if kind == "browser":
+                    await self.browser.close()
+                    self.browser = await self._launch_browser()
+                for session, state in zip(self.pool.sessions, states):
+                    session.context = await self._new_context(storage_state=state)
+                self.context = self.pool.sessions[0].context if self.pool.sessions else None
+        except Exception as e:
+            # Leave it to the next ensure_started() to bring up a fresh browser
+            logger.error(f"Browser {kind} recycle failed: {e}")
+            self.browser = None
+            self.pool = self._new_pool()
+            self.state = "failed"
+            self.last_error = f"Recycle failed: {e}"
+            return
+        self.pages_served = 0
+        self.recycles[(kind, reason)] += 1
+        self.rss_mb = await asyncio.to_thread(browser_memory.chromium_rss_mb)
+        logger.info(f"Recycled browser {kind} ({reason}) in {time.perf_counter() - started:.1f}s; Chromium RSS now {self.rss_mb}MB")
+
+    def _unavailable(self, what: str) -> ScraperUnavailable:
+        return ScraperUnavailable(
+            f"Scraping is paused after repeated {self.breaker.last_reason or 'blocked'} responses ({what})",
+            retry_after=self.retry_after() or int(self.breaker.backoff),
+        )
+
+    def _skip_for_deadline(self, what: str) -> bool:
+        """Whether the request deadline leaves too little time to start another scrape."""
+        if deadline.enough_for(settings.DEADLINE_MIN_STAGE):
+            return False
+        logger.info(f"Skipping {what}: request deadline nearly reached")
+        return True
+
+    def _record_stage(self, page_type: str, stage: str, started: float, outcome: str = "ok"):
+        elapsed = time.perf_counter() - started
+        for observer in self.stage_observers:
+            try:
+                observer(page_type, stage, elapsed, outcome)
+            except Exception as e:
+                logger.debug(f"Stage observer failed: {e}")
         
     async def start(self):
+        self.state = "starting"
         try:
-            playwright = await async_playwright().start()
-            # Headless mode with no-sandbox for Docker stability
-            self.browser = await playwright.chromium.launch(
-                headless=True,
-                args=['--no-sandbox', '--disable-setuid-sandbox']
-            )
-            self.context = await self.browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-            # Set global timeout to 90s due to slow loading
-            self.context.set_default_timeout(90000)
-            self.context.set_default_navigation_timeout(90000)
-            
-            # Cookie-based authentication
-            import os
-            import json
-            import base64
-            self.username = os.getenv("LINKEDIN_USERNAME")
-            self.password = os.getenv("LINKEDIN_PASSWORD")
-            manual_login = os.getenv("MANUAL_LOGIN", "false").lower() == "true"
-            cookie_file = "/app/linkedin_cookies.json"
-            
-            print(f"DEBUG: LINKEDIN_USERNAME = '{self.username}'")
-            print(f"DEBUG: MANUAL_LOGIN = {manual_login}")
-            
-            # Try to load cookies from environment variable first (base64 encoded)
-            cookies_loaded = False
-            cookies_base64 = os.getenv("LINKEDIN_COOKIES_BASE64")
-            if cookies_base64 and not manual_login:
-                try:
-                    cookies_json = base64.b64decode(cookies_base64).decode('utf-8')
-                    cookies = json.loads(cookies_json)
-                    await self.context.add_cookies(cookies)
-                    logger.info(f"Loaded LinkedIn cookies from environment variable ({len(cookies)} cookies)")
-                    print(f"DEBUG: Cookies loaded from LINKEDIN_COOKIES_BASE64!")
-                    cookies_loaded = True
-                except Exception as e:
-                    logger.warning(f"Failed to load base64 cookies: {e}")
+            # Imported lazily so importing the API doesn't pay for Playwright
+            from playwright.async_api import async_playwright
+            self._playwright = await async_playwright().start()
+            self.browser = await self._launch_browser()
+            self.pool = self._new_pool()
+            self.pages_served = 0
+            session_files = session_pool.session_files(settings.LINKEDIN_SESSION_FILES)
+            if session_files:
+                await self._open_file_sessions(session_files)
+            else:
+                self.context = await self._new_context()
+                await self._prepare_default_context(async_playwright)
+                self.pool.add(BrowserSession("default", self.context))
+
+            logger.info("Playwright browser started successfully.")
+            self.state = "ready"
+            self.last_error = None
+        except Exception as e:
+            logger.error(f"Failed to start Playwright: {e}")
+            self.browser = None
+            self.state = "failed"
+            self.last_error = str(e)
+
+    async def _launch_browser(self):
+        # Headless mode with no-sandbox for Docker stability
+        return await self._playwright.chromium.launch(
+            headless=True,
+            args=['--no-sandbox', '--disable-setuid-sandbox']
+        )
+
+    async def _new_context(self, storage_state: dict = None):
+        context = await self.browser.new_context(
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            storage_state=storage_state
+        )
+        # Set global timeout to 90s due to slow loading
+        context.set_default_timeout(90000)
+        context.set_default_navigation_timeout(90000)
+        return context
+
+    async def _open_file_sessions(self, paths: list):
+        """One context per cookie file, each warmed up on the feed; unreadable files are skipped."""
+        import json
+        for path in paths:
+            try:
+                with open(path) as f:
+                    cookies = json.load(f)
+            except Exception as e:
+                logger.warning(f"Skipping session file {path}: {e}")
+                continue
+            context = await self._new_context()
+            await context.add_cookies(cookies)
+            self.pool.add(BrowserSession(Path(path).stem, context, cookie_file=path))
+            try:
+                warmup_page = await context.new_page()
+                await warmup_page.goto(f"{self.base_url}/feed", timeout=60000)
+                await warmup_page.close()
+            except Exception as e:
+                logger.warning(f"Cookie warm-up failed for session {Path(path).stem}: {e}")
+        if not self.pool.sessions:
+            raise RuntimeError("None of the LINKEDIN_SESSION_FILES could be loaded")
+        logger.info(f"Opened {len(self.pool)} LinkedIn sessions")
+        self.context = self.pool.sessions[0].context
+
+    async def _prepare_default_context(self, async_playwright):
+        """Authenticate self.context from LINKEDIN_COOKIES_BASE64, the saved cookie file or a login."""
+        # Cookie-based authentication
+        import os
+        import json
+        import base64
+        self.username = os.getenv("LINKEDIN_USERNAME")
+        self.password = os.getenv("LINKEDIN_PASSWORD")
+        manual_login = os.getenv("MANUAL_LOGIN", "false").lower() == "true"
+        cookie_file = "/app/linkedin_cookies.json"
+        
+        print(f"DEBUG: LINKEDIN_USERNAME = '{self.username}'")
+        print(f"DEBUG: MANUAL_LOGIN = {manual_login}")
+        
+        # Try to load cookies from environment variable first (base64 encoded)
+        cookies_loaded = False
+        cookies_base64 = os.getenv("LINKEDIN_COOKIES_BASE64")
+        if cookies_base64 and not manual_login:
+            try:
+                cookies_json = base64.b64decode(cookies_base64).decode('utf-8')
+                cookies = json.loads(cookies_json)
+                await self.context.add_cookies(cookies)
+                logger.info(f"Loaded LinkedIn cookies from environment variable ({len(cookies)} cookies)")
+                print(f"DEBUG: Cookies loaded from LINKEDIN_COOKIES_BASE64!")
+                cookies_loaded = True
+            except Exception as e:
+                logger.warning(f"Failed to load base64 cookies: {e}")
+        
+        # Try to load existing cookies from file if not loaded from env
+        if not cookies_loaded and os.path.exists(cookie_file) and not manual_login:
+            try:
+                with open(cookie_file, 'r') as f:
+                    cookies = json.load(f)
+                await self.context.add_cookies(cookies)
+                logger.info("Loaded saved LinkedIn cookies successfully!")
+                print("DEBUG: Cookies loaded from file!")
+                cookies_loaded = True
+            except Exception as e:
+                logger.warning(f"Failed to load cookies: {e}")
+        
+        # If no cookies or manual mode, do login
+        if not cookies_loaded and self.username and self.password:
+            logger.info(f"{'Manual' if manual_login else 'Auto'} login mode for {self.username}...")
+            print(f"DEBUG: Attempting login...")
             
-            # Try to load existing cookies from file if not loaded from env
-            if not cookies_loaded and os.path.exists(cookie_file) and not manual_login:
-                try:
-                    with open(cookie_file, 'r') as f:
-                        cookies = json.load(f)
-                    await self.context.add_cookies(cookies)
-                    logger.info("Loaded saved LinkedIn cookies successfully!")
-                    print("DEBUG: Cookies loaded from file!")
-                    cookies_loaded = True
-                except Exception as e:
-                    logger.warning(f"Failed to load cookies: {e}")
+            # Relaunch in headed mode for manual login
+            if manual_login:
+                logger.info("MANUAL LOGIN MODE: A browser window will open. Please log in manually.")
+                await self.browser.close()
+                playwright = await async_playwright().start()
+                self.browser = await playwright.chromium.launch(
+                    headless=False,  # VISIBLE
+                    args=['--no-sandbox', '--disable-setuid-sandbox']
+                )
+                self.context = await self.browser.new_context(
+                    viewport={'width': 1920, 'height': 1080},
+                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+                )
             
-            # If no cookies or manual mode, do login
-            if not cookies_loaded and self.username and self.password:
-                logger.info(f"{'Manual' if manual_login else 'Auto'} login mode for {self.username}...")
-                print(f"DEBUG: Attempting login...")
+            page = await self.context.new_page()
+            try:
+                logger.info("Navigating to LinkedIn login page...")
+                await page.goto(f"{self.base_url}/login", timeout=30000)
+                await asyncio.sleep(2)  # Let page settle
+                
+                if manual_login:
+                    await page.fill("#username", self.username)
+                    await page.fill("#password", self.password)
+                    print("\n" + "="*60)
+                    print("MANUAL ACTION REQUIRED:")
+                    print("1. Click 'Sign in' in the browser window")
+                    print("2. Complete any CAPTCHA or verification")
+                    print("3. Wait until you see your LinkedIn feed")
+                    print("4. The browser will close automatically in 60 seconds")
+                    print("="*60 + "\n")
+                    await asyncio.sleep(60)  # Give user time to log in
+                else:
+                    # Automated login with human-like behavior
+                    logger.info("Filling in credentials...")
+                    await page.fill("#username", self.username)
+                    await asyncio.sleep(0.5)  # Human-like delay
+                    await page.fill("#password", self.password)
+                    await asyncio.sleep(0.5)
+                    
+                    logger.info("Clicking login button...")
+                    await page.click("button[type='submit']")
+                    
+                    # Wait for navigation with generous timeout
+                    try:
+                        await page.wait_for_url("**/feed/**", timeout=15000)
+                        logger.info("Login successful - redirected to feed")
+                    except Exception:
+                        # Might be on verification page or already logged in
+                        logger.warning("Did not redirect to feed, but continuing...")
+                    
+                    await asyncio.sleep(5)  # Extra wait for cookies to be set
                 
-                # Relaunch in headed mode for manual login
+                # Save cookies
+                cookies = await self.context.cookies()
+                if cookies:
+                    with open(cookie_file, 'w') as f:
+                        json.dump(cookies, f)
+                    logger.info(f"Cookies saved to {cookie_file} ({len(cookies)} cookies)")
+                    print(f"DEBUG: Cookies saved successfully! ({len(cookies)} cookies)")
+                else:
+                    logger.warning("No cookies to save - login may have failed")
+                
+                # If manual mode, close the visible browser and relaunch headless
                 if manual_login:
-                    logger.info("MANUAL LOGIN MODE: A browser window will open. Please log in manually.")
                     await self.browser.close()
                     playwright = await async_playwright().start()
                     self.browser = await playwright.chromium.launch(
-                        headless=False,  # VISIBLE
+                        headless=True,
                         args=['--no-sandbox', '--disable-setuid-sandbox']
                     )
                     self.context = await self.browser.new_context(
                         viewport={'width': 1920, 'height': 1080},
                         user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
                     )
-                
-                page = await self.context.new_page()
-                try:
-                    logger.info("Navigating to LinkedIn login page...")
-                    await page.goto("https://www.linkedin.com/login", timeout=30000)
-                    await asyncio.sleep(2)  # Let page settle
-                    
-                    if manual_login:
-                        await page.fill("#username", self.username)
-                        await page.fill("#password", self.password)
-                        print("\n" + "="*60)
-                        print("MANUAL ACTION REQUIRED:")
-                        print("1. Click 'Sign in' in the browser window")
-                        print("2. Complete any CAPTCHA or verification")
-                        print("3. Wait until you see your LinkedIn feed")
-                        print("4. The browser will close automatically in 60 seconds")
-                        print("="*60 + "\n")
-                        await asyncio.sleep(60)  # Give user time to log in
-                    else:
-                        # Automated login with human-like behavior
-                        logger.info("Filling in credentials...")
-                        await page.fill("#username", self.username)
-                        await asyncio.sleep(0.5)  # Human-like delay
-                        await page.fill("#password", self.password)
-                        await asyncio.sleep(0.5)
-                        
-                        logger.info("Clicking login button...")
-                        await page.click("button[type='submit']")
-                        
-                        # Wait for navigation with generous timeout
-                        try:
-                            await page.wait_for_url("**/feed/**", timeout=15000)
-                            logger.info("Login successful - redirected to feed")
-                        except Exception:
-                            # Might be on verification page or already logged in
-                            logger.warning("Did not redirect to feed, but continuing...")
-                        
-                        await asyncio.sleep(5)  # Extra wait for cookies to be set
-                    
-                    # Save cookies
-                    cookies = await self.context.cookies()
-                    if cookies:
-                        with open(cookie_file, 'w') as f:
-                            json.dump(cookies, f)
-                        logger.info(f"Cookies saved to {cookie_file} ({len(cookies)} cookies)")
-                        print(f"DEBUG: Cookies saved successfully! ({len(cookies)} cookies)")
-                    else:
-                        logger.warning("No cookies to save - login may have failed")
+                    await self.context.add_cookies(cookies)
+                    logger.info("Switched back to headless mode with saved cookies")
                     
-                    # If manual mode, close the visible browser and relaunch headless
-                    if manual_login:
-                        await self.browser.close()
-                        playwright = await async_playwright().start()
-                        self.browser = await playwright.chromium.launch(
-                            headless=True,
-                            args=['--no-sandbox', '--disable-setuid-sandbox']
-                        )
-                        self.context = await self.browser.new_context(
-                            viewport={'width': 1920, 'height': 1080},
-                            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                        )
-                        await self.context.add_cookies(cookies)
-                        logger.info("Switched back to headless mode with saved cookies")
-                        
-                except Exception as e:
-                    logger.error(f"Login process failed: {e}")
-                    import traceback
-                    traceback.print_exc()
-                finally:
-                    await page.close()
-            else:
-                logger.info("Running in anonymous mode (no cookies or credentials)")
-
-            # Cookie warm-up: Visit LinkedIn homepage to activate session
-            if cookies_loaded:
-                logger.info("Warming up cookies with LinkedIn homepage visit...")
-                try:
-                    warmup_page = await self.context.new_page()
-                    await warmup_page.goto("https://www.linkedin.com/feed", timeout=60000)
-                    await asyncio.sleep(2)
-                    await warmup_page.close()
-                    logger.info("Cookie warm-up completed")
-                except Exception as e:
-                    logger.warning(f"Cookie warm-up failed: {e}")
+            except Exception as e:
+                logger.error(f"Login process failed: {e}")
+                import traceback
+                traceback.print_exc()
+            finally:
+                await page.close()
+        else:
+            logger.info("Running in anonymous mode (no cookies or credentials)")
 
-            logger.info("Playwright browser started successfully.")
-        except Exception as e:
-            logger.error(f"Failed to start Playwright: {e}")
-            self.browser = None
+        # Cookie warm-up: Visit LinkedIn homepage to activate session
+        if cookies_loaded:
+            logger.info("Warming up cookies with LinkedIn homepage visit...")
+            try:
+                warmup_page = await self.context.new_page()
+                await warmup_page.goto(f"{self.base_url}/feed", timeout=60000)
+                await asyncio.sleep(2)
+                await warmup_page.close()
+                logger.info("Cookie warm-up completed")
+            except Exception as e:
+                logger.warning(f"Cookie warm-up failed: {e}")
 
     async def stop(self):
-        if self.context:
-            await self.context.close()
+        # Stopped mid-warmup: cancel the start, then close whatever it had opened
+        if self._start_task is not None and not self._start_task.done():
+            self._start_task.cancel()
+            try:
+                await self._start_task
+            except BaseException:
+                pass
+        if self._recycle_task is not None and not self._recycle_task.done():
+            self._recycle_task.cancel()
+        for session in self.pool.sessions:
+            try:
+                await session.save_cookies()
+                await session.context.close()
+            except Exception as e:
+                logger.warning(f"Failed to close session {session.name}: {e}")
+        self.pool = self._new_pool()
         if self.browser:
             await self.browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+        self._playwright = None
+        self.browser = None
+        self.context = None
+        self.state = "stopped"
+
+    def _capture(self, page):
+        if self.extraction_mode == "dom":
+            return None
+        return linkedin_json.ResponseCapture(page)
+
+    def _finish_about(self, page_id: str, scraped: dict):
+        """
+        Validate extracted About fields and fill in defaults. Raises ScrapeFailed when too
+        little was extracted, and BlockedNavigation when a login page was rendered instead.
+        """
+        name = scraped.get("name") or ""
+        description = scraped.get("description") or ""
+        website = scraped.get("website") or ""
+        industry = scraped.get("industry") or "Technology"
+        follower_count = scraped.get("follower_count") or 0
+        head_count = scraped.get("head_count") or 0
+        founded = scraped.get("founded") or ""
+        profile_image_url = scraped.get("profile_image_url") or ""
+
+        # Validate we got at least some data
+        if not name or len(name) < 2:
+            raise ScrapeFailed(f"Insufficient data extracted for {page_id}")
+        
+        # Reject common failed scrape patterns (LinkedIn login/error pages)
+        invalid_names = [
+            'join linkedin',
+            'welcome back',
+            'linkedin',
+            'sign in',
+            'log in',
+            'login',
+            'welcome'
+        ]
+        
+        # A login page rendered in place of the company (client-side authwall)
+        if name.lower().strip() in invalid_names:
+            logger.warning(f"Rejected invalid company name (likely login page): {name}")
+            self.breaker.record("authwall")
+            raise BlockedNavigation("authwall", f"{self.base_url}/company/{page_id}/about/")
+        
+        # Reject if description contains login indicators
+        if description and any(phrase in description.lower() for phrase in ['join linkedin', 'sign in to linkedin', 'welcome back']):
+            logger.warning(f"Rejected company - description indicates login page for {page_id}")
+            self.breaker.record("authwall")
+            raise BlockedNavigation("authwall", f"{self.base_url}/company/{page_id}/about/")
+        
+        data = {
+            "linkedin_id": page_id,
+            "name": name,
+            "description": description or f"{name} - LinkedIn Company Page",
+            "website": website or f"https://www.linkedin.com/company/{page_id}",
+            "industry": industry,
+            "follower_count": follower_count,
+            "head_count": head_count,
+            "founded": founded,
+            "profile_image_url": profile_image_url or "https://via.placeholder.com/150",
+            "created_at": datetime.now()
+        }
+        
+        logger.info(f"Successfully scraped data for {page_id}: {name}, {follower_count} followers")
+        scrape_events.publish(page_id, "about", data)
+        return data
 
     async def scrape_page_details(self, page_id: str) -> dict:
         """
         Scrapes LinkedIn company page details using robust selector strategies.
-        Returns None if scraping fails (no mock data).
+        Returns None only when LinkedIn reports that the company doesn't exist.
+        Raises ScraperUnavailable while the browser is down, the circuit breaker is open,
+        every session is cooling down or LinkedIn answers with an authwall, checkpoint or
+        throttling page; DeadlineExceeded when the request deadline runs out first; and
+        the underlying error (e.g. ScrapeFailed) when the page couldn't be scraped.
         """
-        if not self.browser:
-            try:
-                await self.start()
-            except Exception as e:
-                logger.error(f"Failed to start browser: {e}")
-                return None
-                
-            if not self.browser:
-                logger.warning(f"Browser not available for scraping {page_id}")
-                return None
+        # Checked before allow(), which reserves the half-open probe
+        if deadline.expired():
+            raise deadline.DeadlineExceeded(f"No time left to scrape {page_id}")
+        if not await self.ensure_started():
+            raise ScraperUnavailable(
+                f"Browser not available for scraping {page_id}: {self.last_error}",
+                retry_after=int(settings.SCRAPER_BREAKER_BACKOFF),
+            )
+        if not self.breaker.allow():
+            raise self._unavailable(page_id)
 
-        url = f"https://www.linkedin.com/company/{page_id}/about/"
-        page = None
+        url = f"{self.base_url}/company/{page_id}/about/"
+        page = session = failure = None
+        capture = None
+        stage, started = "navigation", time.perf_counter()
         
         try:
-            page = await self.context.new_page()
+            session = await self.pool.acquire()
+            page = await session.context.new_page()
             page.set_default_timeout(30000)
+            capture = self._capture(page)
             
             logger.info(f"Navigating to {url}")
-            await page.goto(url, timeout=30000, wait_until="domcontentloaded")
+            response = await page.goto(url, timeout=deadline.timeout_ms(30000), wait_until="domcontentloaded")
+            self._check_navigation("about", page, response, started)
             
-            # Wait for content to load
-            await asyncio.sleep(3)
+            # Wait for content to load; the company data usually arrives as API JSON before it renders
+            stage, started = "readiness", time.perf_counter()
+            settle = deadline.cap(self.settle_seconds["about"])
+            if capture is not None:
+                company = await capture.wait_for(lambda payloads: linkedin_json.parse_company(payloads, page_id), settle)
+                if company:
+                    self._record_stage("about", stage, started)
+                    stage = None
+                    logger.info(f"Extracted {page_id} from API JSON")
+                    return self._finish_about(page_id, company)
+            await asyncio.sleep(max(0.0, settle - (time.perf_counter() - started)))
+            self._record_stage("about", stage, started)
             
+            stage, started = "extraction", time.perf_counter()
             # Extract company name - multiple strategies
             name = page_id.replace("-", " ").title()
             try:
@@ -332,58 +794,53 @@ class LinkedInScraper:
                     profile_image_url = await img_el.get_attribute('src') or ""
             except Exception as e:
                 logger.debug(f"Could not extract profile image: {e}")
+            self._record_stage("about", stage, started)
+            stage = None
             
-            
-            # Validate we got at least some data
-            if not name or len(name) < 2:
-                logger.warning(f"Scraping failed - insufficient data for {page_id}")
-                return None
-            
-            # Reject common failed scrape patterns (LinkedIn login/error pages)
-            invalid_names = [
-                'join linkedin',
-                'welcome back',
-                'linkedin',
-                'sign in',
-                'log in',
-                'login',
-                'welcome'
-            ]
-            
-            if name.lower().strip() in invalid_names:
-                logger.warning(f"Rejected invalid company name (likely login page): {name}")
-                return None
-            
-            # Reject if description contains login indicators
-            if description and any(phrase in description.lower() for phrase in ['join linkedin', 'sign in to linkedin', 'welcome back']):
-                logger.warning(f"Rejected company - description indicates login page for {page_id}")
-                return None
-            
-            data = {
-                "linkedin_id": page_id,
+            return self._finish_about(page_id, {
                 "name": name,
-                "description": description or f"{name} - LinkedIn Company Page",
-                "website": website or f"https://www.linkedin.com/company/{page_id}",
+                "description": description,
+                "website": website,
                 "industry": industry,
                 "follower_count": follower_count,
                 "head_count": head_count,
                 "founded": founded,
-                "profile_image_url": profile_image_url or "https://via.placeholder.com/150",
-                "created_at": datetime.now()
-            }
-            
-            logger.info(f"Successfully scraped data for {page_id}: {name}, {follower_count} followers")
-            return data
+                "profile_image_url": profile_image_url,
+            })
             
+        except BlockedNavigation as e:
+            failure = e
+            if e.outcome == "not_found":
+                logger.info(f"Company {page_id} does not exist")
+                return None
+            logger.warning(f"Scrape of {page_id} blocked: {e}")
+            raise ScraperUnavailable(
+                f"LinkedIn answered with {e.outcome} for {page_id}",
+                retry_after=self.retry_after() or int(e.retry_after or settings.SESSION_RATE_LIMIT_COOLDOWN),
+            ) from e
+        except (ScraperUnavailable, deadline.DeadlineExceeded):
+            # Every session is cooling down (NoSessionAvailable; callers answer 503), or
+            # the deadline ran out while every session was busy: nothing was navigated
+            self.breaker.release_probe()
+            raise
         except Exception as e:
             logger.error(f"Failed to scrape {page_id}: {e}")
-            return None
+            failure = e
+            if stage:
+                self._record_stage("about", stage, started, "error")
+            if deadline.expired():
+                raise deadline.DeadlineExceeded(f"Request deadline reached while scraping {page_id}") from e
+            raise
         finally:
+            if capture is not None:
+                capture.cancel()
             if page:
                 try:
                     await page.close()
                 except:
                     pass
+            if session:
+                await self._release(session, failure)
 
     def _get_mock_data(self, page_id: str) -> dict:
         """Returns fallback mock data when scraping fails."""
@@ -400,102 +857,383 @@ class LinkedInScraper:
             "created_at": datetime.now()
         }
 
-    async def scrape_posts(self, page_id: str):
-        # The user explicitly requested REAL data and NO mocks.
-        # Creating a fresh context or page if needed, but we likely need to navigate to the timeline.
+    async def _post_items(self, page, capture) -> list:
+        """Feed items from captured API JSON, else from the DOM (one round trip for all posts)."""
+        if capture is not None and capture.payloads:
+            items = linkedin_json.parse_posts(capture.payloads)
+            if items:
+                return items
+        return await page.eval_on_selector_all(POST_SELECTOR, EXTRACT_POSTS_JS)
+
+    async def scrape_posts(
+        self,
+        page_id: str,
+        known_post_urls: list = None,
+        max_posts: int = None,
+        max_scrolls: int = None,
+        max_age_days: int = None
+    ):
+        """
+        Crawl the company feed newest-first, scrolling until it reaches a post in
+        `known_post_urls`, `max_posts` new posts, a post older than `max_age_days`,
+        `max_scrolls` scroll steps, or the end of the feed.
+
+        Posts are identified by their activity URN; `post_url` is the post's permalink.
+        Returns only posts not in `known_post_urls`, newest first.
+        """
+        known = set(known_post_urls or ())
+        max_posts = max_posts or settings.POSTS_CRAWL_MAX_POSTS
+        max_scrolls = settings.POSTS_CRAWL_MAX_SCROLLS if max_scrolls is None else max_scrolls
+        max_age_days = max_age_days or settings.POSTS_CRAWL_MAX_AGE_DAYS
         posts = []
-        if not self.browser: 
+        if self._skip_for_deadline(f"posts crawl for {page_id}"):
+            return []
+        if not await self._browser_ready(f"posts crawl for {page_id}"):
+            return []
+        if not self.breaker.allow():
+            logger.info(f"Skipping posts crawl for {page_id}: {self._unavailable(page_id)}")
             return []
             
-        page = None
+        page = session = failure = None
+        capture = None
+        stage, started = "navigation", time.perf_counter()
         try:
-            page = await self.context.new_page()
+            session = await self.pool.acquire()
+            page = await session.context.new_page()
+            capture = self._capture(page)
             # Public posts URL (often redirects to login, but worth a shot)
-            url = f"https://www.linkedin.com/company/{page_id}/posts?feedView=all"
+            url = f"{self.base_url}/company/{page_id}/posts?feedView=all"
             logger.info(f"Navigating to posts: {url}")
             # Use commit to prevent hanging
-            await page.goto(url, timeout=60000, wait_until="commit")
-            await asyncio.sleep(2) # Wait for JS
+            self._check_navigation("posts", page, await page.goto(url, timeout=deadline.timeout_ms(60000), wait_until="commit"), started)
+            stage, started = "readiness", time.perf_counter()
+            settle = deadline.cap(self.settle_seconds["posts"])
+            # Done as soon as the feed JSON arrives; otherwise wait for JS to render
+            if capture is None or not await capture.wait_for(linkedin_json.parse_posts, settle):
+                await asyncio.sleep(max(0.0, settle - (time.perf_counter() - started)))
+            self._record_stage("posts", stage, started)
+            stage, started = "extraction", time.perf_counter()
 
-            # Try to grab post containers. 
-            # Class names are obfuscated usually (e.g. artdeco-card), so we try generic structure or known legacy classes.
-            # Best bet for public pages: look for article tags or specific aria-labels
-            
-            post_elements = await page.query_selector_all('article') or await page.query_selector_all('.feed-shared-update-v2')
-            
-            for p in post_elements[:20]: # Get up to 20 posts
-                try:
-                    text_el = await p.query_selector('.feed-shared-update-v2__description') or await p.query_selector('.update-components-text')
-                    text = await text_el.text_content() if text_el else ""
-                    
-                    if text:
-                        # Try to find like count
-                        likes = 0
-                        like_el = await p.query_selector('.social-details-social-counts__reactions-count')
-                        if like_el:
-                            l_text = await like_el.text_content()
-                            import re
-                            nums = re.findall(r'\d+', l_text)
-                            if nums: likes = int(nums[0])
-
-                        posts.append({
-                            "content": text.strip(),
-                            "post_url": url, # Deep linking hard without specific ID extraction
-                            "like_count": likes,
-                            "comment_count": 0,
-                            "posted_at_timestamp": datetime.now()
-                        })
-                except Exception:
-                    continue
+            now = datetime.now()
+            cutoff = now - timedelta(days=max_age_days)
+            seen = set()
+            stop_reason = "max_scrolls"
+            for scroll in range(max_scrolls + 1):
+                items = await self._post_items(page, capture)
+                reason = None
+                for item in items:
+                    urn = item.get("urn")
+                    if not urn or urn in seen:
+                        continue
+                    seen.add(urn)
+                    permalink = post_permalink(urn)
+                    posted_at = item.get("posted_at")
+                    if posted_at is None:
+                        age = parse_relative_age(item.get("age") or "")
+                        posted_at = now - age if age is not None else None
+                    # Pinned posts sit above newer ones, so they can't end the crawl
+                    if not item.get("pinned"):
+                        if permalink in known:
+                            reason = "known_post"
+                            break
+                        if posted_at is not None and posted_at < cutoff:
+                            reason = "max_age"
+                            break
+                    if permalink in known or not (item.get("text") or "").strip():
+                        continue
+                    posts.append({
+                        "content": item["text"].strip(),
+                        "post_url": permalink,
+                        "like_count": parse_count(item.get("likes") or ""),
+                        "comment_count": parse_count(item.get("comments") or ""),
+                        "posted_at_timestamp": posted_at
+                    })
+                    if len(posts) >= max_posts:
+                        reason = "max_posts"
+                        break
+                if reason:
+                    stop_reason = reason
+                    break
+                if scroll == max_scrolls:
+                    break
+                if deadline.expired():
+                    stop_reason = "deadline"
+                    break
+
+                # Load the next batch; stop when the feed doesn't grow any more
+                before = len(seen)
+                await page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
+                if capture is not None:
+                    received = len(capture.payloads)
+                    await capture.wait_for(lambda payloads: len(payloads) > received, deadline.cap(settings.POSTS_CRAWL_SCROLL_PAUSE))
+                else:
+                    await asyncio.sleep(deadline.cap(settings.POSTS_CRAWL_SCROLL_PAUSE))
+                if len({i.get("urn") for i in await self._post_items(page, capture)} - {None}) <= before:
+                    stop_reason = "end_of_feed"
+                    break
+
+            logger.info(f"Posts crawl for {page_id}: {len(posts)} new posts after {scroll} scrolls ({stop_reason})")
+            self._record_stage("posts", stage, started)
+            stage = None
                     
+        except ScraperUnavailable:
+            self.breaker.release_probe()
+            raise
+        except deadline.DeadlineExceeded as e:
+            # Only raised by the wait for a session, before anything was navigated
+            self.breaker.release_probe()
+            logger.info(f"Skipping posts crawl for {page_id}: {e}")
         except Exception as e:
             logger.warning(f"Failed to scrape real posts: {e}")
+            failure = e
+            if stage and not isinstance(e, BlockedNavigation):
+                self._record_stage("posts", stage, started, "error")
         finally:
+            if capture is not None:
+                capture.cancel()
             if page: await page.close()
+            if session:
+                await self._release(session, failure)
             
+        scrape_events.publish(page_id, "posts", {"posts": posts})
         return posts
 
-    async def scrape_employees(self, page_id: str):
+    async def _comment_items(self, page, capture) -> list:
+        if capture is not None and capture.payloads:
+            items = linkedin_json.parse_comments(capture.payloads)
+            if items:
+                return items
+        return await page.eval_on_selector_all(COMMENT_SELECTOR, EXTRACT_COMMENTS_JS)
+
+    async def scrape_comments(self, post_url: str, max_comments: int = None):
+        """
+        Comments on one post, clicking "load more" up to COMMENTS_MAX_LOAD_MORE times
+        or until `max_comments` are collected. Returns [{"urn", "author_name", "content"}],
+        one per comment URN; comments without a URN are skipped.
+        """
+        max_comments = max_comments or settings.COMMENTS_MAX_PER_POST
+        comments = {}
+        if self._skip_for_deadline(f"comments for {post_url}"):
+            return []
+        if not await self._browser_ready(f"comments for {post_url}"):
+            return []
+        if not self.breaker.allow():
+            logger.info(f"Skipping comments for {post_url}: {self._unavailable(post_url)}")
+            return []
+
+        page = session = failure = None
+        capture = None
+        stage, started = "navigation", time.perf_counter()
+        try:
+            session = await self.pool.acquire()
+            page = await session.context.new_page()
+            capture = self._capture(page)
+            # Permalinks are canonical linkedin.com URLs; follow LINKEDIN_BASE_URL like every other navigation
+            url = post_url.replace("https://www.linkedin.com", self.base_url, 1)
+            self._check_navigation("comments", page, await page.goto(url, timeout=deadline.timeout_ms(60000), wait_until="commit"), started)
+            stage, started = "readiness", time.perf_counter()
+            settle = deadline.cap(self.settle_seconds["comments"])
+            if capture is None or not await capture.wait_for(linkedin_json.parse_comments, settle):
+                await asyncio.sleep(max(0.0, settle - (time.perf_counter() - started)))
+            self._record_stage("comments", stage, started)
+            stage, started = "extraction", time.perf_counter()
+
+            for expansion in range(settings.COMMENTS_MAX_LOAD_MORE + 1):
+                for item in await self._comment_items(page, capture):
+                    urn, text = item.get("urn"), (item.get("text") or "").strip()
+                    if urn and text and urn not in comments:
+                        comments[urn] = {"urn": urn, "author_name": (item.get("author") or "").strip() or None, "content": text}
+                if len(comments) >= max_comments or expansion == settings.COMMENTS_MAX_LOAD_MORE or deadline.expired():
+                    break
+                button = await page.query_selector(LOAD_MORE_COMMENTS_SELECTOR)
+                if button is None:
+                    break
+                received = len(capture.payloads) if capture is not None else 0
+                await button.click()
+                if capture is not None:
+                    await capture.wait_for(lambda payloads: len(payloads) > received, deadline.cap(settings.COMMENTS_LOAD_MORE_PAUSE))
+                else:
+                    await asyncio.sleep(deadline.cap(settings.COMMENTS_LOAD_MORE_PAUSE))
+            self._record_stage("comments", stage, started)
+            stage = None
+
+        except ScraperUnavailable:
+            self.breaker.release_probe()
+            raise
+        except deadline.DeadlineExceeded as e:
+            # Only raised by the wait for a session, before anything was navigated
+            self.breaker.release_probe()
+            logger.info(f"Skipping comments for {post_url}: {e}")
+        except Exception as e:
+            logger.warning(f"Failed to scrape comments for {post_url}: {e}")
+            failure = e
+            if stage and not isinstance(e, BlockedNavigation):
+                self._record_stage("comments", stage, started, "error")
+        finally:
+            if capture is not None:
+                capture.cancel()
+            if page:
+                await page.close()
+            if session:
+                await self._release(session, failure)
+
+        return list(comments.values())[:max_comments]
+
+    async def _people_items(self, page, capture) -> list:
+        """Directory entries in order, from captured API JSON, else from the DOM."""
+        if capture is not None and capture.payloads:
+            items = linkedin_json.parse_people(capture.payloads)
+            if items:
+                return items
+        for selector in PEOPLE_SELECTORS:
+            items = await page.eval_on_selector_all(selector, EXTRACT_PEOPLE_JS)
+            if items:
+                return items
+        return []
+
+    async def _load_more_people(self, page, capture):
+        """Scroll the directory and press "Show more results" if it is there."""
+        received = len(capture.payloads) if capture is not None else 0
+        await page.evaluate("window.scrollBy(0, document.body.scrollHeight)")
+        try:
+            button = await page.query_selector(PEOPLE_SHOW_MORE_SELECTOR)
+            if button and await button.is_visible():
+                await button.click(timeout=deadline.timeout_ms(5000))
+        except Exception as e:
+            logger.debug(f"Could not press show more on the People tab: {e}")
+        pause = deadline.cap(settings.EMPLOYEES_CRAWL_SCROLL_PAUSE)
+        if capture is not None:
+            await capture.wait_for(lambda payloads: len(payloads) > received, pause)
+        else:
+            await asyncio.sleep(pause)
+
+    async def scrape_employees(
+        self,
+        page_id: str,
+        start: int = 0,
+        max_employees: int = None,
+        max_scrolls: int = None,
+        on_batch=None
+    ):
+        """
+        Crawl the company's People directory, scrolling until `max_employees` people
+        past the first `start` entries are found, `max_scrolls` scroll steps, or the
+        end of the directory.
+
+        The directory only loads by scrolling, so resuming at `start` scrolls past the
+        entries a previous run already crawled. With `on_batch`, each scroll step's new
+        people are handed to `await on_batch(employees, position, exhausted)` instead of
+        being kept, where `position` is the directory entry to resume at; a final call
+        with no people and exhausted=True marks the end of the directory, or of the part
+        `max_scrolls` can reach when no new people were found. Errors raised by
+        `on_batch` end the crawl and propagate.
+        Returns the people found ([] with `on_batch`) as employee dicts.
+        """
+        max_employees = max_employees or settings.EMPLOYEES_CRAWL_MAX_PEOPLE
+        max_scrolls = settings.EMPLOYEES_CRAWL_MAX_SCROLLS if max_scrolls is None else max_scrolls
         employees = []
-        if not self.browser: return []
+        if self._skip_for_deadline(f"employees for {page_id}"):
+            return []
+        if not await self._browser_ready(f"employees for {page_id}"):
+            return []
+        if not self.breaker.allow():
+            logger.info(f"Skipping employees for {page_id}: {self._unavailable(page_id)}")
+            return []
         
-        page = None
+        page = session = failure = batch_error = None
+        capture = None
+        stage, started = "navigation", time.perf_counter()
         try:
-            page = await self.context.new_page()
-            url = f"https://www.linkedin.com/company/{page_id}/people/"
+            session = await self.pool.acquire()
+            page = await session.context.new_page()
+            capture = self._capture(page)
+            url = f"{self.base_url}/company/{page_id}/people/"
             logger.info(f"Navigating to employees: {url}")
-            await page.goto(url, timeout=60000, wait_until="commit")
-            await asyncio.sleep(4) # Wait for heavy JS
-            
-            # Look for member cards
-            # Classes are often obfuscated like .org-people-profile-card__profile-info
-            # We'll try a few generic strategies
-            
-            cards = await page.query_selector_all('.org-people-profile-card__profile-info') or \
-                    await page.query_selector_all('.artdeco-entity-lockup__content')
-            
-            for card in cards[:6]: # Limit to 6
-                try:
-                    name_el = await card.query_selector('.artdeco-entity-lockup__title') or \
-                              await card.query_selector('.org-people-profile-card__profile-title')
-                    name = await name_el.text_content() if name_el else "Employee"
-                    
-                    role_el = await card.query_selector('.artdeco-entity-lockup__subtitle') or \
-                              await card.query_selector('.org-people-profile-card__profile-headline')
-                    role = await role_el.text_content() if role_el else ""
-                    
-                    employees.append({
-                        "name": name.strip(),
-                        "role": role.strip(),
-                        "location": "LinkedIn Member", # Hard to get location easily
-                        "profile_url": ""
+            self._check_navigation("people", page, await page.goto(url, timeout=deadline.timeout_ms(60000), wait_until="commit"), started)
+            stage, started = "readiness", time.perf_counter()
+            settle = deadline.cap(self.settle_seconds["people"])
+            # Done as soon as the directory JSON arrives; otherwise wait for heavy JS
+            if capture is None or not await capture.wait_for(linkedin_json.parse_people, settle):
+                await asyncio.sleep(max(0.0, settle - (time.perf_counter() - started)))
+            self._record_stage("people", stage, started)
+            stage, started = "extraction", time.perf_counter()
+
+            position = start
+            found = 0
+            stop_reason = "max_scrolls"
+            for scroll in range(max_scrolls + 1):
+                items = await self._people_items(page, capture)
+                batch = []
+                for item in items[position:]:
+                    position += 1
+                    name = " ".join((item.get("name") or "").split())
+                    if not name or name == HIDDEN_MEMBER_NAME:
+                        continue
+                    batch.append({
+                        "name": name,
+                        "role": " ".join((item.get("role") or "").split()),
+                        "location": " ".join((item.get("location") or "").split()),
+                        "profile_url": (item.get("profile_url") or "").split("?")[0],
                     })
-                except:
-                    continue
+                    if found + len(batch) >= max_employees:
+                        break
+                if batch:
+                    found += len(batch)
+                    scrape_events.publish(page_id, "employees", {"employees": batch})
+                    if on_batch is None:
+                        employees.extend(batch)
+                    else:
+                        try:
+                            await on_batch(batch, position, False)
+                        except Exception as e:
+                            batch_error, stop_reason = e, "batch_error"
+                            break
+                if found >= max_employees:
+                    stop_reason = "max_employees"
+                    break
+                if scroll == max_scrolls:
+                    break
+                if deadline.expired():
+                    stop_reason = "deadline"
+                    break
+
+                # Load the next batch; stop when the directory doesn't grow any more
+                await self._load_more_people(page, capture)
+                if len(await self._people_items(page, capture)) <= len(items):
+                    stop_reason = "end_of_directory"
+                    break
+
+            if stop_reason == "max_scrolls" and not found:
+                # `start` lies beyond what max_scrolls can reach; resuming there would stall forever
+                stop_reason = "out_of_reach"
+            if stop_reason in ("end_of_directory", "out_of_reach") and on_batch is not None and batch_error is None:
+                try:
+                    await on_batch([], position, True)
+                except Exception as e:
+                    batch_error = e
+            logger.info(f"People crawl for {page_id}: {found} people from entry {start} to {position} after {scroll} scrolls ({stop_reason})")
+            self._record_stage("people", stage, started)
+            stage = None
                     
+        except ScraperUnavailable:
+            self.breaker.release_probe()
+            raise
+        except deadline.DeadlineExceeded as e:
+            # Only raised by the wait for a session, before anything was navigated
+            self.breaker.release_probe()
+            logger.info(f"Skipping employees for {page_id}: {e}")
         except Exception as e:
             logger.warning(f"Failed to scrape employees: {e}")
+            failure = e
+            if stage and not isinstance(e, BlockedNavigation):
+                self._record_stage("people", stage, started, "error")
         finally:
+            if capture is not None:
+                capture.cancel()
             if page: await page.close()
-            
+            if session:
+                await self._release(session, failure)
+
+        if batch_error is not None:
+            raise batch_error
         return employees
@@ -0,0 +1,272 @@
+"""
+Standalone scraper service shared by all API workers.
+
+Run it next to `uvicorn --workers N`:
+
+    SCRAPER_SERVICE_URL=unix:///tmp/linkedin_scraper.sock python -m app.services.scraper_service
+
+and set the same SCRAPER_SERVICE_URL for the API. The service owns the only Chromium
+instance and login session, and its concurrency cap applies across every worker.
+
+Protocol: one JSON object per line over a unix or TCP socket.
+    -> {"id": 1, "method": "scrape_posts", "params": {"page_id": "deepsolv"}}
+    <- {"id": 1, "result": [...]}            or  {"id": 1, "error": "message"}
+A scraper that is refusing work adds the seconds to wait: {"id": 1, "error": "...", "retry_after": 60}
+Requests may carry the caller's remaining deadline in seconds ("deadline": 12.5), which
+bounds the queue wait and the scrape; running out is reported as "deadline_exceeded": true.
+scrape_employees answers {"employees": [...], "position": 120, "exhausted": false}, so the
+caller can resume the People crawl where this one stopped.
+"""
+import asyncio
+import json
+import logging
+import math
+import time
+from urllib.parse import urlparse
+from fastapi.encoders import jsonable_encoder
+from app.core.config import settings
+from app.services import deadline
+from app.services.circuit_breaker import ScraperUnavailable
+from app.services.events import scrape_events
+
+logger = logging.getLogger(__name__)
+
+# Large enough for a full posts/employees payload on one line
+STREAM_LIMIT = 16 * 1024 * 1024
+
+
+def _parse_url(url: str):
+    """Return ("unix", path) or ("tcp", (host, port)) for a service URL."""
+    parsed = urlparse(url)
+    if parsed.scheme == "unix":
+        return "unix", parsed.netloc + parsed.path
+    if parsed.scheme == "tcp":
+        return "tcp", (parsed.hostname or "127.0.0.1", parsed.port or 8765)
+    raise ValueError(f"Unsupported scraper service URL: {url}")
+
+
+async def _open_connection(url: str):
+    kind, address = _parse_url(url)
+    if kind == "unix":
+        return await asyncio.open_unix_connection(address, limit=STREAM_LIMIT)
+    return await asyncio.open_connection(*address, limit=STREAM_LIMIT)
+
+
+class ScraperService:
+    """Serves a LinkedInScraper over the line-delimited JSON protocol."""
+
+    METHODS = ("scrape_page_details", "scrape_posts", "scrape_employees", "scrape_comments", "status")
+
+    def __init__(self, scraper, max_concurrency: int = 2):
+        self.scraper = scraper
+        # Global cap: every API worker's scrapes queue here
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def start_server(self, url: str) -> asyncio.AbstractServer:
+        kind, address = _parse_url(url)
+        self.scraper.start_in_background()
+        if kind == "unix":
+            server = await asyncio.start_unix_server(self._handle_connection, address, limit=STREAM_LIMIT)
+        else:
+            server = await asyncio.start_server(self._handle_connection, *address, limit=STREAM_LIMIT)
+        logger.info(f"Scraper service listening on {url}")
+        return server
+
+    async def serve_forever(self, url: str):
+        server = await self.start_server(url)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.scraper.stop()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                response = await self._dispatch(line)
+                writer.write(json.dumps(jsonable_encoder(response)).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _dispatch(self, line: bytes) -> dict:
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            method = request.get("method")
+            if method not in self.METHODS:
+                return {"id": request_id, "error": f"Unknown method: {method}"}
+            if method == "status":
+                return {"id": request_id, "result": self.scraper.status()}
+            handler = self._scrape_employees if method == "scrape_employees" else getattr(self.scraper, method)
+            with deadline.budget(request.get("deadline")):
+                await self._acquire_slot()
+                try:
+                    result = await handler(**request.get("params", {}))
+                finally:
+                    self._semaphore.release()
+            return {"id": request_id, "result": result}
+        except ScraperUnavailable as e:
+            return {"id": request_id, "error": str(e), "retry_after": e.retry_after}
+        except deadline.DeadlineExceeded as e:
+            return {"id": request_id, "error": str(e), "deadline_exceeded": True}
+        except Exception as e:
+            logger.error(f"Scraper service request failed: {e}")
+            return {"id": request_id, "error": str(e)}
+
+    async def _acquire_slot(self):
+        """Queue for a scrape slot, for no longer than the caller's deadline."""
+        await deadline.wait(self._semaphore.acquire(), "a scrape slot")
+
+    async def _scrape_employees(self, page_id: str, start: int = 0, **limits) -> dict:
+        # Batches can't be streamed back over one request, so collect them with the crawl position
+        result = {"employees": [], "position": start, "exhausted": False}
+
+        async def collect(employees, position, exhausted):
+            result["employees"].extend(employees)
+            result["position"], result["exhausted"] = position, exhausted
+
+        await self.scraper.scrape_employees(page_id, start=start, on_batch=collect, **limits)
+        return result
+
+
+class RemoteScraper:
+    """
+    Drop-in replacement for LinkedInScraper that forwards scrapes to a ScraperService.
+
+    Stage events are re-published locally so /pages/{page_id}/stream works the same way.
+    """
+
+    def __init__(self, url: str, timeout: float = 300):
+        self.url = url
+        self.timeout = timeout
+        self.state = "stopped"
+        self.last_error = None
+        self.breaker = {}
+        self._paused_until = 0.0  # monotonic time the service said to retry after
+        self._next_id = 0
+        self._start_task = None
+
+    async def _call(self, method: str, **params):
+        self._next_id += 1
+        request = {"id": self._next_id, "method": method, "params": params}
+        left = deadline.remaining()
+        if left is not None:
+            request["deadline"] = left
+        reader, writer = await _open_connection(self.url)
+        try:
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+            # A little over the deadline, so the service can answer with what it has
+            line = await asyncio.wait_for(reader.readline(), timeout=deadline.cap(self.timeout) + 5)
+        finally:
+            writer.close()
+            await writer.wait_closed()
+        if not line:
+            raise ConnectionError("Scraper service closed the connection")
+        response = json.loads(line)
+        if response.get("deadline_exceeded"):
+            raise deadline.DeadlineExceeded(response["error"])
+        if "retry_after" in response:
+            self._pause(response["retry_after"])
+            raise ScraperUnavailable(response["error"], retry_after=response["retry_after"])
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response.get("result")
+
+    def start_in_background(self) -> asyncio.Task:
+        """Probe the service without blocking; the service itself owns the browser lifecycle."""
+        if self._start_task is None or self._start_task.done():
+            self._start_task = asyncio.create_task(self.refresh_status())
+        return self._start_task
+
+    async def refresh_status(self) -> dict:
+        try:
+            remote = await self._call("status")
+            self.state = remote.get("state", "ready")
+            self.last_error = remote.get("last_error")
+            self.breaker = remote.get("breaker") or {}
+            self._pause(self.breaker.get("retry_after"))
+        except Exception as e:
+            self.state = "failed"
+            self.last_error = f"Scraper service unreachable: {e}"
+        return self.status()
+
+    def status(self) -> dict:
+        return {"state": self.state, "last_error": self.last_error, "breaker": self.breaker, "service": self.url}
+
+    def _pause(self, retry_after):
+        self._paused_until = time.monotonic() + (retry_after or 0)
+
+    def retry_after(self) -> int:
+        """Seconds left of the wait the service last asked for, from an error or a status refresh."""
+        return max(0, math.ceil(self._paused_until - time.monotonic()))
+
+    async def ensure_started(self) -> bool:
+        await self.refresh_status()
+        return self.state != "failed"
+
+    async def wait_if_starting(self):
+        return None
+
+    async def stop(self):
+        if self._start_task is not None and not self._start_task.done():
+            self._start_task.cancel()
+
+    async def scrape_page_details(self, page_id: str):
+        data = await self._call("scrape_page_details", page_id=page_id)
+        if data:
+            scrape_events.publish(page_id, "about", data)
+        return data
+
+    async def scrape_posts(self, page_id: str, known_post_urls: list = None, **limits):
+        if known_post_urls:
+            limits["known_post_urls"] = list(known_post_urls)
+        posts = await self._call("scrape_posts", page_id=page_id, **limits) or []
+        scrape_events.publish(page_id, "posts", {"posts": posts})
+        return posts
+
+    async def scrape_employees(self, page_id: str, start: int = 0, on_batch=None, **limits):
+        result = await self._call("scrape_employees", page_id=page_id, start=start, **limits) or {}
+        employees = result.get("employees") or []
+        if employees:
+            scrape_events.publish(page_id, "employees", {"employees": employees})
+        if on_batch is None:
+            return employees
+        # The whole crawl arrives as one batch
+        if employees:
+            await on_batch(employees, result.get("position", start), False)
+        if result.get("exhausted"):
+            await on_batch([], result.get("position", start), True)
+        return []
+
+    async def scrape_comments(self, post_url: str, max_comments: int = None):
+        params = {"max_comments": max_comments} if max_comments else {}
+        return await self._call("scrape_comments", post_url=post_url, **params) or []
+
+
+def create_scraper():
+    """Use the shared scraper service when configured, otherwise an in-process browser."""
+    if settings.SCRAPER_SERVICE_URL:
+        return RemoteScraper(settings.SCRAPER_SERVICE_URL)
+    from app.services.scraper import LinkedInScraper
+    return LinkedInScraper()
+
+
+def main():
+    from app.services.scraper import LinkedInScraper
+    logging.basicConfig(level=logging.INFO)
+    url = settings.SCRAPER_SERVICE_URL or "unix:///tmp/linkedin_scraper.sock"
+    service = ScraperService(LinkedInScraper(), max_concurrency=settings.SCRAPER_MAX_CONCURRENCY)
+    asyncio.run(service.serve_forever(url))
+
+
+if __name__ == "__main__":
+    main()
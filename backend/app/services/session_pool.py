@@ -0,0 +1,192 @@
+import asyncio
+import glob
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+from app.services import deadline
+from app.services.circuit_breaker import BLOCKED_OUTCOMES, ScraperUnavailable
+
+logger = logging.getLogger(__name__)
+
+
+class NoSessionAvailable(ScraperUnavailable):
+    """Every session is cooling down; retry after `retry_after` seconds."""
+
+
+def session_files(spec: str) -> list:
+    """Expand LINKEDIN_SESSION_FILES: comma-separated cookie file paths and/or globs."""
+    files = []
+    for part in (p.strip() for p in spec.split(",")):
+        if not part:
+            continue
+        matches = sorted(glob.glob(part)) if glob.has_magic(part) else [part]
+        files.extend(m for m in matches if m not in files)
+    return files
+
+
+class BrowserSession:
+    """One browser context with its own LinkedIn cookie jar, plus its usage and health."""
+
+    def __init__(self, name: str, context, cookie_file: str = None):
+        self.name = name
+        self.context = context
+        self.cookie_file = cookie_file
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.rate_limited = 0
+        self.authwalls = 0
+        self.cooldown_until = 0.0
+        self.last_used = 0.0
+        self.last_error = None
+
+    @property
+    def state(self) -> str:
+        if self.cooldown_until > time.monotonic():
+            return "cooling_down"
+        return "healthy"
+
+    def open_tabs(self) -> int:
+        return len(self.context.pages) if self.context else 0
+
+    async def save_cookies(self, cookies: list = None):
+        """Write the context's current cookies back to its file (LinkedIn refreshes them)."""
+        if not self.cookie_file or not self.context:
+            return
+        cookies = cookies if cookies is not None else await self.context.cookies()
+        if cookies:
+            await asyncio.to_thread(_write_json, self.cookie_file, cookies)
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "in_flight": self.in_flight,
+            "open_tabs": self.open_tabs(),
+            "requests": self.requests,
+            "failures": self.failures,
+            "rate_limited": self.rate_limited,
+            "authwalls": self.authwalls,
+            "cooldown_remaining": max(0, round(self.cooldown_until - time.monotonic(), 1)),
+            "last_error": self.last_error,
+        }
+
+
+def _write_json(path: str, data):
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+class SessionPool:
+    """
+    Schedules scrapes across authenticated browser sessions.
+
+    `least_loaded` picks the healthy session with the fewest pages in flight (ties go
+    to the least recently used); `round_robin` rotates through healthy sessions.
+    Each session runs at most `max_pages_per_session` pages at once; callers wait for
+    a free slot. A session that gets throttled or sent to the authwall/checkpoint
+    cools down for `cooldown` seconds, doubling while it keeps getting blocked.
+    """
+
+    def __init__(self, strategy: str = "least_loaded", max_pages_per_session: int = 2, cooldown: float = 300):
+        self.strategy = strategy
+        self.max_pages_per_session = max_pages_per_session
+        self.cooldown = cooldown
+        self.sessions: list = []
+        self._paused = False
+        self._next = 0
+        self._changed = asyncio.Condition()
+
+    def add(self, session: BrowserSession):
+        self.sessions.append(session)
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def _pick(self) -> Optional[BrowserSession]:
+        if self._paused:
+            return None
+        candidates = [
+            s for s in self.sessions
+            if s.state == "healthy" and s.in_flight < self.max_pages_per_session
+        ]
+        if not candidates:
+            return None
+        if self.strategy == "round_robin":
+            for offset in range(len(self.sessions)):
+                session = self.sessions[(self._next + offset) % len(self.sessions)]
+                if session in candidates:
+                    self._next = (self.sessions.index(session) + 1) % len(self.sessions)
+                    return session
+        return min(candidates, key=lambda s: (s.in_flight, s.last_used))
+
+    async def acquire(self) -> BrowserSession:
+        """
+        Reserve a page slot on a session, waiting while all healthy sessions are busy.
+        Raises DeadlineExceeded when the request deadline runs out first.
+        """
+        async with self._changed:
+            while True:
+                if not self.sessions:
+                    raise NoSessionAvailable("No browser sessions configured", retry_after=30)
+                session = self._pick()
+                if session is not None:
+                    session.in_flight += 1
+                    session.requests += 1
+                    session.last_used = time.monotonic()
+                    return session
+                if not self._paused and all(s.state != "healthy" for s in self.sessions):
+                    wait = min(s.cooldown_until for s in self.sessions) - time.monotonic()
+                    raise NoSessionAvailable("All browser sessions are cooling down", retry_after=max(1, int(wait) + 1))
+                await deadline.wait(self._changed.wait(), "a browser session")
+
+    async def release(self, session: BrowserSession, outcome: str = "ok", error: str = None):
+        """Return a slot, recording how the scrape went (a navigation outcome or "error")."""
+        async with self._changed:
+            session.in_flight -= 1
+            if error:
+                session.last_error = error
+            if outcome in BLOCKED_OUTCOMES:
+                if outcome == "throttled":
+                    session.rate_limited += 1
+                else:
+                    session.authwalls += 1
+                session.consecutive_failures += 1
+                backoff = self.cooldown * 2 ** min(session.consecutive_failures - 1, 4)
+                session.cooldown_until = time.monotonic() + backoff
+                logger.warning(f"Session {session.name} got {outcome}; cooling down for {backoff:.0f}s")
+            elif outcome == "error":
+                session.failures += 1
+            else:
+                session.consecutive_failures = 0
+            self._changed.notify_all()
+
+    @asynccontextmanager
+    async def paused(self, drain_timeout: float):
+        """
+        Hold new acquisitions and wait up to `drain_timeout` seconds for pages in
+        flight to finish, e.g. while the contexts are swapped; resumes on exit.
+        """
+        async with self._changed:
+            self._paused = True
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait_for(lambda: not any(s.in_flight for s in self.sessions)), drain_timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"Pages still in flight after {drain_timeout}s drain: {[s.name for s in self.sessions if s.in_flight]}")
+        try:
+            yield
+        finally:
+            async with self._changed:
+                self._paused = False
+                self._changed.notify_all()
+
+    def open_tabs(self) -> int:
+        return sum(s.open_tabs() for s in self.sessions)
+
+    def stats(self) -> list:
+        return [s.stats() for s in self.sessions]
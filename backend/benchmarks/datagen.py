@@ -0,0 +1,172 @@
+"""
+Seeded synthetic dataset generator for benchmarks.
+
+Page sizes follow heavy-tailed distributions like real company pages: most pages
+have a handful of posts and employees, a few have thousands of followers and
+hundreds of posts. Rows are written with executemany bulk inserts.
+
+    python -m benchmarks.datagen --database-url sqlite+aiosqlite:///bench.db --pages 500
+
+Populating drops every table first, so it refuses the app's DATABASE_URL, and a
+server database unless it is confirmed as a dedicated benchmark one (--drop-existing).
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import insert, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+from app.core.config import settings
+from app.core.database import Base
+from app.models.models import CompanyPage, Post, Employee, Comment
+
+INDUSTRIES = [
+    "Software Development", "IT Services", "Financial Services", "Hospital & Health Care",
+    "Retail", "Education", "Marketing", "Manufacturing", "Telecommunications", "Biotechnology",
+]
+WORDS = (
+    "growth launch hiring team product customers platform cloud security data ai revenue "
+    "partnership webinar award community engineering design sustainability quarter results "
+    "innovation event conference funding expansion market strategy culture talent"
+).split()
+ROLES = ["Software Engineer", "Product Manager", "Sales Executive", "Designer", "Data Scientist", "Recruiter", "CEO"]
+LOCATIONS = ["Bengaluru", "London", "New York", "Berlin", "Singapore", "Remote"]
+
+BATCH_SIZE = 1000
+
+
+def _sentence(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words)).capitalize() + "."
+
+
+def generate(seed: int, pages: int, max_posts: int = 200, max_employees: int = 100, max_comments: int = 30):
+    """Yield (table, rows) batches for the dataset; the same seed always yields the same rows."""
+    rng = random.Random(seed)
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    page_rows, post_rows, employee_rows, comment_rows = [], [], [], []
+    post_id = employee_id = comment_id = 0
+
+    for page_id in range(1, pages + 1):
+        followers = int(rng.paretovariate(1.2) * 500)
+        page_rows.append({
+            "id": page_id,
+            "linkedin_id": f"bench-company-{page_id}",
+            "name": f"Bench Company {page_id}",
+            "description": _sentence(rng, 30),
+            "website": f"https://bench-{page_id}.example.com",
+            "industry": rng.choice(INDUSTRIES),
+            "follower_count": followers,
+            "head_count": int(rng.lognormvariate(4, 1.5)),
+            "founded": str(rng.randint(1950, 2023)),
+            "specialties": ", ".join(rng.sample(WORDS, 4)),
+            "profile_image_url": "https://via.placeholder.com/150",
+            "created_at": now - timedelta(days=rng.randint(0, 365)),
+        })
+
+        # At least one post and employee so detail lookups never fall through to the scraper
+        for _ in range(max(1, min(max_posts, int(rng.lognormvariate(2.5, 1.0))))):
+            post_id += 1
+            post_rows.append({
+                "id": post_id,
+                "page_id": page_id,
+                "content": _sentence(rng, rng.randint(15, 120)),
+                "post_url": f"https://www.linkedin.com/feed/update/urn:li:activity:{post_id}",
+                "like_count": int(rng.paretovariate(1.5) * 5),
+                "comment_count": 0,
+                "posted_at_timestamp": now - timedelta(hours=rng.randint(0, 24 * 365)),
+                "created_at": now,
+            })
+            n_comments = min(max_comments, int(rng.expovariate(1 / 3)))
+            post_rows[-1]["comment_count"] = n_comments
+            for _ in range(n_comments):
+                comment_id += 1
+                comment_rows.append({
+                    "id": comment_id,
+                    "post_id": post_id,
+                    "author_name": f"Member {rng.randint(1, 10**6)}",
+                    "content": _sentence(rng, rng.randint(3, 40)),
+                    "created_at": now,
+                })
+
+        for _ in range(max(1, min(max_employees, int(rng.lognormvariate(2, 1.2))))):
+            employee_id += 1
+            employee_rows.append({
+                "id": employee_id,
+                "page_id": page_id,
+                "name": f"Employee {employee_id}",
+                "role": rng.choice(ROLES),
+                "location": rng.choice(LOCATIONS),
+                "profile_url": f"https://www.linkedin.com/in/bench-employee-{employee_id}",
+            })
+
+        if len(post_rows) + len(comment_rows) >= BATCH_SIZE:
+            yield from _flush(page_rows, post_rows, employee_rows, comment_rows)
+
+    yield from _flush(page_rows, post_rows, employee_rows, comment_rows)
+
+
+def _flush(*batches):
+    # Parents before children to satisfy foreign keys
+    for table, rows in zip((CompanyPage, Post, Employee, Comment), batches):
+        if rows:
+            yield table, list(rows)
+            rows.clear()
+
+
+def check_disposable(engine: AsyncEngine, confirmed: bool = False):
+    """Refuse to drop the app's own database, or a server database nobody confirmed is for benchmarks."""
+    url = engine.url.render_as_string(hide_password=False)
+    if url == make_url(settings.DATABASE_URL).render_as_string(hide_password=False):
+        raise ValueError("Refusing to populate the app's DATABASE_URL; use a dedicated benchmark database")
+    if engine.dialect.name != "sqlite" and not confirmed:
+        raise ValueError(
+            f"Refusing to drop tables in {engine.url.render_as_string()}; "
+            "confirm it is a dedicated benchmark database"
+        )
+
+
+async def populate(engine: AsyncEngine, seed: int = 42, pages: int = 200, confirmed: bool = False) -> dict:
+    """
+    Recreate the schema and bulk-insert a synthetic dataset. Returns row counts per table.
+    Non-SQLite databases must be `confirmed` as disposable.
+    """
+    check_disposable(engine, confirmed)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    counts = {}
+    async with engine.begin() as conn:
+        for table, rows in generate(seed, pages):
+            await conn.execute(insert(table), rows)
+            counts[table.__tablename__] = counts.get(table.__tablename__, 0) + len(rows)
+        if conn.dialect.name == "postgresql":
+            # Explicit ids don't advance serial sequences
+            for table in (CompanyPage, Post, Employee, Comment):
+                name = table.__tablename__
+                await conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), COALESCE((SELECT MAX(id) FROM {name}), 1))"
+                ))
+    return counts
+
+
+async def _main(args):
+    engine = create_async_engine(args.database_url)
+    try:
+        counts = await populate(engine, seed=args.seed, pages=args.pages, confirmed=args.drop_existing)
+    finally:
+        await engine.dispose()
+    print(", ".join(f"{table}: {n}" for table, n in counts.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic LinkedIn Insights dataset")
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///bench.db")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--drop-existing", action="store_true",
+        help="Confirm a non-SQLite --database-url is a dedicated benchmark database whose tables may be dropped"
+    )
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,246 @@
+"""
+In-process latency/throughput benchmarks for the API.
+
+Runs each scenario through the ASGI app (no network, no browser) against a synthetic
+dataset in SQLite, or PostgreSQL when BENCH_DATABASE_URL / --database-url is set.
+Chat uses a fake LLM backend with a fixed delay so results don't depend on Gemini.
+
+    python -m benchmarks.run --pages 200 --requests 200 --concurrency 8
+    python -m benchmarks.run compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from benchmarks import datagen
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DEFAULT_THRESHOLD = 0.15
+
+
+class FakeLLM:
+    """Stands in for a Gemini GenerativeModel: sleeps `delay` seconds per call."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+
+    def generate_content(self, prompt, stream=False):
+        time.sleep(self.delay)
+        text = f"Synthetic analysis of {len(prompt)} prompt characters."
+        if stream:
+            return [type("Chunk", (), {"text": text})()]
+        return type("Response", (), {"text": text})()
+
+
+def _scenarios(pages: int, rng: random.Random):
+    """Name -> factory returning (method, path, json body) for one request."""
+    def page_id():
+        return f"bench-company-{rng.randint(1, pages)}"
+
+    return {
+        "list": lambda i: ("GET", f"/api/v1/pages?skip={rng.randint(0, max(0, pages - 10))}&limit=10", None),
+        "list_sparse": lambda i: ("GET", "/api/v1/pages?limit=50&fields=name,follower_count&include=", None),
+        "search": lambda i: ("GET", f"/api/v1/pages/search?industry={rng.choice(datagen.INDUSTRIES)[:4]}&min_followers=100", None),
+        "details": lambda i: ("GET", f"/api/v1/pages/{page_id()}", None),
+        "posts": lambda i: ("GET", f"/api/v1/pages/{page_id()}/posts?limit=15", None),
+        "comments": lambda i: ("GET", f"/api/v1/posts/{rng.randint(1, pages * 5)}/comments", None),
+        # Unique questions so the response cache doesn't turn this into a cache benchmark
+        "chat": lambda i: ("POST", "/api/v1/chat", {"page_id": page_id(), "message": f"Growth strategy angle #{i}"}),
+    }
+
+
+async def _run_scenario(client: AsyncClient, make_request, requests: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            method, path, body = make_request(i)
+            started = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - started)
+            # 404s are expected for sampled comment/post ids that don't exist
+            if response.status_code >= 500:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    # Inclusive: tail percentiles stay within the observed latencies
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(quantiles[49] * 1000, 3),
+        "p95_ms": round(quantiles[94] * 1000, 3),
+        "p99_ms": round(quantiles[98] * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+    }
+
+
+async def run_benchmarks(
+    database_url: str,
+    pages: int = 200,
+    requests: int = 200,
+    concurrency: int = 8,
+    seed: int = 42,
+    scenarios: list = None,
+    llm_delay: float = 0.05
+) -> dict:
+    from app.main import app
+    from app.core import database
+    from app.core.database import get_db
+    from app.services import ai_analyst
+
+    engine = create_async_engine(database_url)
+    # Only ever given an explicit benchmark URL (--database-url, BENCH_DATABASE_URL) or a temporary SQLite file
+    counts = await datagen.populate(engine, seed=seed, pages=pages, confirmed=True)
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    # Point the app at the benchmark DB and a fake LLM
+    original_session_local = database.SessionLocal
+    original_model = (ai_analyst.analyst.model, ai_analyst.analyst.fallback_mode, ai_analyst.analyst._initialized)
+    app.dependency_overrides[get_db] = override_get_db
+    database.SessionLocal = session_factory
+    ai_analyst.analyst.model = FakeLLM(llm_delay)
+    ai_analyst.analyst.model_name = "fake-llm"
+    ai_analyst.analyst.fallback_mode = False
+    ai_analyst.analyst._initialized = True
+
+    rng = random.Random(seed)
+    available = _scenarios(pages, rng)
+    results = {}
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            for name in scenarios or available:
+                results[name] = await _run_scenario(client, available[name], requests, concurrency)
+                print(f"{name:12s} {results[name]}")
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        database.SessionLocal = original_session_local
+        ai_analyst.analyst.model, ai_analyst.analyst.fallback_mode, ai_analyst.analyst._initialized = original_model
+        await engine.dispose()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_sha": _git_sha(),
+            "python": platform.python_version(),
+            "database": engine.dialect.name,
+            "pages": pages,
+            "requests": requests,
+            "concurrency": concurrency,
+            "seed": seed,
+            "rows": counts,
+        },
+        "results": results,
+    }
+
+
+def _git_sha() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    Return human-readable regressions: p95 latency up or throughput down by more
+    than `threshold` (a fraction) for any scenario present in both runs.
+    """
+    regressions = []
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if not old:
+            continue
+        if old["p95_ms"] and new["p95_ms"] > old["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {old['p95_ms']}ms -> {new['p95_ms']}ms")
+        if old["throughput_rps"] and new["throughput_rps"] < old["throughput_rps"] * (1 - threshold):
+            regressions.append(f"{name}: throughput {old['throughput_rps']} -> {new['throughput_rps']} req/s")
+        if new["errors"] > old["errors"]:
+            regressions.append(f"{name}: errors {old['errors']} -> {new['errors']}")
+    return regressions
+
+
+def _main_run(args):
+    database_url = args.database_url or os.getenv("BENCH_DATABASE_URL")
+    if not database_url:
+        database_url = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db"
+    report = asyncio.run(run_benchmarks(
+        database_url,
+        pages=args.pages,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        seed=args.seed,
+        scenarios=args.scenario,
+        llm_delay=args.llm_delay,
+    ))
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{report['meta']['database']}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        return _report_regressions(json.loads(Path(args.baseline).read_text()), report, args.threshold)
+    return 0
+
+
+def _report_regressions(baseline: dict, current: dict, threshold: float) -> int:
+    regressions = compare(baseline, current, threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print(f"No regressions beyond {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "compare":
+        parser = argparse.ArgumentParser(prog="benchmarks.run compare", description="Compare two stored benchmark runs")
+        parser.add_argument("baseline")
+        parser.add_argument("current")
+        parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+        args = parser.parse_args(argv[1:])
+        baseline, current = (json.loads(Path(p).read_text()) for p in (args.baseline, args.current))
+        return _report_regressions(baseline, current, args.threshold)
+
+    parser = argparse.ArgumentParser(prog="benchmarks.run", description="Run API latency/throughput benchmarks")
+    parser.add_argument("--database-url", help="Defaults to BENCH_DATABASE_URL, else a temporary SQLite file")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenario", action="append", help="Run only these scenarios (repeatable)")
+    parser.add_argument("--llm-delay", type=float, default=0.05, help="Fake LLM latency in seconds")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<db>-<timestamp>.json)")
+    parser.add_argument("--baseline", help="Compare against this stored run and exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    return _main_run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
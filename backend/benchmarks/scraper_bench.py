@@ -0,0 +1,263 @@
+"""
+Offline scraper benchmarks against recorded LinkedIn pages.
+
+Serves the About/Posts/People fixtures in benchmarks/fixtures/ from a local HTTP
+server (with configurable response latency and page weight), points LinkedInScraper
+at it via its base URL and scrapes a batch of pages at each concurrency level.
+Reports per-stage timings (navigation, readiness, extraction), pages per minute and
+Chromium RSS. Needs Playwright's Chromium, but no network access.
+
+    python -m benchmarks.scraper_bench --pages 12 --concurrency 1 --concurrency 4 --latency-ms 150
+    python -m benchmarks.run compare benchmarks/results/scraper-old.json benchmarks/results/scraper-new.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from string import Template
+from aiohttp import web
+from app.services.browser_memory import chromium_rss_mb
+from benchmarks.run import RESULTS_DIR, _git_sha, _report_regressions, DEFAULT_THRESHOLD
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+PAGE_TYPES = ("about", "posts", "people")
+
+
+class FixtureServer:
+    """
+    Local stand-in for linkedin.com serving the recorded fixtures for any company id.
+
+    `latency` delays every document and asset response; `padding_kb` adds hidden
+    markup to each document and `assets` adds that many images per document, each
+    `asset_kb` in size, to approximate real page weight.
+    """
+
+    def __init__(self, latency: float = 0.0, padding_kb: int = 0, assets: int = 0, asset_kb: int = 20):
+        self.latency = latency
+        self.padding_kb = padding_kb
+        self.assets = assets
+        self.asset_kb = asset_kb
+        self.requests = defaultdict(int)
+        self.base_url = None
+        self._templates = {name: Template((FIXTURES_DIR / f"{name}.html").read_text()) for name in PAGE_TYPES}
+        self._runner = None
+
+    def render(self, page_type: str, page_id: str) -> str:
+        padding = ""
+        if self.padding_kb:
+            filler = "<span>lorem ipsum dolor sit amet</span>" * (self.padding_kb * 1024 // 35 + 1)
+            padding = f'<div hidden class="bench-padding">{filler}</div>'
+        assets = "".join(f'<img src="/assets/{page_type}-{i}.png" alt="">' for i in range(self.assets))
+        return self._templates[page_type].safe_substitute(
+            page_id=page_id,
+            name=page_id.replace("-", " ").title(),
+            padding=padding,
+            assets=assets,
+        )
+
+    async def _document(self, request: web.Request) -> web.Response:
+        page_type = request.match_info["page_type"]
+        self.requests[page_type] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return web.Response(text=self.render(page_type, request.match_info["page_id"]), content_type="text/html")
+
+    async def _asset(self, request: web.Request) -> web.Response:
+        self.requests["asset"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return web.Response(body=b"\0" * (self.asset_kb * 1024), content_type="application/octet-stream")
+
+    async def _empty(self, request: web.Request) -> web.Response:
+        # Login/feed/warm-up navigations: nothing to extract
+        return web.Response(text="<!DOCTYPE html><html><body></body></html>", content_type="text/html")
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application()
+        app.router.add_get(r"/company/{page_id}/{page_type:about|posts|people}", self._document)
+        app.router.add_get(r"/company/{page_id}/{page_type:about|posts|people}/", self._document)
+        app.router.add_get("/assets/{name}", self._asset)
+        app.router.add_get("/{tail:.*}", self._empty)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{bound_port}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def _summarize(seconds: list) -> dict:
+    if not seconds:
+        return {"count": 0}
+    seconds = sorted(seconds)
+    # Inclusive: tail percentiles stay within the observed timings
+    quantiles = statistics.quantiles(seconds, n=100, method="inclusive") if len(seconds) > 1 else seconds * 99
+    return {
+        "count": len(seconds),
+        "p50_ms": round(quantiles[49] * 1000, 3),
+        "p95_ms": round(quantiles[94] * 1000, 3),
+        "max_ms": round(seconds[-1] * 1000, 3),
+    }
+
+
+async def _run_level(base_url: str, pages: int, concurrency: int, settle: float = None) -> dict:
+    from app.services.scraper import LinkedInScraper
+
+    scraper = LinkedInScraper(base_url=base_url)
+    if settle is not None:
+        scraper.settle_seconds = {page_type: settle for page_type in scraper.settle_seconds}
+    stage_timings = defaultdict(list)
+    stage_errors = defaultdict(int)
+
+    def observe(page_type, stage, seconds, outcome):
+        stage_timings[f"{page_type}.{stage}"].append(seconds)
+        if outcome != "ok":
+            stage_errors[f"{page_type}.{stage}"] += 1
+
+    scraper.stage_observers.append(observe)
+    if not await scraper.ensure_started():
+        raise RuntimeError(f"Chromium failed to start: {scraper.last_error}")
+
+    rss_samples = []
+
+    async def sample_rss():
+        while True:
+            rss_samples.append(chromium_rss_mb())
+            await asyncio.sleep(0.5)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def scrape_one(i: int):
+        nonlocal errors
+        page_id = f"bench-company-{i}"
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                details = await scraper.scrape_page_details(page_id)
+                posts = await scraper.scrape_posts(page_id)
+                # The fixture directory fits on one screen, so skip the scroll that would find nothing more
+                employees = await scraper.scrape_employees(page_id, max_scrolls=0)
+            except Exception:
+                # Failed scrapes raise; count them like empty results
+                details = posts = employees = None
+            latencies.append(time.perf_counter() - started)
+            if not details or not posts or not employees:
+                errors += 1
+
+    sampler = asyncio.create_task(sample_rss())
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(scrape_one(i) for i in range(1, pages + 1)))
+        elapsed = time.perf_counter() - started
+        rss_samples.append(chromium_rss_mb())
+    finally:
+        sampler.cancel()
+        await scraper.stop()
+
+    summary = _summarize(latencies)
+    return {
+        "pages": pages,
+        "errors": errors,
+        "throughput_rps": round(pages / elapsed, 3),
+        "pages_per_minute": round(pages / elapsed * 60, 2),
+        "p50_ms": summary["p50_ms"],
+        "p95_ms": summary["p95_ms"],
+        "max_ms": summary["max_ms"],
+        "chromium_rss_peak_mb": max(rss_samples),
+        "chromium_rss_end_mb": rss_samples[-1],
+        "stages": {
+            name: {**_summarize(timings), "errors": stage_errors[name]}
+            for name, timings in sorted(stage_timings.items())
+        },
+    }
+
+
+async def run_scraper_benchmarks(
+    pages: int = 12,
+    concurrency_levels: list = (1, 2, 4),
+    latency: float = 0.05,
+    padding_kb: int = 0,
+    assets: int = 0,
+    asset_kb: int = 20,
+    settle: float = None
+) -> dict:
+    server = FixtureServer(latency=latency, padding_kb=padding_kb, assets=assets, asset_kb=asset_kb)
+    base_url = await server.start()
+    results = {}
+    try:
+        for concurrency in concurrency_levels:
+            results[f"concurrency_{concurrency}"] = level = await _run_level(base_url, pages, concurrency, settle)
+            print(
+                f"concurrency={concurrency:<3d} {level['pages_per_minute']:8.2f} pages/min  "
+                f"p95 {level['p95_ms']:.0f}ms  rss peak {level['chromium_rss_peak_mb']}MB  errors {level['errors']}"
+            )
+    finally:
+        await server.stop()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_sha": _git_sha(),
+            "python": platform.python_version(),
+            "pages": pages,
+            "latency_ms": round(latency * 1000),
+            "padding_kb": padding_kb,
+            "assets": assets,
+            "asset_kb": asset_kb,
+            "settle_seconds": settle,
+            "server_requests": dict(server.requests),
+        },
+        "results": results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks.scraper_bench", description="Benchmark the scraper against local fixtures")
+    parser.add_argument("--pages", type=int, default=12, help="Company pages scraped per concurrency level")
+    parser.add_argument("--concurrency", type=int, action="append", help="Concurrency levels (repeatable, default 1, 2, 4)")
+    parser.add_argument("--latency-ms", type=int, default=50, help="Delay added to every fixture response")
+    parser.add_argument("--padding-kb", type=int, default=0, help="Hidden markup added to each page")
+    parser.add_argument("--assets", type=int, default=0, help="Images per page")
+    parser.add_argument("--asset-kb", type=int, default=20, help="Size of each image")
+    parser.add_argument("--settle", type=float, help="Override the scraper's post-navigation waits (seconds)")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/scraper-<timestamp>.json)")
+    parser.add_argument("--baseline", help="Compare against this stored run and exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    report = asyncio.run(run_scraper_benchmarks(
+        pages=args.pages,
+        concurrency_levels=args.concurrency or [1, 2, 4],
+        latency=args.latency_ms / 1000,
+        padding_kb=args.padding_kb,
+        assets=args.assets,
+        asset_kb=args.asset_kb,
+        settle=args.settle,
+    ))
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"scraper-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        return _report_regressions(json.loads(Path(args.baseline).read_text()), report, args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
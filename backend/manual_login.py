@@ -1,12 +1,13 @@
 import asyncio
 import os
+import sys
 import json
 from playwright.async_api import async_playwright
 
 # Config
 OUTPUT_FILE = "linkedin_cookies.json"
 
-async def main():
+async def main(output_file=OUTPUT_FILE):
     print("="*60)
     print("LINKEDIN MANUAL LOGIN HELPER")
     print("="*60)
@@ -37,10 +38,12 @@ async def main():
             
             cookies = await context.cookies()
             
-            with open(OUTPUT_FILE, "w") as f:
+            if os.path.dirname(output_file):
+                os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            with open(output_file, "w") as f:
                 json.dump(cookies, f, indent=2)
                 
-            print(f"\nSUCCESS! Cookies saved to {OUTPUT_FILE}")
+            print(f"\nSUCCESS! Cookies saved to {output_file}")
             print("You can now restart your Docker container.")
             
         except Exception as e:
@@ -51,7 +54,9 @@ async def main():
             await browser.close()
 
 if __name__ == "__main__":
+    # One file per account for a session pool, e.g. `python manual_login.py sessions/alice.json`
+    # with LINKEDIN_SESSION_FILES=sessions/*.json
     try:
-        asyncio.run(main())
+        asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else OUTPUT_FILE))
     except KeyboardInterrupt:
         print("\nCancelled.")
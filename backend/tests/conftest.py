@@ -3,6 +3,7 @@ from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.main import app
+from app.core import database
 from app.core.database import Base, get_db
 
 # Use in-memory SQLite for testing to avoid robust postgres requirement
@@ -18,6 +19,8 @@ async def prepare_db():
     yield
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    # Close pooled aiosqlite connections; their worker threads would keep the process alive
+    await engine.dispose()
 
 @pytest.fixture
 async def db_session(prepare_db):
@@ -25,10 +28,12 @@ async def db_session(prepare_db):
         yield session
 
 @pytest.fixture
-async def client(db_session):
+async def client(db_session, monkeypatch):
     async def override_get_db():
         yield db_session
     
     app.dependency_overrides[get_db] = override_get_db
+    # Background work opens its own sessions through database.SessionLocal
+    monkeypatch.setattr(database, "SessionLocal", TestingSessionLocal)
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         yield ac
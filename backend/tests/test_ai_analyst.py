@@ -0,0 +1,71 @@
+import pytest
+from app.services.ai_analyst import AiAnalyst, ResponseCache
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+        text = f"answer {self.calls}"
+        if stream:
+            return [type("Chunk", (), {"text": part})() for part in ("ans", "wer ", str(self.calls))]
+        return type("Response", (), {"text": text})()
+
+
+def _analyst_with(model) -> AiAnalyst:
+    analyst = AiAnalyst()
+    analyst.model = model
+    analyst.fallback_mode = False
+    analyst._initialized = True
+    return analyst
+
+
+CONTEXT = {"linkedin_id": "acme", "name": "Acme", "industry": "Tech", "posts": ["launch"]}
+
+
+@pytest.mark.asyncio
+async def test_response_cache_serves_repeat_questions(monkeypatch):
+    cache = ResponseCache(max_size=10, ttl=60)
+    monkeypatch.setattr("app.services.ai_analyst.response_cache", cache)
+    model = FakeModel()
+    analyst = _analyst_with(model)
+
+    first = await analyst.generate_response(CONTEXT, "What does Acme do?")
+    again = await analyst.generate_response(CONTEXT, "  what does acme   do ")
+    assert first == again == "answer 1"
+    assert model.calls == 1
+    assert cache.stats()["hits"] == 1
+
+    # Changed page data never reuses the old answer
+    changed = {**CONTEXT, "posts": ["launch", "funding round"]}
+    assert await analyst.generate_response(changed, "What does Acme do?") == "answer 2"
+
+    assert cache.invalidate("acme") == 2
+    assert await analyst.generate_response(CONTEXT, "What does Acme do?") == "answer 3"
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_size=2, ttl=60)
+    cache.set("a", "p", "A")
+    cache.set("b", "p", "B")
+    cache.get("a")
+    cache.set("c", "p", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_response_relays_model_chunks(monkeypatch):
+    cache = ResponseCache(max_size=10, ttl=60)
+    monkeypatch.setattr("app.services.ai_analyst.response_cache", cache)
+    analyst = _analyst_with(FakeModel())
+
+    chunks = [c async for c in analyst.stream_response(CONTEXT, "Growth strategy?")]
+    assert chunks == ["ans", "wer ", "1"]
+
+    # Completed streams are cached and replayed in the same chunked format
+    replay = [c async for c in analyst.stream_response(CONTEXT, "growth strategy")]
+    assert "".join(replay) == "answer 1"
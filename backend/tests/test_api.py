@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from app.services.scraper import LinkedInScraper
 
@@ -49,3 +50,207 @@ async def test_get_page_not_found(client, monkeypatch):
     monkeypatch.setattr(LinkedInScraper, "scrape_page_details", mock_scrape_page_details)
     response = await client.get("/api/v1/pages/notfound")
     assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_get_page_sparse_fields(client, monkeypatch):
+    monkeypatch.setattr(LinkedInScraper, "scrape_page_details", mock_scrape_page_details)
+    response = await client.get("/api/v1/pages/sparse-company?fields=name,follower_count&include=")
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"id", "linkedin_id", "name", "follower_count"}
+    assert data["follower_count"] == 500
+
+    listing = await client.get("/api/v1/pages?fields=name&include=posts")
+    assert listing.status_code == 200
+    for item in listing.json()["items"]:
+        assert set(item) == {"id", "linkedin_id", "name", "posts"}
+
+@pytest.mark.asyncio
+async def test_sparse_fields_rejects_unknown(client):
+    response = await client.get("/api/v1/pages?fields=name,secret")
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_stream_page_details(client, monkeypatch):
+    monkeypatch.setattr(LinkedInScraper, "scrape_page_details", mock_scrape_page_details)
+    response = await client.get("/api/v1/pages/stream-company/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert "event: persisted" in response.text
+    assert "Mock stream-company" in response.text
+
+    # Stored pages are replayed immediately
+    cached = await client.get("/api/v1/pages/stream-company/stream")
+    assert cached.text.startswith("event: persisted")
+
+@pytest.mark.asyncio
+async def test_readiness_probe(client):
+    response = await client.get("/health/ready")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ready"
+    assert data["components"]["database"]["state"] == "ready"
+    assert data["components"]["scraper"]["state"] in ("stopped", "starting", "ready", "failed")
+
+@pytest.mark.asyncio
+async def test_chat_stream_fallback(client, monkeypatch):
+    from app.api.endpoints.chat import analyst
+    monkeypatch.setattr(LinkedInScraper, "scrape_page_details", mock_scrape_page_details)
+    monkeypatch.setattr(analyst, "fallback_mode", True)
+    await client.get("/api/v1/pages/chat-company")
+
+    response = await client.post("/api/v1/chat/stream", json={"page_id": "chat-company", "message": "What do they do?"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.count("event: chunk") > 1
+    assert response.text.rstrip().endswith("data: {}")
+
+    missing = await client.post("/api/v1/chat/stream", json={"page_id": "nope", "message": "hi"})
+    assert missing.status_code == 404
+
+@pytest.mark.asyncio
+async def test_page_brief_serves_overview_chat(client, monkeypatch):
+    from app.services.ai_analyst import analyst
+    monkeypatch.setattr(LinkedInScraper, "scrape_page_details", mock_scrape_page_details)
+    monkeypatch.setattr(analyst, "fallback_mode", True)
+    await client.get("/api/v1/pages/brief-company")
+
+    response = await client.get("/api/v1/pages/brief-company/brief")
+    assert response.status_code == 200
+    brief = response.json()
+    assert brief["summary"] == "A mock description"
+    assert brief["model"] == "fallback"
+
+    async def no_model_call(*args, **kwargs):
+        raise AssertionError("brief questions must not call the model")
+
+    monkeypatch.setattr(analyst, "generate_response", no_model_call)
+    chat = await client.post("/api/v1/chat", json={"page_id": "brief-company", "message": "Describe this company"})
+    assert chat.status_code == 200
+    assert chat.json()["response"].startswith("A mock description")
+
+    missing = await client.get("/api/v1/pages/unknown-company/brief")
+    assert missing.status_code == 404
+
+@pytest.mark.asyncio
+async def test_refresh_posts_persists_only_new_posts(client, monkeypatch):
+    monkeypatch.setattr(LinkedInScraper, "scrape_page_details", mock_scrape_page_details)
+    feed = [f"https://www.linkedin.com/feed/update/urn:li:activity:{n}/" for n in (3, 2, 1)]
+    calls = []
+
+    async def fake_scrape_posts(self, page_id, known_post_urls=None, **limits):
+        calls.append(list(known_post_urls or ()))
+        new = []
+        for url in feed:  # newest first, stop at the first known post
+            if url in (known_post_urls or ()):
+                break
+            new.append({"content": f"Post {url[-3]}", "post_url": url})
+        return new
+
+    monkeypatch.setattr(LinkedInScraper, "scrape_posts", fake_scrape_posts)
+    feed = feed[1:]
+    assert (await client.get("/api/v1/pages/crawl-company")).status_code == 200
+    assert calls[-1] == []
+
+    feed = [f"https://www.linkedin.com/feed/update/urn:li:activity:3/"] + feed
+    response = await client.post("/api/v1/pages/crawl-company/posts/refresh")
+    assert response.status_code == 200
+    assert response.json()["new_posts"] == 1
+    assert set(calls[-1]) == set(feed[1:])
+
+    posts = (await client.get("/api/v1/pages/crawl-company/posts")).json()
+    assert posts["total"] == 3
+
+    assert (await client.post("/api/v1/pages/unknown-company/posts/refresh")).status_code == 404
+
+@pytest.mark.asyncio
+async def test_get_page_returns_503_while_scraper_is_blocked(client, monkeypatch):
+    from app.services.circuit_breaker import ScraperUnavailable
+
+    async def blocked(self, page_id: str):
+        raise ScraperUnavailable("LinkedIn answered with authwall", retry_after=42)
+
+    monkeypatch.setattr(LinkedInScraper, "scrape_page_details", blocked)
+    response = await client.get("/api/v1/pages/blocked-company")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "42"
+
+@pytest.mark.asyncio
+async def test_unknown_page_is_negative_cached(client, monkeypatch):
+    calls = []
+
+    async def scrape(self, page_id: str):
+        calls.append(page_id)
+        return None
+
+    monkeypatch.setattr(LinkedInScraper, "scrape_page_details", scrape)
+    assert (await client.get("/api/v1/pages/typo-company")).status_code == 404
+    cached = await client.get("/api/v1/pages/typo-company")
+    assert cached.status_code == 404
+    assert int(cached.headers["retry-after"]) > 0
+    assert calls == ["typo-company"]
+
+@pytest.mark.asyncio
+async def test_page_lookup_returns_partial_data_at_the_deadline(client, monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "PAGE_LOOKUP_DEADLINE", 0.3)
+    monkeypatch.setattr(settings, "DEADLINE_MIN_STAGE", 0.1)
+    monkeypatch.setattr(LinkedInScraper, "scrape_page_details", mock_scrape_page_details)
+    employee_scrapes = []
+
+    async def slow_posts(self, page_id, known_post_urls=None, **limits):
+        await asyncio.sleep(0.35)
+        return [{"content": "Only post", "post_url": "https://www.linkedin.com/feed/update/urn:li:activity:77/"}]
+
+    async def employees(self, page_id):
+        employee_scrapes.append(page_id)
+        return []
+
+    monkeypatch.setattr(LinkedInScraper, "scrape_posts", slow_posts)
+    monkeypatch.setattr(LinkedInScraper, "scrape_employees", employees)
+    response = await client.get("/api/v1/pages/deadline-company")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["partial"] is True
+    assert len(data["posts"]) == 1
+    assert employee_scrapes == []
+
+@pytest.mark.asyncio
+async def test_details_refresh_feeds_the_change_log(client, monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "CHANGES_FEED_SETTLE", 0)
+    monkeypatch.setattr(LinkedInScraper, "scrape_page_details", mock_scrape_page_details)
+    assert (await client.get("/api/v1/pages/changing-company")).status_code == 200
+    start = (await client.get("/api/v1/changes", params={"page_id": "changing-company"})).json()
+    assert [(c["entity"], c["change"]) for c in start["items"]] == [("page", "created")]
+
+    async def grown(self, page_id):
+        return {**await mock_scrape_page_details(self, page_id), "follower_count": 2000}
+
+    monkeypatch.setattr(LinkedInScraper, "scrape_page_details", grown)
+    response = await client.post("/api/v1/pages/changing-company/details/refresh")
+    assert response.status_code == 200
+    assert response.json()["changed"] == {"follower_count": {"old": 500, "new": 2000}}
+    # Nothing changed the second time
+    assert (await client.post("/api/v1/pages/changing-company/details/refresh")).json()["changed"] == {}
+
+    feed = (await client.get("/api/v1/changes", params={"since": start["next_since"], "limit": 1})).json()
+    assert feed["has_more"] is False
+    assert feed["items"][0]["linkedin_id"] == "changing-company"
+    assert feed["items"][0]["fields"] == {"follower_count": [500, 2000]}
+    assert feed["next_since"] == feed["items"][0]["id"]
+
+@pytest.mark.asyncio
+async def test_stored_page_is_partial_when_a_relation_crawl_runs_out_of_time(client, monkeypatch):
+    from app.services import deadline
+    monkeypatch.setattr(LinkedInScraper, "scrape_page_details", mock_scrape_page_details)
+    assert (await client.get("/api/v1/pages/slow-db-company")).status_code == 200
+
+    async def out_of_time(self, page_id, **crawl):
+        raise deadline.DeadlineExceeded("Request deadline exceeded during a database call")
+
+    monkeypatch.setattr(LinkedInScraper, "scrape_employees", out_of_time)
+    response = await client.get("/api/v1/pages/slow-db-company")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Mock slow-db-company"
+    assert response.json()["partial"] is True
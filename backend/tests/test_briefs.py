@@ -0,0 +1,59 @@
+import pytest
+from app.services import briefs
+
+
+@pytest.mark.parametrize("message", [
+    "Describe this company",
+    "Summarize.",
+    "Can you summarise it?",
+    "Give me an overview of Acme Labs",
+    "Tell me about Acme Labs!",
+    "What does Acme Labs do?",
+    "Who are they?",
+])
+def test_overview_requests_are_brief_queries(message):
+    assert briefs.is_brief_query(message, "Acme Labs")
+
+
+@pytest.mark.parametrize("message", [
+    "What is their growth strategy?",
+    "Who is the CEO?",
+    "Tell me about their hiring plans",
+    "Describe their latest post",
+    "What does Acme Labs charge?",
+    "Tell me about Globex",
+])
+def test_narrower_questions_go_to_the_model(message):
+    assert not briefs.is_brief_query(message, "Acme Labs")
+
+
+@pytest.mark.asyncio
+async def test_refresh_requested_during_generation_runs_once_more(monkeypatch):
+    import asyncio
+    runs = []
+    release = asyncio.Event()
+
+    async def fake_refresh(session, linkedin_id):
+        runs.append(linkedin_id)
+        await release.wait()
+
+    class FakeSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(briefs, "refresh_brief", fake_refresh)
+    monkeypatch.setattr(briefs.database, "SessionLocal", FakeSession)
+
+    briefs.schedule_brief_refresh("brief-co")
+    task = briefs._refresh_tasks["brief-co"]
+    await asyncio.sleep(0)
+    briefs.schedule_brief_refresh("brief-co")
+    briefs.schedule_brief_refresh("brief-co")
+    release.set()
+    await task
+
+    assert runs == ["brief-co", "brief-co"]
+    assert "brief-co" not in briefs._refresh_tasks
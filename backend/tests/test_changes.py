@@ -0,0 +1,74 @@
+import json
+import pytest
+from sqlalchemy import select
+from app.models.models import ChangeLog, CompanyPage
+from app.schemas import schemas
+from app.services import crud
+
+
+async def _log(db, page_id):
+    result = await db.execute(select(ChangeLog).where(ChangeLog.page_id == page_id).order_by(ChangeLog.id))
+    return [(c.entity, c.change, json.loads(c.fields) if c.fields else {}) for c in result.scalars()]
+
+
+@pytest.mark.asyncio
+async def test_update_page_details_writes_only_changed_columns(db_session):
+    page = await crud.create_page(db_session, schemas.PageCreate(linkedin_id="diff-co", name="Diff Co", follower_count=10))
+    scraped = schemas.PageCreate(linkedin_id="diff-co", name="Diff Co", follower_count=10).model_dump()
+
+    assert await crud.update_page_details(db_session, page.id, scraped) == {}
+    touched = (await db_session.execute(select(CompanyPage.last_scraped_at).where(CompanyPage.id == page.id))).scalar()
+    assert touched is not None
+
+    scraped.update(follower_count=12, industry="Robotics")
+    assert await crud.update_page_details(db_session, page.id, scraped) == {"follower_count": (10, 12), "industry": (None, "Robotics")}
+    assert await _log(db_session, page.id) == [
+        ("page", "created", {}),
+        ("page", "updated", {"follower_count": [10, 12], "industry": [None, "Robotics"]}),
+    ]
+    assert await crud.update_page_details(db_session, 10**6, scraped) is None
+
+
+@pytest.mark.asyncio
+async def test_ingest_logs_new_and_changed_posts_and_employees(db_session):
+    page = await crud.create_page(db_session, schemas.PageCreate(linkedin_id="diff-ingest-co", name="Ingest Co"))
+    url = "https://www.linkedin.com/feed/update/urn:li:activity:4242/"
+    ada = "https://www.linkedin.com/in/ada/"
+
+    await crud.create_posts(db_session, page.id, [schemas.PostCreate(post_url=url, content="Hi", like_count=1)])
+    await crud.create_employees(db_session, page.id, [schemas.EmployeeCreate(name="Ada", role="Engineer", location="Oslo", profile_url=ada)])
+    assert await crud.create_posts(db_session, page.id, [schemas.PostCreate(post_url=url, content="Hi", like_count=5)]) == []
+    await crud.create_employees(db_session, page.id, [schemas.EmployeeCreate(name="Ada", role="CTO", location="", profile_url=ada)])
+    # Seen again unchanged: nothing logged
+    await crud.create_posts(db_session, page.id, [schemas.PostCreate(post_url=url, content="Hi", like_count=5)])
+
+    assert (await _log(db_session, page.id))[1:] == [
+        ("post", "created", {}),
+        ("employee", "created", {}),
+        ("post", "updated", {"like_count": [1, 5]}),
+        ("employee", "updated", {"role": ["Engineer", "CTO"]}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_feed_holds_back_entries_that_may_still_have_lower_ids_in_flight(db_session, monkeypatch):
+    from app.core.config import settings
+    page = await crud.create_page(db_session, schemas.PageCreate(linkedin_id="diff-settle-co", name="Settle Co"))
+    monkeypatch.setattr(settings, "CHANGES_FEED_SETTLE", 60)
+    assert await crud.get_changes(db_session, linkedin_id="diff-settle-co") == []
+    monkeypatch.setattr(settings, "CHANGES_FEED_SETTLE", 0)
+    [(entry, linkedin_id)] = await crud.get_changes(db_session, linkedin_id="diff-settle-co")
+    assert (entry.entity_id, linkedin_id) == (page.id, "diff-settle-co")
+
+
+@pytest.mark.asyncio
+async def test_edited_posts_are_retrieved_by_their_new_text(db_session):
+    from app.services import retrieval
+    page = await crud.create_page(db_session, schemas.PageCreate(linkedin_id="diff-rag-co", name="Rag Co"))
+    url = "https://www.linkedin.com/feed/update/urn:li:activity:4343/"
+    await crud.create_posts(db_session, page.id, [schemas.PostCreate(post_url=url, content="Hiring robotics engineers")])
+    assert await retrieval.relevant_posts(db_session, "diff-rag-co", "robotics") == ["Hiring robotics engineers"]
+
+    await crud.create_posts(db_session, page.id, [schemas.PostCreate(post_url=url, content="Launching our solar product")])
+    assert await retrieval.relevant_posts(db_session, "diff-rag-co", "robotics") == []
+    assert await retrieval.relevant_posts(db_session, "diff-rag-co", "solar") == ["Launching our solar product"]
@@ -0,0 +1,46 @@
+import time
+from app.services.circuit_breaker import CircuitBreaker
+
+
+def test_opens_after_consecutive_blocked_navigations():
+    breaker = CircuitBreaker(failure_threshold=3, backoff=60)
+    breaker.record("authwall")
+    breaker.record("ok")
+    breaker.record("throttled")
+    breaker.record("timeout")  # neither success nor a block
+    breaker.record("authwall")
+    assert breaker.state == "closed"
+
+    breaker.record("checkpoint")
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert 59 <= breaker.retry_after() <= 61
+
+
+def test_half_open_probe_backs_off_adaptively():
+    breaker = CircuitBreaker(failure_threshold=1, backoff=10, max_backoff=30)
+    breaker.record("throttled")
+    breaker.opened_until = time.monotonic()  # backoff elapsed
+
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # one probe at a time
+
+    breaker.record("throttled")
+    assert breaker.state == "open" and breaker.backoff == 20
+    breaker.opened_until = time.monotonic()
+    breaker.allow()
+    breaker.record("authwall")
+    assert breaker.backoff == 30
+
+    breaker.opened_until = time.monotonic()
+    assert breaker.allow()
+    breaker.record("ok")
+    assert breaker.state == "closed" and breaker.backoff == 10
+    assert breaker.retry_after() == 0
+
+
+def test_retry_after_header_extends_the_backoff():
+    breaker = CircuitBreaker(failure_threshold=1, backoff=10)
+    breaker.record("throttled", retry_after=120)
+    assert breaker.retry_after() > 100
@@ -0,0 +1,113 @@
+import asyncio
+import pytest
+from sqlalchemy import select, func
+from app.core.config import settings
+from app.models.models import CompanyPage, Post, Comment
+from app.services import comments, crud
+
+
+async def _make_post(db, suffix: str) -> Post:
+    page = CompanyPage(linkedin_id=f"comments-co-{suffix}", name="Comments Co")
+    db.add(page)
+    await db.flush()
+    post = Post(page_id=page.id, content="Hello", post_url=f"https://www.linkedin.com/feed/update/urn:li:activity:{suffix}/", comment_count=3)
+    db.add(post)
+    await db.commit()
+    return post
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_comments_dedups_by_urn(db_session):
+    post = await _make_post(db_session, "901")
+    batch = [
+        {"urn": "urn:li:comment:(activity:901,1)", "author_name": "Ann", "content": "Great"},
+        {"urn": "urn:li:comment:(activity:901,1)", "author_name": "Ann", "content": "Great"},
+        {"urn": "urn:li:comment:(activity:901,2)", "author_name": "Bo", "content": "Congrats"},
+    ]
+    assert await crud.bulk_create_comments(db_session, {post.id: batch}) == 2
+    batch.append({"urn": "urn:li:comment:(activity:901,3)", "author_name": "Cy", "content": "Nice"})
+    assert await crud.create_comments(db_session, post.id, batch) == 1
+
+    count = await db_session.scalar(select(func.count(Comment.id)).where(Comment.post_id == post.id))
+    assert count == 3
+
+
+@pytest.mark.asyncio
+async def test_ingest_comments_bounds_concurrency(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "COMMENTS_CRAWL_CONCURRENCY", 2)
+    posts = [await _make_post(db_session, str(910 + i)) for i in range(5)]
+    active = peak = 0
+
+    class FakeScraper:
+        async def scrape_comments(self, post_url):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            if post_url.endswith("914/"):
+                raise RuntimeError("tab crashed")
+            return [{"urn": f"{post_url}#c", "author_name": "Ann", "content": "Nice"}]
+
+    created = await comments.ingest_comments(db_session, FakeScraper(), [(p.id, p.post_url) for p in posts])
+    assert created == 4
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_comments_skips_urns_stored_concurrently(db_session, monkeypatch):
+    post_id = (await _make_post(db_session, "920")).id
+    execute = db_session.execute
+
+    async def execute_racing_another_ingestion(statement, *args, **kwargs):
+        result = await execute(statement, *args, **kwargs)
+        if execute_racing_another_ingestion.first:
+            # Lands between the existence check and the bulk insert
+            execute_racing_another_ingestion.first = False
+            db_session.add(Comment(post_id=post_id, urn="urn:li:comment:(activity:920,1)", content="Great"))
+            await db_session.commit()
+        return result
+    execute_racing_another_ingestion.first = True
+    monkeypatch.setattr(db_session, "execute", execute_racing_another_ingestion)
+
+    batch = [
+        {"urn": "urn:li:comment:(activity:920,1)", "author_name": "Ann", "content": "Great"},
+        {"urn": "urn:li:comment:(activity:920,2)", "author_name": "Bo", "content": "Congrats"},
+    ]
+    assert await crud.bulk_create_comments(db_session, {post_id: batch}) == 1
+    count = await db_session.scalar(select(func.count(Comment.id)).where(Comment.post_id == post_id))
+    assert count == 2
+
+
+@pytest.mark.asyncio
+async def test_posts_stored_during_an_ingestion_get_a_follow_up_pass(monkeypatch):
+    passes = []
+    release = asyncio.Event()
+
+    async def fake_ingest(session, scraper, posts):
+        passes.append(posts)
+        await release.wait()
+        return 0
+
+    class FakeSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(comments, "ingest_comments", fake_ingest)
+    monkeypatch.setattr(comments.database, "SessionLocal", FakeSession)
+    first = Post(id=1, post_url="https://example.com/1", comment_count=2)
+    second = Post(id=2, post_url="https://example.com/2", comment_count=1)
+
+    comments.schedule_comment_ingestion(None, "queued-co", [first])
+    task = comments._ingest_tasks["queued-co"]
+    await asyncio.sleep(0)
+    comments.schedule_comment_ingestion(None, "queued-co", [second])
+    comments.schedule_comment_ingestion(None, "queued-co", [second])
+    release.set()
+    await task
+
+    assert passes == [[(1, "https://example.com/1")], [(2, "https://example.com/2")]]
+    assert "queued-co" not in comments._ingest_tasks
@@ -0,0 +1,28 @@
+import pytest
+from datetime import datetime, timedelta
+from app.schemas import schemas
+from app.services import crud
+from app.services.context_builder import fetch_chat_context
+
+
+@pytest.mark.asyncio
+async def test_fetch_chat_context_returns_most_recent_posts(db_session):
+    page = await crud.create_page(db_session, schemas.PageCreate(linkedin_id="ctx-co", name="Ctx Co", industry="Tech"))
+    base = datetime(2024, 1, 1)
+    await crud.create_posts(db_session, page.id, [
+        schemas.PostCreate(content=f"post {i}", post_url=f"https://example.com/ctx-co/{i}", posted_at_timestamp=base + timedelta(days=i))
+        for i in range(8)
+    ])
+
+    context = await fetch_chat_context(db_session, "ctx-co", post_limit=3)
+    assert context["name"] == "Ctx Co"
+    assert context["industry"] == "Tech"
+    assert context["posts"] == ["post 7", "post 6", "post 5"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_chat_context_without_posts(db_session):
+    await crud.create_page(db_session, schemas.PageCreate(linkedin_id="ctx-empty", name="Empty Co"))
+    context = await fetch_chat_context(db_session, "ctx-empty")
+    assert context["posts"] == []
+    assert await fetch_chat_context(db_session, "ctx-missing") is None
@@ -0,0 +1,47 @@
+import asyncio
+import pytest
+from app.core.config import settings
+from app.services import deadline
+
+
+def test_budget_nests_to_the_sooner_deadline():
+    assert deadline.remaining() is None
+    assert deadline.cap(30) == 30
+    with deadline.budget(10):
+        assert 9 < deadline.remaining() <= 10
+        with deadline.budget(60):
+            assert deadline.remaining() <= 10
+        with deadline.budget(1):
+            assert deadline.cap(30) <= 1
+            assert deadline.timeout_ms(30000) <= 1000
+            assert not deadline.enough_for(5)
+    assert deadline.remaining() is None
+
+
+def test_zero_budget_has_already_run_out():
+    with deadline.budget(0):
+        assert deadline.expired()
+    with deadline.budget(None):
+        assert deadline.remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_bounded_db_calls_get_a_grace_period(monkeypatch):
+    monkeypatch.setattr(settings, "DEADLINE_DB_GRACE", 0.05)
+    with deadline.budget(0.01):
+        await asyncio.sleep(0.02)
+        assert deadline.expired()
+        assert await deadline.bounded(asyncio.sleep(0.01, result="stored")) == "stored"
+        with pytest.raises(deadline.DeadlineExceeded):
+            await deadline.bounded(asyncio.sleep(1))
+
+
+@pytest.mark.asyncio
+async def test_background_tasks_can_detach():
+    async def background():
+        deadline.clear()
+        return deadline.remaining()
+
+    with deadline.budget(5):
+        assert await asyncio.create_task(background()) is None
+        assert deadline.remaining() is not None
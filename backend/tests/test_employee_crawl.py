@@ -0,0 +1,67 @@
+import pytest
+from app.models.models import Employee
+from app.schemas import schemas
+from app.services import crud, page_pipeline
+
+
+class FakeDirectory:
+    """Hands out `per_run` people per crawl, resuming at `start`, like the scraper's People crawl."""
+
+    def __init__(self, size, per_run):
+        self.size = size
+        self.per_run = per_run
+        self.starts = []
+
+    async def scrape_employees(self, page_id, start=0, on_batch=None):
+        self.starts.append(start)
+        end = min(start + self.per_run, self.size)
+        people = [
+            {"name": f"Person {i}", "role": "Engineer", "location": "Oslo", "profile_url": f"https://www.linkedin.com/in/p{i}/"}
+            for i in range(start, end)
+        ]
+        await on_batch(people[:2], min(start + 2, end), False)
+        await on_batch(people[2:], end, False)
+        if end == self.size:
+            await on_batch([], end, True)
+        return []
+
+
+async def _page(db, linkedin_id):
+    return await crud.create_page(db, schemas.PageCreate(linkedin_id=linkedin_id, name=linkedin_id))
+
+
+@pytest.mark.asyncio
+async def test_crawl_resumes_and_starts_over_after_the_end(db_session):
+    page = await _page(db_session, "crawl-resume-co")
+    directory = FakeDirectory(size=7, per_run=3)
+
+    assert await page_pipeline.crawl_employees(db_session, directory, "crawl-resume-co", page.id) == 3
+    assert await page_pipeline.crawl_employees(db_session, directory, "crawl-resume-co", page.id) == 3
+    assert await page_pipeline.crawl_employees(db_session, directory, "crawl-resume-co", page.id) == 1
+    crawl = await crud.get_employee_crawl(db_session, page.id)
+    assert (crawl.position, crawl.exhausted) == (7, True)
+
+    # The next pass starts from the top and only stores people that are new
+    assert await page_pipeline.crawl_employees(db_session, directory, "crawl-resume-co", page.id) == 0
+    assert directory.starts == [0, 3, 6, 0]
+    assert await crud.count_employees_by_page(db_session, page.id) == 7
+
+
+@pytest.mark.asyncio
+async def test_create_employees_matches_profiles_and_fills_in_old_rows(db_session):
+    page = await _page(db_session, "crawl-dedup-co")
+    db_session.add(Employee(page_id=page.id, name="Ada Lovelace", role="Engineer", location="LinkedIn Member", profile_url=""))
+    await db_session.commit()
+
+    created = await crud.create_employees(db_session, page.id, [
+        schemas.EmployeeCreate(name="Ada Lovelace", role="CTO", location="London", profile_url="https://www.linkedin.com/in/ada/"),
+        schemas.EmployeeCreate(name="Sam Lee", role="Designer", profile_url="https://www.linkedin.com/in/sam-1/"),
+        schemas.EmployeeCreate(name="Sam Lee", role="Analyst", profile_url="https://www.linkedin.com/in/sam-2/"),
+        schemas.EmployeeCreate(name="Sam Lee", role="Analyst", profile_url="https://www.linkedin.com/in/sam-2/"),
+    ])
+    assert [e.profile_url for e in created] == ["https://www.linkedin.com/in/sam-1/", "https://www.linkedin.com/in/sam-2/"]
+
+    employees = (await crud.get_page_by_linkedin_id(db_session, "crawl-dedup-co")).employees
+    ada = next(e for e in employees if e.name == "Ada Lovelace")
+    assert (ada.role, ada.location, ada.profile_url) == ("CTO", "London", "https://www.linkedin.com/in/ada/")
+    assert len(employees) == 3
@@ -0,0 +1,28 @@
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Heavy dependencies that must only be imported on first use
+LAZY_MODULES = ("numpy", "google.generativeai", "playwright")
+
+
+def test_heavy_dependencies_are_lazy():
+    # A fresh interpreter, so modules imported by other tests don't count
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, app.main; print('\\n'.join(sys.modules))",
+        ],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    eager = [
+        name for name in result.stdout.splitlines()
+        if any(name == lazy or name.startswith(lazy + ".") for lazy in LAZY_MODULES)
+    ]
+    assert not eager, f"Imported at app.main import time: {eager}"
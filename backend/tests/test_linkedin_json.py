@@ -0,0 +1,164 @@
+import asyncio
+from datetime import datetime
+import pytest
+from app.services import linkedin_json
+
+# Activity id whose high bits encode midnight, 2024-02-01 (local time)
+ACTIVITY_ID = int(datetime(2024, 2, 1).timestamp() * 1000) << 22
+
+COMPANY_PAYLOAD = {
+    "data": {"*elements": ["urn:li:fsd_company:42"]},
+    "included": [
+        {
+            "$type": "com.linkedin.voyager.dash.organization.Company",
+            "entityUrn": "urn:li:fsd_company:42",
+            "universalName": "acme-labs",
+            "name": "Acme Labs",
+            "description": "Developer tooling.",
+            "websiteUrl": "https://acme.example",
+            "employeeCount": 240,
+            "foundedOn": {"year": 2014},
+            "*industry": ["urn:li:fsd_industry:4"],
+            "*followingState": "urn:li:fsd_followingState:42",
+            "logoResolutionResult": {"vectorImage": {
+                "rootUrl": "https://media.example/logo/",
+                "artifacts": [{"width": 100, "fileIdentifyingUrlPathSegment": "100.png"},
+                              {"width": 400, "fileIdentifyingUrlPathSegment": "400.png"}],
+            }},
+        },
+        {"$type": "com.linkedin.voyager.dash.common.Industry", "entityUrn": "urn:li:fsd_industry:4", "name": "Software Development"},
+        {"$type": "com.linkedin.voyager.dash.feed.FollowingState", "entityUrn": "urn:li:fsd_followingState:42", "followerCount": 48210},
+    ],
+}
+
+FEED_PAYLOAD = {
+    "included": [
+        {
+            "$type": "com.linkedin.voyager.dash.feed.Update",
+            "entityUrn": f"urn:li:fsd_update:(urn:li:activity:{ACTIVITY_ID},MEMBER_SHARES)",
+            "metadata": {"urn": f"urn:li:activity:{ACTIVITY_ID}"},
+            "header": {"text": {"text": "Pinned"}},
+            "commentary": {"text": {"text": "We shipped incremental builds."}},
+        },
+        {
+            "$type": "com.linkedin.voyager.dash.feed.SocialActivityCounts",
+            "entityUrn": f"urn:li:fsd_socialActivityCounts:urn:li:activity:{ACTIVITY_ID}",
+            "numLikes": 312,
+            "numComments": 18,
+        },
+    ],
+}
+
+PEOPLE_PAYLOAD = {
+    "included": [
+        {
+            "$type": "com.linkedin.voyager.dash.search.EntityResultViewModel",
+            "title": {"text": "Anna Keller"},
+            "primarySubtitle": {"text": "Staff Engineer at Acme Labs"},
+            "secondarySubtitle": {"text": "Berlin, Germany"},
+            "navigationUrl": "https://www.linkedin.com/in/anna-keller?miniProfileUrn=x",
+        },
+        {"$type": "com.linkedin.voyager.dash.identity.profile.Profile", "firstName": "Tomas", "lastName": "Ruiz",
+         "headline": "Head of Product", "publicIdentifier": "tomas-ruiz"},
+    ],
+}
+
+
+def test_parse_company_resolves_references():
+    company = linkedin_json.parse_company([COMPANY_PAYLOAD], "acme-labs")
+    assert company == {
+        "name": "Acme Labs",
+        "description": "Developer tooling.",
+        "website": "https://acme.example",
+        "industry": "Software Development",
+        "follower_count": 48210,
+        "head_count": 240,
+        "founded": "2014",
+        "profile_image_url": "https://media.example/logo/400.png",
+    }
+    assert linkedin_json.parse_company([FEED_PAYLOAD], "acme-labs") is None
+
+
+def test_parse_company_ignores_other_companies():
+    similar = {"included": [{
+        "$type": "com.linkedin.voyager.dash.organization.Company",
+        "entityUrn": "urn:li:fsd_company:77",
+        "universalName": "some-other-co",
+        "name": "Some Other Co",
+    }]}
+    assert linkedin_json.parse_company([similar], "acme-labs") is None
+    assert linkedin_json.parse_company([similar, COMPANY_PAYLOAD], "acme-labs")["name"] == "Acme Labs"
+    assert linkedin_json.parse_company([COMPANY_PAYLOAD, similar], "42")["name"] == "Acme Labs"
+
+
+def test_parse_posts_and_people():
+    [post] = linkedin_json.parse_posts([FEED_PAYLOAD])
+    assert post["urn"] == f"urn:li:activity:{ACTIVITY_ID}"
+    assert post["text"] == "We shipped incremental builds."
+    assert (post["likes"], post["comments"]) == ("312", "18")
+    assert post["posted_at"] == datetime(2024, 2, 1)
+    assert post["pinned"] is True
+
+    people = linkedin_json.parse_people([PEOPLE_PAYLOAD])
+    assert people[0] == {
+        "name": "Anna Keller",
+        "role": "Staff Engineer at Acme Labs",
+        "location": "Berlin, Germany",
+        "profile_url": "https://www.linkedin.com/in/anna-keller",
+    }
+    assert people[1]["profile_url"] == "https://www.linkedin.com/in/tomas-ruiz/"
+
+
+class FakeResponse:
+    def __init__(self, url, body, content_type="application/vnd.linkedin.normalized+json+2.1"):
+        self.url = url
+        self.headers = {"content-type": content_type}
+        self._body = body
+
+    async def json(self):
+        return self._body
+
+
+class FakePage:
+    def __init__(self):
+        self.handlers = []
+
+    def on(self, event, handler):
+        assert event == "response"
+        self.handlers.append(handler)
+
+    def respond(self, response):
+        for handler in self.handlers:
+            handler(response)
+
+
+@pytest.mark.asyncio
+async def test_capture_waits_for_parseable_payload():
+    page = FakePage()
+    capture = linkedin_json.ResponseCapture(page)
+
+    async def network():
+        await asyncio.sleep(0.02)
+        page.respond(FakeResponse("https://www.linkedin.com/static/app.js", {}, "text/javascript"))
+        page.respond(FakeResponse("https://www.linkedin.com/voyager/api/feed/updates", {"included": []}))
+        await asyncio.sleep(0.02)
+        page.respond(FakeResponse("https://www.linkedin.com/voyager/api/organization/companies", COMPANY_PAYLOAD))
+
+    asyncio.create_task(network())
+    company = await capture.wait_for(lambda p: linkedin_json.parse_company(p, "acme-labs"), timeout=1)
+    assert company["name"] == "Acme Labs"
+    assert len(capture.payloads) == 2
+
+    assert await capture.wait_for(linkedin_json.parse_people, timeout=0.05) == []
+
+
+def test_parse_comments():
+    payload = {"included": [
+        {"$type": "com.linkedin.voyager.dash.social.Comment", "entityUrn": "urn:li:fsd_comment:(1,urn:li:activity:5)",
+         "commenter": {"title": {"text": "Anna Keller"}}, "commentary": {"text": "Congrats team!"}},
+        {"$type": "com.linkedin.voyager.dash.social.Comment", "entityUrn": "urn:li:fsd_comment:(1,urn:li:activity:5)",
+         "commentary": {"text": "Congrats team!"}},
+    ]}
+    assert linkedin_json.parse_comments([payload]) == [
+        {"urn": "urn:li:fsd_comment:(1,urn:li:activity:5)", "author": "Anna Keller", "text": "Congrats team!"}
+    ]
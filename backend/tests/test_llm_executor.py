@@ -0,0 +1,71 @@
+import asyncio
+import threading
+import pytest
+from app.services import metrics
+from app.services.llm_executor import LLMExecutor, LLMOverloaded, LLMRateLimited
+
+
+@pytest.mark.asyncio
+async def test_executor_rejects_when_queue_is_full():
+    executor = LLMExecutor(max_concurrency=1, max_queue=1, queue_timeout=5)
+    release = threading.Event()
+
+    busy = asyncio.create_task(executor.run(release.wait))
+    await asyncio.sleep(0.05)
+    queued = asyncio.create_task(executor.run(lambda: "queued"))
+    await asyncio.sleep(0.05)
+    assert executor.stats()["queue_depth"] == 1
+
+    with pytest.raises(LLMOverloaded) as exc:
+        await executor.run(lambda: "rejected")
+    assert exc.value.status_code == 503
+    assert exc.value.retry_after == 5
+
+    release.set()
+    assert await busy is True
+    assert await queued == "queued"
+    assert executor.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_executor_times_out_waiting_for_slot():
+    timeouts = metrics.llm_slot_wait.count(outcome="timeout")
+    executor = LLMExecutor(max_concurrency=1, max_queue=4, queue_timeout=0.05)
+    release = threading.Event()
+    busy = asyncio.create_task(executor.run(release.wait))
+    await asyncio.sleep(0.02)
+    with pytest.raises(LLMOverloaded):
+        await executor.run(lambda: "late")
+    release.set()
+    await busy
+    assert executor.stats()["queue_timeouts"] == 1
+    assert metrics.llm_slot_wait.count(outcome="timeout") == timeouts + 1
+    assert 'llm_slot_wait_seconds_count{outcome="timeout"}' in metrics.render()
+
+
+@pytest.mark.asyncio
+async def test_executor_retries_rate_limits():
+    executor = LLMExecutor(max_concurrency=2, max_retries=2, retry_backoff=0.001)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("429 Resource has been exhausted (e.g. check quota).")
+        return "ok"
+
+    assert await executor.run(flaky) == "ok"
+    assert executor.stats()["retries"] == 2
+
+    def always_limited():
+        raise RuntimeError("429 rate limit")
+
+    with pytest.raises(LLMRateLimited) as exc:
+        await executor.run(always_limited)
+    assert exc.value.status_code == 429
+
+    def broken():
+        raise ValueError("bad prompt")
+
+    with pytest.raises(ValueError):
+        await executor.run(broken)
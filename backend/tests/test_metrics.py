@@ -0,0 +1,41 @@
+import pytest
+from app.services import metrics
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = metrics.Registry()
+    histogram = metrics.Histogram("op_seconds", "Op latency", ("op",), buckets=(0.1, 1), registry=registry)
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value, op="read")
+
+    text = registry.render()
+    assert "# TYPE op_seconds histogram" in text
+    assert 'op_seconds_bucket{op="read",le="0.1"} 2' in text
+    assert 'op_seconds_bucket{op="read",le="1"} 3' in text
+    assert 'op_seconds_bucket{op="read",le="+Inf"} 4' in text
+    assert 'op_seconds_count{op="read"} 4' in text
+    assert 'op_seconds_sum{op="read"} 3.65' in text
+
+
+def test_counters_and_callbacks():
+    registry = metrics.Registry()
+    counter = metrics.Counter("errors_total", "Errors", ("kind",), registry=registry)
+    counter.inc(kind='say "hi"')
+    counter.inc(2, kind='say "hi"')
+    metrics.CallbackMetric("tabs", "Open tabs", lambda: 3, registry=registry)
+    metrics.CallbackMetric("broken", "Raises", lambda: 1 / 0, registry=registry)
+
+    text = registry.render()
+    assert 'errors_total{kind="say \\"hi\\""} 3' in text
+    assert "tabs 3" in text
+    assert "broken" not in text
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_route_latency(client):
+    await client.get("/api/v1/pages/not-a-real-page/posts")
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/pages/{page_id}/posts",status="404"}' in response.text
+    assert "llm_queue_depth 0" in response.text
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+import pytest
+from app.core.config import settings
+from app.services import negative_cache
+
+
+def test_retry_window_doubles_up_to_the_max(monkeypatch):
+    monkeypatch.setattr(settings, "NEGATIVE_CACHE_NOT_FOUND_TTL", 3600)
+    monkeypatch.setattr(settings, "NEGATIVE_CACHE_FAILED_TTL", 300)
+    monkeypatch.setattr(settings, "NEGATIVE_CACHE_MAX_TTL", 86400)
+    assert negative_cache.retry_window("not_found", 1) == timedelta(hours=1)
+    assert negative_cache.retry_window("not_found", 3) == timedelta(hours=4)
+    assert negative_cache.retry_window("failed", 2) == timedelta(minutes=10)
+    assert negative_cache.retry_window("not_found", 10) == timedelta(days=1)
+
+
+@pytest.mark.asyncio
+async def test_record_extends_window_and_lookup_expires(db_session):
+    entry = await negative_cache.record(db_session, "neg-cache-co", "not_found")
+    assert entry.failure_count == 1
+    assert await negative_cache.lookup(db_session, "neg-cache-co") is not None
+
+    entry.retry_at = datetime.now() - timedelta(seconds=1)
+    await db_session.commit()
+    assert await negative_cache.lookup(db_session, "neg-cache-co") is None
+
+    entry = await negative_cache.record(db_session, "neg-cache-co", "failed", error="boom")
+    assert (entry.failure_count, entry.reason, entry.last_error) == (2, "failed", "boom")
+
+    # A failure long after the previous one starts a new streak
+    entry.last_failed_at = datetime.now() - timedelta(seconds=settings.NEGATIVE_CACHE_MAX_TTL + 60)
+    await db_session.commit()
+    assert (await negative_cache.record(db_session, "neg-cache-co", "not_found")).failure_count == 1
+
+    await negative_cache.clear(db_session, "neg-cache-co")
+    assert await negative_cache.lookup(db_session, "neg-cache-co") is None
+
+
+@pytest.mark.asyncio
+async def test_only_a_missing_company_is_cached_as_not_found(db_session):
+    from app.services import page_pipeline
+    from app.services.circuit_breaker import ScraperUnavailable
+    from app.services.scraper import ScrapeFailed
+
+    class FlakyScraper:
+        def __init__(self, error):
+            self.error = error
+
+        async def scrape_page_details(self, page_id):
+            raise self.error
+
+    with pytest.raises(ScraperUnavailable):
+        await page_pipeline.scrape_and_store_page(db_session, FlakyScraper(ScraperUnavailable("cooling down", 30)), "flaky-co")
+    assert await negative_cache.lookup(db_session, "flaky-co") is None
+
+    with pytest.raises(ScrapeFailed):
+        await page_pipeline.scrape_and_store_page(db_session, FlakyScraper(ScrapeFailed("empty page")), "flaky-co")
+    entry = await negative_cache.lookup(db_session, "flaky-co")
+    assert (entry.reason, entry.failure_count) == ("failed", 1)
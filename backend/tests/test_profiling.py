@@ -0,0 +1,71 @@
+import asyncio
+import logging
+import threading
+import time
+import pytest
+from app.core.config import settings
+from app.services import profiling
+
+
+def _busy_work(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampling_profiler_collects_folded_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_work, args=(stop,), name="busy-worker")
+    worker.start()
+    profiler = profiling.SamplingProfiler(interval=0.001)
+    profiler.start()
+    time.sleep(0.1)
+    profiler.stop()
+    stop.set()
+    worker.join()
+
+    assert profiler.sample_count > 0
+    lines = profiler.folded().splitlines()
+    busy = [line for line in lines if line.startswith("busy-worker;")]
+    assert busy and "_busy_work (tests/test_profiling.py:" in busy[0]
+    stack, count = busy[0].rsplit(" ", 1)
+    assert int(count) > 0
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_logs_blocking_call(caplog):
+    monitor = profiling.LoopLagMonitor(threshold=0.1, interval=0.02)
+    blocked_before = profiling.loop_blocked.value()
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        with caplog.at_level(logging.WARNING, logger="app.services.profiling"):
+            time.sleep(0.3)  # deliberately blocks the loop
+            await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    assert profiling.loop_blocked.value() == blocked_before + 1
+    assert "Event loop blocked" in caplog.text
+    assert "test_loop_lag_monitor_logs_blocking_call" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_profiling_middleware_stores_profile(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "PROFILING_TOKEN", "secret")
+    monkeypatch.setattr(settings, "PROFILES_DIR", str(tmp_path))
+
+    unprofiled = await client.get("/api/v1/pages", headers={"X-Profile-Token": "wrong"})
+    assert "x-profile-id" not in unprofiled.headers
+
+    response = await client.get("/api/v1/pages?profile=secret")
+    assert response.status_code == 200
+    profile_id = response.headers["x-profile-id"]
+
+    listing = await client.get("/debug/profiles", headers={"X-Profile-Token": "secret"})
+    assert listing.json()[0]["id"] == profile_id
+    assert listing.json()[0]["route"] == "/api/v1/pages"
+
+    folded = await client.get(f"/debug/profiles/{profile_id}", headers={"X-Profile-Token": "secret"})
+    assert folded.status_code == 200
+    assert folded.text.strip()
+    assert (await client.get(f"/debug/profiles/{profile_id}")).status_code == 403
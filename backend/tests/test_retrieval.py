@@ -0,0 +1,77 @@
+import pytest
+from app.core.config import settings
+from sqlalchemy import func, select
+from app.models.models import Post, PostVector
+from app.schemas import schemas
+from app.services import crud, retrieval
+from app.services.ai_analyst import AiAnalyst
+
+
+@pytest.mark.asyncio
+async def test_relevant_posts_ranks_by_similarity(db_session):
+    page = await crud.create_page(db_session, schemas.PageCreate(linkedin_id="rag-co", name="Rag Co"))
+    contents = [
+        "We are hiring backend engineers in Berlin",
+        "Our quarterly revenue grew 40 percent thanks to enterprise customers",
+        "Join our webinar on cloud security best practices",
+    ]
+    await crud.create_posts(db_session, page.id, [
+        schemas.PostCreate(content=c, post_url=f"https://example.com/rag-co/{i}") for i, c in enumerate(contents)
+    ])
+
+    assert await retrieval.relevant_posts(db_session, "rag-co", "How fast is revenue growing?", k=2) == [contents[1]]
+    assert (await retrieval.relevant_posts(db_session, "rag-co", "hiring engineers", k=1)) == [contents[0]]
+    assert await retrieval.relevant_posts(db_session, "rag-co", "zzz", k=3) == []
+
+    # Posts ingested later extend the cached index incrementally
+    await crud.create_posts(db_session, page.id, [
+        schemas.PostCreate(content="Security audit passed for our cloud platform", post_url="https://example.com/rag-co/3")
+    ])
+    ranked = await retrieval.relevant_posts(db_session, "rag-co", "cloud security", k=3)
+    assert set(ranked[:2]) == {contents[2], "Security audit passed for our cloud platform"}
+
+
+@pytest.mark.asyncio
+async def test_load_page_index_backfills_missing_vectors(db_session):
+    page = await crud.create_page(db_session, schemas.PageCreate(linkedin_id="rag-legacy", name="Legacy Co"))
+    db_session.add(Post(page_id=page.id, content="Legacy post about robotics", post_url="https://example.com/rag-legacy/0"))
+    await db_session.commit()
+
+    page_id = page.id
+
+    index = await retrieval.load_page_index(db_session, page_id)
+    assert len(index) == 1
+    assert index.search("robotics")[0][1] == "Legacy post about robotics"
+
+    # Backfilled through a session of its own: the caller's transaction is left to the caller
+    assert db_session.in_transaction()
+    await db_session.rollback()
+    assert await db_session.scalar(select(func.count()).select_from(PostVector).where(PostVector.page_id == page_id)) == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_index_is_rebuilt_when_another_worker_adds_posts(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "RETRIEVAL_INDEX_CACHE_SIZE", 1)
+    page = await crud.create_page(db_session, schemas.PageCreate(linkedin_id="rag-shared", name="Shared Co"))
+    other = await crud.create_page(db_session, schemas.PageCreate(linkedin_id="rag-other", name="Other Co"))
+    await crud.create_posts(db_session, page.id, [
+        schemas.PostCreate(content="Launching our drone fleet", post_url="https://example.com/rag-shared/0")
+    ])
+    assert len(await retrieval.load_page_index(db_session, page.id)) == 1
+
+    # Written the way another worker would, without touching this worker's cache
+    post = Post(page_id=page.id, content="Drone deliveries now in Oslo", post_url="https://example.com/rag-shared/1")
+    db_session.add(post)
+    await db_session.flush()
+    crud.log_change(db_session, page.id, "post", post.id, "created")
+    await db_session.commit()
+    assert len(await retrieval.load_page_index(db_session, page.id)) == 2
+
+    await retrieval.load_page_index(db_session, other.id)
+    assert list(retrieval._index_cache) == [other.id]
+
+
+def test_pack_posts_respects_token_budget():
+    posts = ["a" * 40, "b" * 40, "c" * 40]
+    assert AiAnalyst._pack_posts(posts, token_budget=25) == posts[:2]
+    assert AiAnalyst._pack_posts(["x" * 400], token_budget=10) == ["x" * 40]
@@ -0,0 +1,335 @@
+import pytest
+from datetime import timedelta
+from app.services.scraper import classify_navigation, parse_count, parse_relative_age, post_permalink
+
+
+def test_parse_count():
+    assert parse_count("1,234 reactions") == 1234
+    assert parse_count("1.2K") == 1200
+    assert parse_count("3 comments") == 3
+    assert parse_count("") == 0
+
+
+def test_parse_relative_age():
+    assert parse_relative_age("3d • Edited") == timedelta(days=3)
+    assert parse_relative_age("2w •") == timedelta(weeks=2)
+    assert parse_relative_age("5mo") == timedelta(days=150)
+    assert parse_relative_age("1yr") == timedelta(days=365)
+    assert parse_relative_age("Promoted") is None
+
+
+def test_post_permalink_is_stable():
+    urn = "urn:li:activity:7160000000000000000"
+    assert post_permalink(urn) == "https://www.linkedin.com/feed/update/urn:li:activity:7160000000000000000/"
+
+
+def test_classify_navigation():
+    assert classify_navigation(200, "https://www.linkedin.com/company/acme/about/") == "ok"
+    assert classify_navigation(200, "https://www.linkedin.com/authwall?trk=bf&sessionRedirect=x") == "authwall"
+    assert classify_navigation(200, "https://www.linkedin.com/uas/login?session_redirect=x") == "authwall"
+    assert classify_navigation(200, "https://www.linkedin.com/checkpoint/challenge/AgE") == "checkpoint"
+    assert classify_navigation(404, "https://www.linkedin.com/company/typo/about/") == "not_found"
+    assert classify_navigation(200, "https://www.linkedin.com/company/unavailable/") == "not_found"
+    assert classify_navigation(999, "https://www.linkedin.com/company/acme/about/") == "throttled"
+    assert classify_navigation(429, "https://www.linkedin.com/company/acme/posts") == "throttled"
+
+
+class FakeContext:
+    def __init__(self, storage_state=None):
+        self.storage = storage_state or {"cookies": [{"name": "li_at", "value": "1"}], "origins": []}
+        self.pages = []
+        self.closed = False
+
+    def set_default_timeout(self, ms):
+        pass
+
+    def set_default_navigation_timeout(self, ms):
+        pass
+
+    async def storage_state(self):
+        return self.storage
+
+    async def cookies(self):
+        return self.storage["cookies"]
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.closed = False
+
+    async def new_context(self, user_agent=None, storage_state=None):
+        return FakeContext(storage_state)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_a_warmup_in_progress(monkeypatch):
+    import asyncio
+    from app.services.scraper import LinkedInScraper
+
+    scraper = LinkedInScraper()
+    browser = FakeBrowser()
+
+    async def slow_start():
+        scraper.browser = browser
+        await asyncio.sleep(60)  # e.g. still logging in
+
+    monkeypatch.setattr(scraper, "start", slow_start)
+    task = scraper.start_in_background()
+    await asyncio.sleep(0)
+    await asyncio.wait_for(scraper.stop(), 1)
+    assert task.cancelled()
+    assert browser.closed and scraper.browser is None
+
+
+@pytest.mark.asyncio
+async def test_recycle_drains_and_carries_sessions_over(monkeypatch, tmp_path):
+    import asyncio
+    from app.core.config import settings
+    from app.services import browser_memory
+    from app.services.scraper import LinkedInScraper
+    from app.services.session_pool import BrowserSession
+
+    monkeypatch.setattr(browser_memory, "chromium_rss_mb", lambda: 321.0)
+    monkeypatch.setattr(settings, "BROWSER_RECYCLE_PAGES", 2)
+    monkeypatch.setattr(settings, "BROWSER_RECYCLE_RSS_MB", 0)
+    scraper = LinkedInScraper()
+    scraper.browser = FakeBrowser()
+    old_context = FakeContext()
+    cookie_file = tmp_path / "alice.json"
+    session = BrowserSession("alice", old_context, cookie_file=str(cookie_file))
+    scraper.pool.add(session)
+
+    for _ in range(2):  # the second page served makes a recycle due
+        await scraper._release(await scraper.pool.acquire())
+    recycle = scraper._recycle_task
+    assert recycle is not None
+
+    await asyncio.wait_for(recycle, 1)
+    assert old_context.closed
+    assert session.context is not old_context
+    assert session.context.storage == old_context.storage
+    assert cookie_file.exists()
+    assert scraper.recycles[("contexts", "pages")] == 1
+    assert scraper.pages_served == 0
+    assert scraper.status()["memory"]["rss_mb"] == 321.0
+
+
+@pytest.mark.asyncio
+async def test_recycle_waits_for_pages_in_flight():
+    import asyncio
+    from app.services.scraper import LinkedInScraper
+    from app.services.session_pool import BrowserSession
+
+    scraper = LinkedInScraper()
+    scraper.browser = FakeBrowser()
+    scraper.pool.add(BrowserSession("default", FakeContext()))
+    in_flight = await scraper.pool.acquire()
+
+    recycle = asyncio.create_task(scraper.recycle())
+    await asyncio.sleep(0.01)
+    assert not recycle.done()
+    waiter = asyncio.create_task(scraper.pool.acquire())  # new scrapes wait for the recycle
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    await scraper.pool.release(in_flight)
+    await asyncio.wait_for(recycle, 1)
+    assert (await asyncio.wait_for(waiter, 1)).context is scraper.context
+
+
+class FakeDirectoryPage:
+    """A People tab that shows `page_size` more cards per scroll."""
+
+    url = "https://www.linkedin.com/company/acme/people/"
+
+    def __init__(self, people, page_size):
+        self.people = people
+        self.page_size = page_size
+        self.loaded = page_size
+
+    async def goto(self, url, **kwargs):
+        return None
+
+    async def eval_on_selector_all(self, selector, script):
+        return self.people[:self.loaded] if selector == ".org-people-profile-card__profile-info" else []
+
+    async def evaluate(self, script):
+        self.loaded += self.page_size
+
+    async def query_selector(self, selector):
+        return None
+
+    async def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_people_crawl_resumes_where_the_last_run_stopped(monkeypatch):
+    from app.core.config import settings
+    from app.services.scraper import LinkedInScraper
+    from app.services.session_pool import BrowserSession
+
+    monkeypatch.setattr(settings, "EMPLOYEES_CRAWL_SCROLL_PAUSE", 0)
+    monkeypatch.setattr(settings, "BROWSER_RECYCLE_RSS_MB", 0)
+    people = [
+        {"name": f" Person\n {i} ", "role": "Engineer", "location": "Berlin",
+         "profile_url": f"https://www.linkedin.com/in/person-{i}/?miniProfileUrn=x"}
+        for i in range(7)
+    ]
+    people[2] = {"name": "LinkedIn Member", "role": "Engineer", "location": "", "profile_url": ""}
+    directory = FakeDirectoryPage(people, page_size=3)
+    context = FakeContext()
+
+    async def new_page():
+        directory.loaded = directory.page_size
+        return directory
+
+    context.new_page = new_page
+    scraper = LinkedInScraper()
+    scraper.browser = FakeBrowser()
+    scraper.extraction_mode = "dom"
+    scraper.settle_seconds["people"] = 0
+    scraper.pool.add(BrowserSession("default", context))
+    batches = []
+
+    async def on_batch(employees, position, exhausted):
+        batches.append(([e["name"] for e in employees], position, exhausted))
+
+    assert await scraper.scrape_employees("acme", max_employees=3, on_batch=on_batch) == []
+    assert batches == [(["Person 0", "Person 1"], 3, False), (["Person 3"], 4, False)]
+
+    batches.clear()
+    await scraper.scrape_employees("acme", start=4, max_employees=5, on_batch=on_batch)
+    assert batches == [(["Person 4", "Person 5"], 6, False), (["Person 6"], 7, False), ([], 7, True)]
+
+    employees = await scraper.scrape_employees("acme", max_employees=2)
+    assert employees[0] == {
+        "name": "Person 0", "role": "Engineer", "location": "Berlin",
+        "profile_url": "https://www.linkedin.com/in/person-0/",
+    }
+    assert len(employees) == 2
+
+
+@pytest.mark.asyncio
+async def test_exhausted_session_pool_surfaces_as_unavailable(monkeypatch):
+    import time
+    import pytest
+    from app.core.config import settings
+    from app.services.scraper import LinkedInScraper
+    from app.services.session_pool import BrowserSession, NoSessionAvailable
+
+    monkeypatch.setattr(settings, "BROWSER_RECYCLE_RSS_MB", 0)
+    scraper = LinkedInScraper()
+    scraper.browser = FakeBrowser()
+    session = BrowserSession("default", FakeContext())
+    session.cooldown_until = time.monotonic() + 60
+    scraper.pool.add(session)
+
+    with pytest.raises(NoSessionAvailable) as raised:
+        await scraper.scrape_page_details("acme")
+    assert raised.value.retry_after > 0
+    with pytest.raises(NoSessionAvailable):
+        await scraper.scrape_posts("acme")
+
+
+@pytest.mark.asyncio
+async def test_saturated_session_pool_is_bounded_by_the_request_deadline(monkeypatch):
+    import asyncio
+    from app.core.config import settings
+    from app.services import deadline
+    from app.services.scraper import LinkedInScraper
+    from app.services.session_pool import BrowserSession
+
+    monkeypatch.setattr(settings, "BROWSER_RECYCLE_RSS_MB", 0)
+    monkeypatch.setattr(settings, "DEADLINE_MIN_STAGE", 0)
+    scraper = LinkedInScraper()
+    scraper.browser = FakeBrowser()
+    scraper.pool.add(BrowserSession("default", FakeContext()))
+    scraper.pool.max_pages_per_session = 1
+    await scraper.pool.acquire()  # every session busy
+
+    with deadline.budget(0.1):
+        with pytest.raises(deadline.DeadlineExceeded):
+            await asyncio.wait_for(scraper.scrape_page_details("acme"), 2)
+    with deadline.budget(0.1):
+        assert await asyncio.wait_for(scraper.scrape_posts("acme"), 2) == []
+    assert scraper.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_browser_that_failed_to_start_is_unavailable_not_missing(monkeypatch):
+    import pytest
+    from app.services.circuit_breaker import ScraperUnavailable
+    from app.services.scraper import LinkedInScraper
+
+    scraper = LinkedInScraper()
+
+    async def failed_start():
+        return False
+
+    monkeypatch.setattr(scraper, "ensure_started", failed_start)
+    with pytest.raises(ScraperUnavailable):
+        await scraper.scrape_page_details("acme")
+
+
+@pytest.mark.asyncio
+async def test_scrapes_that_never_navigate_leave_the_probe_free(monkeypatch):
+    import time
+    import pytest
+    from app.core.config import settings
+    from app.services.scraper import LinkedInScraper
+    from app.services.session_pool import BrowserSession, NoSessionAvailable
+
+    monkeypatch.setattr(settings, "BROWSER_RECYCLE_RSS_MB", 0)
+    scraper = LinkedInScraper()
+    for _ in range(scraper.breaker.failure_threshold):
+        scraper.breaker.record("authwall")
+    scraper.breaker.opened_until = time.monotonic() - 1  # backoff over: half-open
+
+    assert await scraper.scrape_posts("acme") == []  # no browser
+    assert scraper.breaker.state == "half_open"
+
+    scraper.browser = FakeBrowser()
+    session = BrowserSession("default", FakeContext())
+    session.cooldown_until = time.monotonic() + 60
+    scraper.pool.add(session)
+    with pytest.raises(NoSessionAvailable):
+        await scraper.scrape_employees("acme")
+    assert scraper.breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_people_crawl_starts_over_when_its_position_is_out_of_reach(monkeypatch):
+    from app.core.config import settings
+    from app.services.scraper import LinkedInScraper
+    from app.services.session_pool import BrowserSession
+
+    monkeypatch.setattr(settings, "EMPLOYEES_CRAWL_SCROLL_PAUSE", 0)
+    monkeypatch.setattr(settings, "BROWSER_RECYCLE_RSS_MB", 0)
+    directory = FakeDirectoryPage([{"name": f"Person {i}"} for i in range(20)], page_size=3)
+    context = FakeContext()
+
+    async def new_page():
+        directory.loaded = directory.page_size
+        return directory
+
+    context.new_page = new_page
+    scraper = LinkedInScraper()
+    scraper.browser = FakeBrowser()
+    scraper.extraction_mode = "dom"
+    scraper.settle_seconds["people"] = 0
+    scraper.pool.add(BrowserSession("default", context))
+    batches = []
+
+    async def on_batch(employees, position, exhausted):
+        batches.append((len(employees), position, exhausted))
+
+    # Two scrolls reach 9 entries, short of entry 12
+    await scraper.scrape_employees("acme", start=12, max_scrolls=2, on_batch=on_batch)
+    assert batches == [(0, 12, True)]
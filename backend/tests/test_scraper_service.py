@@ -0,0 +1,122 @@
+import asyncio
+import pytest
+from app.services import deadline
+from app.services.circuit_breaker import ScraperUnavailable
+from app.services.scraper_service import ScraperService, RemoteScraper
+
+
+class FakeScraper:
+    def __init__(self):
+        self.calls = []
+
+    def start_in_background(self):
+        return None
+
+    def status(self):
+        return {"state": "ready", "last_error": None}
+
+    async def stop(self):
+        return None
+
+    async def scrape_page_details(self, page_id: str):
+        self.calls.append(("details", page_id))
+        return {"linkedin_id": page_id, "name": f"Remote {page_id}"}
+
+    async def scrape_posts(self, page_id: str):
+        self.calls.append(("posts", page_id))
+        return [{"content": "hello", "post_url": f"https://example.com/{page_id}/1"}]
+
+    async def scrape_employees(self, page_id: str, **crawl):
+        raise RuntimeError("people page unavailable")
+
+
+class DirectoryScraper(FakeScraper):
+    async def scrape_employees(self, page_id: str, start: int = 0, on_batch=None, **limits):
+        await on_batch([{"name": "Ada", "profile_url": "https://www.linkedin.com/in/ada/"}], start + 1, False)
+        await on_batch([{"name": "Lin", "profile_url": "https://www.linkedin.com/in/lin/"}], start + 3, False)
+        await on_batch([], start + 3, True)
+        return []
+
+
+class SlowScraper(FakeScraper):
+    async def scrape_posts(self, page_id: str):
+        await asyncio.sleep(1)
+        return []
+
+    async def scrape_page_details(self, page_id: str):
+        raise ScraperUnavailable("Scraping is temporarily paused", retry_after=30)
+
+
+@pytest.mark.asyncio
+async def test_remote_scraper_round_trip(tmp_path):
+    fake = FakeScraper()
+    url = f"unix://{tmp_path}/scraper.sock"
+    server = await ScraperService(fake).start_server(url)
+    try:
+        remote = RemoteScraper(url)
+        assert await remote.ensure_started()
+        assert remote.status()["state"] == "ready"
+
+        details = await remote.scrape_page_details("acme")
+        assert details["name"] == "Remote acme"
+        posts = await remote.scrape_posts("acme")
+        assert posts[0]["content"] == "hello"
+        assert fake.calls == [("details", "acme"), ("posts", "acme")]
+
+        with pytest.raises(RuntimeError, match="people page unavailable"):
+            await remote.scrape_employees("acme")
+    finally:
+        server.close()
+        await server.wait_closed()
+        # Let connection handlers observe EOF before the loop closes (3.11 doesn't wait for them)
+        await asyncio.sleep(0.05)
+
+
+@pytest.mark.asyncio
+async def test_remote_people_crawl_reports_its_position(tmp_path):
+    url = f"unix://{tmp_path}/scraper.sock"
+    server = await ScraperService(DirectoryScraper()).start_server(url)
+    batches = []
+
+    async def on_batch(employees, position, exhausted):
+        batches.append(([e["name"] for e in employees], position, exhausted))
+
+    try:
+        remote = RemoteScraper(url)
+        assert await remote.scrape_employees("acme", start=10, on_batch=on_batch) == []
+        assert batches == [(["Ada", "Lin"], 13, False), ([], 13, True)]
+        assert [e["name"] for e in await remote.scrape_employees("acme")] == ["Ada", "Lin"]
+    finally:
+        server.close()
+        await server.wait_closed()
+        await asyncio.sleep(0.05)
+
+
+@pytest.mark.asyncio
+async def test_remote_scraper_reports_unreachable_service(tmp_path):
+    remote = RemoteScraper(f"unix://{tmp_path}/missing.sock")
+    assert not await remote.ensure_started()
+    assert remote.status()["state"] == "failed"
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_is_bounded_and_pauses_come_from_the_error(tmp_path):
+    url = f"unix://{tmp_path}/scraper.sock"
+    server = await ScraperService(SlowScraper(), max_concurrency=1).start_server(url)
+    try:
+        remote = RemoteScraper(url)
+        busy = asyncio.create_task(remote.scrape_posts("busy"))
+        await asyncio.sleep(0.05)
+        with deadline.budget(0.1):
+            with pytest.raises(deadline.DeadlineExceeded):
+                await asyncio.wait_for(remote.scrape_posts("queued"), 0.5)
+        await busy
+
+        assert remote.retry_after() == 0
+        with pytest.raises(ScraperUnavailable):
+            await remote.scrape_page_details("acme")
+        assert 29 <= remote.retry_after() <= 30
+    finally:
+        server.close()
+        await server.wait_closed()
+        await asyncio.sleep(0.05)
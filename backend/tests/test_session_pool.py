@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+from app.services import deadline
+from app.services.session_pool import BrowserSession, NoSessionAvailable, SessionPool, session_files
+
+
+def _pool(names, **kwargs) -> SessionPool:
+    pool = SessionPool(**kwargs)
+    for name in names:
+        pool.add(BrowserSession(name, context=None))
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_least_loaded_spreads_pages_across_sessions():
+    pool = _pool(["a", "b"], max_pages_per_session=2)
+    first = await pool.acquire()
+    second = await pool.acquire()
+    assert (first.name, second.name) == ("a", "b")
+
+    await pool.release(first)
+    third = await pool.acquire()
+    assert third is first
+    assert [s["requests"] for s in pool.stats()] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_round_robin_rotates():
+    pool = _pool(["a", "b", "c"], strategy="round_robin")
+    picked = []
+    for _ in range(4):
+        session = await pool.acquire()
+        picked.append(session.name)
+        await pool.release(session)
+    assert picked == ["a", "b", "c", "a"]
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_a_free_slot():
+    pool = _pool(["a"], max_pages_per_session=1)
+    held = await pool.acquire()
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    await pool.release(held)
+    assert (await asyncio.wait_for(waiter, 1)).name == "a"
+
+
+@pytest.mark.asyncio
+async def test_acquire_gives_up_when_the_deadline_runs_out():
+    pool = _pool(["a"], max_pages_per_session=1)
+    await pool.acquire()
+    with deadline.budget(0.05):
+        with pytest.raises(deadline.DeadlineExceeded):
+            await asyncio.wait_for(pool.acquire(), 1)
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_session_cools_down():
+    pool = _pool(["a", "b"], cooldown=60)
+    a = await pool.acquire()
+    await pool.release(a, "throttled", error="HTTP 429")
+    assert a.state == "cooling_down"
+
+    for _ in range(3):
+        session = await pool.acquire()
+        assert session.name != a.name
+        await pool.release(session)
+
+    other = await pool.acquire()
+    await pool.release(other, "authwall")
+    with pytest.raises(NoSessionAvailable) as exc:
+        await pool.acquire()
+    assert 0 < exc.value.retry_after <= 61
+    assert [(s["rate_limited"], s["authwalls"]) for s in pool.stats()] == [(1, 0), (0, 1)]
+
+
+def test_session_files_expands_globs(tmp_path):
+    for name in ("b.json", "a.json"):
+        (tmp_path / name).write_text("[]")
+    spec = f"{tmp_path}/*.json, {tmp_path}/a.json, /elsewhere/c.json"
+    assert session_files(spec) == [str(tmp_path / "a.json"), str(tmp_path / "b.json"), "/elsewhere/c.json"]
+    assert session_files("") == []